@@ -1,11 +1,16 @@
-from fastapi import FastAPI, HTTPException, Depends, status
+from fastapi import FastAPI, HTTPException, Depends, Header, Response, WebSocket, WebSocketDisconnect, status
+from fastapi.responses import StreamingResponse
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.concurrency import run_in_threadpool
 from pydantic import BaseModel
 from typing import Optional, List
+import asyncio
 import re
 import time
 from datetime import datetime, timedelta
+from sqlalchemy import select
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 import os
 import sys
 
@@ -15,8 +20,16 @@ if current_dir not in sys.path:
     sys.path.append(current_dir)
 
 # 데이터베이스 및 모델 임포트
-from database.database import SessionLocal, engine
+from database.database import SessionLocal, engine, async_engine, get_async_db
 from models.user import Base, User, ExchangeKey
+from models.trading_journal import TradingJournal
+from services.journal_writer import journal_writer
+from services.exit_monitor import exit_monitor
+from services.user_cache import user_cache, watch_user_model
+from services.price_batch import MSGPACK_MEDIA_TYPE, parse_symbols, price_batch_encoder
+from services.price_hub import price_hub
+from services.order_executor import order_executor
+from services.metrics import CONTENT_TYPE, MetricsMiddleware, instrument_engine, register_cache, registry
 from schemas.user import UserCreate, UserLogin, UserResponse
 
 # JWT 임포트
@@ -37,6 +50,27 @@ except ImportError as e:
     print(f"⚠️ BinanceService import failed: {e}")
     BINANCE_SERVICE_AVAILABLE = False
 
+# AsyncBinanceService 임포트 (httpx 필요)
+try:
+    from services.async_binance_service import AsyncBinanceService
+    ASYNC_BINANCE_AVAILABLE = BINANCE_SERVICE_AVAILABLE
+    print("✅ AsyncBinanceService imported successfully")
+except ImportError as e:
+    print(f"⚠️ AsyncBinanceService import failed: {e}")
+    ASYNC_BINANCE_AVAILABLE = False
+
+# 웹소켓 시세 수신기 임포트 (websockets 필요)
+try:
+    from services.market_data_stream import create_default_stream
+    MARKET_STREAM_AVAILABLE = os.getenv("MARKET_STREAM_ENABLED", "true").lower() == "true"
+    print("✅ MarketDataStream imported successfully")
+except ImportError as e:
+    print(f"⚠️ MarketDataStream import failed: {e}")
+    MARKET_STREAM_AVAILABLE = False
+
+# 사용자 수정/비활성화 시 인증 캐시 무효화
+watch_user_model(User)
+
 # 데이터베이스 테이블 생성
 try:
     Base.metadata.create_all(bind=engine)
@@ -59,6 +93,7 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+app.add_middleware(MetricsMiddleware)
 
 # 데이터베이스 의존성
 def get_db():
@@ -129,6 +164,100 @@ else:
     binance_service = SimpleFallbackService()
     print("🔄 Using SimpleFallbackService")
 
+async_binance_service = AsyncBinanceService() if ASYNC_BINANCE_AVAILABLE else None
+
+async def call_binance(method: str, *args):
+    """바이낸스 호출 - 비동기 서비스 우선, 없으면 스레드풀에서 동기 서비스 실행"""
+    if async_binance_service is not None:
+        return await getattr(async_binance_service, method)(*args)
+    return await run_in_threadpool(getattr(binance_service, method), *args)
+
+# 시세 상태 테이블 (웹소켓 수신)
+market_data_stream = create_default_stream() if MARKET_STREAM_AVAILABLE else None
+
+async def call_market_data(method: str, *args):
+    """시세 조회 - 웹소켓 상태 테이블 우선, 상태가 없을 때만 REST 조회"""
+    if market_data_stream is not None:
+        data = getattr(market_data_stream, method)(*args)
+        if data is not None:
+            return data, "stream"
+    data = await call_binance(method, *args)
+    return data, "binance" if BINANCE_SERVICE_AVAILABLE else "fallback"
+
+# 메트릭 - DB 문장 실행 시간과 캐시 통계(스크레이프 시점 수집)
+instrument_engine(engine)
+if async_engine is not None:
+    instrument_engine(async_engine.sync_engine)
+register_cache("user_principal", user_cache.stats)
+register_cache("price_batch_body", lambda: {"hits": price_batch_encoder.encode_hits,
+                                            "misses": price_batch_encoder.encodes})
+if BINANCE_SERVICE_AVAILABLE:
+    register_cache("ticker_price", binance_service.price_cache.stats)
+
+    def collect_rate_limiter():
+        s = binance_service.rate_limiter.stats()
+        return [
+            ("binance_weight_available", "gauge", "Local request weight bucket level", [({}, s["available"])]),
+            ("binance_server_used_weight", "gauge", "X-MBX-USED-WEIGHT from the last response",
+             [({}, s["server_used_weight"])]),
+            ("binance_throttled_total", "counter", "Requests delayed by the local weight limiter",
+             [({}, s["throttled"])]),
+        ]
+    registry.register_collector("binance_rate_limiter", collect_rate_limiter)
+
+def collect_price_hub():
+    s = price_hub.stats()
+    return [
+        ("price_stream_subscribers", "gauge", "Connected price stream subscribers", [({}, s["subscribers"])]),
+        ("price_stream_frames_total", "counter", "Price frames sent", [({}, s["frames_sent"])]),
+        ("price_stream_dropped_updates_total", "counter", "Price updates coalesced away for slow subscribers",
+         [({}, s["dropped_updates"])]),
+    ]
+registry.register_collector("price_hub", collect_price_hub)
+
+def collect_order_executor():
+    s = order_executor.stats()
+    return [
+        ("order_queue_depth", "gauge", "Orders waiting for a sender", [({}, s["queued"])]),
+        ("order_in_flight", "gauge", "Orders being sent or retried", [({}, s["in_flight"])]),
+        ("order_retries_total", "counter", "Order resends after transient errors", [({}, s["retries"])]),
+        ("order_recovered_total", "counter", "Orders found already accepted by client order id",
+         [({}, s["recovered"])]),
+    ]
+registry.register_collector("order_executor", collect_order_executor)
+
+@app.get("/metrics")
+async def metrics():
+    """Prometheus 스크레이프 엔드포인트"""
+    return Response(registry.render(), media_type=CONTENT_TYPE)
+
+@app.on_event("startup")
+async def start_background_services():
+    if BINANCE_SERVICE_AVAILABLE:
+        binance_service.info_store.start()
+    if market_data_stream is not None:
+        # 손절/익절 감시기는 스트림 가격 이벤트로 구동
+        market_data_stream.add_listener(exit_monitor.on_price)
+        market_data_stream.add_listener(price_hub.publish)
+        market_data_stream.start()
+    else:
+        # 스트림이 없으면 REST 스냅샷(캐시 경유) 폴링으로 가격 푸시
+        price_hub.start_feed(lambda: call_binance("get_ticker_price", None))
+
+@app.on_event("shutdown")
+async def close_binance_client():
+    if BINANCE_SERVICE_AVAILABLE:
+        binance_service.info_store.stop()
+    if market_data_stream is not None:
+        await market_data_stream.stop()
+    await price_hub.stop()
+    if async_binance_service is not None:
+        await async_binance_service.aclose()
+    # 진행 중인 청산 주문 완료 후 매매일지 남은 이벤트 커밋
+    await run_in_threadpool(exit_monitor.shutdown)
+    await run_in_threadpool(order_executor.shutdown)  # 청산 주문까지 마친 뒤
+    await run_in_threadpool(journal_writer.stop)
+
 # Pydantic 모델
 class ExchangeKeyCreate(BaseModel):
     exchange_name: str
@@ -197,7 +326,7 @@ def create_access_token(data: dict):
         return base64.b64encode(data_str.encode()).decode()
 
 @app.post("/api/auth/register", response_model=UserResponse)
-async def register(user: UserCreate, db: Session = Depends(get_db)):
+async def register(user: UserCreate, db: AsyncSession = Depends(get_async_db)):
     try:
         print(f"Registration attempt for: {user.email}")
         
@@ -216,7 +345,8 @@ async def register(user: UserCreate, db: Session = Depends(get_db)):
             )
         
         # 이메일 중복 확인
-        db_user = db.query(User).filter(User.email == user.email).first()
+        result = await db.execute(select(User).where(User.email == user.email))
+        db_user = result.scalars().first()
         if db_user:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
@@ -233,8 +363,8 @@ async def register(user: UserCreate, db: Session = Depends(get_db)):
             full_name=user.full_name
         )
         db.add(db_user)
-        db.commit()
-        db.refresh(db_user)
+        await db.commit()
+        await db.refresh(db_user)
         
         print(f"User registered successfully: {db_user.id}")
         
@@ -259,9 +389,10 @@ async def register(user: UserCreate, db: Session = Depends(get_db)):
         )
 
 @app.post("/api/auth/login", response_model=Token)
-async def login(user_data: UserLogin, db: Session = Depends(get_db)):
+async def login(user_data: UserLogin, db: AsyncSession = Depends(get_async_db)):
     try:
-        db_user = db.query(User).filter(User.email == user_data.email).first()
+        result = await db.execute(select(User).where(User.email == user_data.email))
+        db_user = result.scalars().first()
         if not db_user or not verify_password(user_data.password, db_user.hashed_password):
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
@@ -282,24 +413,28 @@ async def login(user_data: UserLogin, db: Session = Depends(get_db)):
         )
 
 @app.get("/api/auth/me", response_model=UserResponse)
-async def read_users_me(token: str, db: Session = Depends(get_db)):
+async def read_users_me(token: str, db: AsyncSession = Depends(get_async_db)):
     try:
         # 간단한 토큰 검증
         if JWT_AVAILABLE:
             payload = jwt.decode(token, "secret-key", algorithms=["HS256"])
-            email = payload.get("sub")
         else:
             import base64
             import json
-            decoded = base64.b64decode(token).decode()
-            email = json.loads(decoded).get("sub")
+            payload = json.loads(base64.b64decode(token).decode())
+        email = payload.get("sub")
         
         if not email:
             raise HTTPException(status_code=401, detail="Invalid token")
         
-        user = db.query(User).filter(User.email == email).first()
-        if not user:
-            raise HTTPException(status_code=404, detail="User not found")
+        # 캐시 적중 시 DB 조회 생략 (토큰 만료 시각까지만 유효)
+        user = user_cache.get(email)
+        if user is None:
+            result = await db.execute(select(User).where(User.email == email))
+            db_user = result.scalars().first()
+            if not db_user:
+                raise HTTPException(status_code=404, detail="User not found")
+            user = user_cache.put(email, db_user, payload.get("exp"))
         
         return UserResponse(
             id=user.id,
@@ -311,43 +446,176 @@ async def read_users_me(token: str, db: Session = Depends(get_db)):
         print(f"Token verification error: {e}")
         raise HTTPException(status_code=401, detail="Invalid token")
 
+@app.get("/api/auth/cache-stats")
+async def get_auth_cache_stats():
+    """인증 사용자 캐시 적중률"""
+    return {"status": "success", "cache": user_cache.stats()}
+
 # 암호화폐 엔드포인트 (기존 코드 유지)
 @app.get("/api/crypto/prices")
 async def get_prices(symbol: str = None):
     try:
-        prices = binance_service.get_ticker_price(symbol)
+        prices, source = await call_market_data("get_ticker_price", symbol)
         return {
             "success": True,
             "data": prices,
-            "source": "binance" if BINANCE_SERVICE_AVAILABLE else "fallback"
+            "source": source
         }
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error: {str(e)}")
 
+@app.get("/api/crypto/prices/batch")
+async def get_prices_batch(symbols: str = None, layout: str = "columnar", format: str = None,
+                           accept: Optional[str] = Header(None),
+                           if_none_match: Optional[str] = Header(None)):
+    """심볼 집합 가격 (시세 그리드 폴링용)
+
+    symbols=BTCUSDT,ETHUSDT (생략 시 전체), layout=columnar|rows,
+    format=msgpack 또는 Accept: application/x-msgpack 이면 msgpack 응답.
+    전체 스냅샷 하나에서 골라내며 ETag가 같으면 304.
+    """
+    try:
+        wanted = parse_symbols(symbols)
+        use_msgpack = format == "msgpack" or (accept is not None and MSGPACK_MEDIA_TYPE in accept)
+        snapshot, source = await call_market_data("get_ticker_price", None)
+        if wanted and source == "stream" and price_batch_encoder.select(snapshot, wanted)[2]:
+            # 스트림 구독 밖 심볼이 있으면 REST 전체 스냅샷 하나로 응답 (시점 혼합 방지)
+            snapshot = await call_binance("get_ticker_price", None)
+            source = "binance" if BINANCE_SERVICE_AVAILABLE else "fallback"
+        if not isinstance(snapshot, list):
+            snapshot = [snapshot] if snapshot else []
+        etag, body, media_type = price_batch_encoder.encode(
+            snapshot, wanted, source, layout, use_msgpack, if_none_match
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error: {str(e)}")
+    headers = {"ETag": etag, "Cache-Control": "no-cache", "Vary": "Accept"}
+    if body is None:
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type=media_type, headers=headers)
+
+@app.get("/api/crypto/prices/batch-stats")
+async def get_prices_batch_stats():
+    return {"success": True, "data": price_batch_encoder.stats()}
+
+@app.get("/api/crypto/prices/stream")
+async def stream_prices(symbols: str = None, max_rate: float = None):
+    """가격 SSE 스트림 - 웹소켓을 못 쓰는 클라이언트용 (snapshot 후 delta 이벤트)"""
+    try:
+        wanted = parse_symbols(symbols)
+        subscriber = price_hub.subscribe(wanted, max_rate)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except RuntimeError as e:
+        raise HTTPException(status_code=503, detail=str(e))
+
+    async def events():
+        try:
+            yield f"data: {price_hub.snapshot_frame(subscriber)}\n\n"
+            while True:
+                frame = await subscriber.next_frame()
+                if frame is None:
+                    break
+                yield f"data: {frame}\n\n"
+        finally:
+            price_hub.unsubscribe(subscriber)
+
+    return StreamingResponse(events(), media_type="text/event-stream",
+                             headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
+
+@app.websocket("/ws/prices")
+async def websocket_prices(websocket: WebSocket, symbols: str = None, max_rate: float = None):
+    """가격 웹소켓 - 구독 심볼 집합의 가격 델타를 최대 max_rate(회/초)로 푸시
+
+    클라이언트는 {"op": "subscribe", "symbols": [...] 또는 "BTCUSDT,ETHUSDT"} 로 구독 집합을
+    바꿀 수 있다. 잘못된 요청에는 {"type": "error"} 프레임으로 답하고 구독은 그대로 둔다.
+    """
+    await websocket.accept()
+    try:
+        subscriber = price_hub.subscribe(parse_symbols(symbols), max_rate)
+    except (ValueError, RuntimeError) as e:
+        await websocket.close(code=1008, reason=str(e))
+        return
+
+    async def receive_commands():
+        while True:
+            message = await websocket.receive_json()
+            if not isinstance(message, dict) or message.get("op") != "subscribe":
+                continue
+            # 응답 프레임도 pump가 보낸다 (소켓 전송은 한 태스크만, send_timeout 적용)
+            try:
+                wanted = parse_symbols(message.get("symbols"))
+            except ValueError as e:
+                subscriber.enqueue({"type": "error", "message": str(e)})
+                continue
+            price_hub.resubscribe(subscriber, wanted)
+
+    pump = asyncio.create_task(price_hub.pump(subscriber, websocket.send_text))
+    commands = asyncio.create_task(receive_commands())
+    try:
+        done, _ = await asyncio.wait({pump, commands}, return_when=asyncio.FIRST_COMPLETED)
+        if pump in done and not commands.done():
+            # 느린 클라이언트(전송 타임아웃) 또는 허브 종료
+            await websocket.close(code=1013)
+    except (WebSocketDisconnect, RuntimeError):
+        pass
+    finally:
+        for task in (pump, commands):
+            task.cancel()
+        await asyncio.gather(pump, commands, return_exceptions=True)
+        price_hub.unsubscribe(subscriber)
+
+@app.get("/api/crypto/prices/stream-stats")
+async def get_price_stream_stats():
+    return {"success": True, "data": price_hub.stats()}
+
 @app.get("/api/crypto/prices/{symbol}")
 async def get_price(symbol: str):
     try:
-        price = binance_service.get_ticker_price(symbol.upper())
+        price, source = await call_market_data("get_ticker_price", symbol.upper())
         return {
             "success": True,
             "data": price,
-            "source": "binance" if BINANCE_SERVICE_AVAILABLE else "fallback"
+            "source": source
         }
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error: {str(e)}")
 
+@app.get("/api/crypto/cache-stats")
+async def get_cache_stats():
+    if not BINANCE_SERVICE_AVAILABLE:
+        return {"success": True, "data": None, "source": "fallback"}
+    return {"success": True, "data": binance_service.price_cache.stats()}
+
+@app.get("/api/crypto/rate-limit")
+async def get_rate_limit_stats():
+    if not BINANCE_SERVICE_AVAILABLE:
+        return {"success": True, "data": None, "source": "fallback"}
+    return {"success": True, "data": binance_service.rate_limiter.stats()}
+
+@app.get("/api/crypto/stream-stats")
+async def get_stream_stats():
+    if market_data_stream is None:
+        return {"success": True, "data": None}
+    return {"success": True, "data": market_data_stream.stats()}
+
 @app.get("/api/crypto/24hr/{symbol}")
 async def get_24hr_ticker(symbol: str):
     try:
-        ticker = binance_service.get_24hr_ticker(symbol.upper())
-        return {"success": True, "data": ticker}
+        ticker, source = await call_market_data("get_24hr_ticker", symbol.upper())
+        return {"success": True, "data": ticker, "source": source}
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error: {str(e)}")
 
 @app.get("/api/crypto/exchange-info")
-async def get_exchange_info():
+async def get_exchange_info(base: str = None, quote: str = None, status: str = None):
     try:
-        info = binance_service.get_exchange_info()
+        info = await call_binance("get_exchange_info")
+        if BINANCE_SERVICE_AVAILABLE and (base or quote or status):
+            symbols = binance_service.info_store.find_symbols(base, quote, status)
+            return {"success": True, "data": {"symbols": symbols, "count": len(symbols)}}
         return {"success": True, "data": info}
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error: {str(e)}")
@@ -355,7 +623,7 @@ async def get_exchange_info():
 @app.get("/api/crypto/server-time")
 async def get_server_time():
     try:
-        server_time = binance_service.get_server_time()
+        server_time = await call_binance("get_server_time")
         return {"success": True, "data": server_time}
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error: {str(e)}")
@@ -363,7 +631,7 @@ async def get_server_time():
 @app.get("/api/crypto/balances")
 async def get_balances():
     try:
-        balances = binance_service.get_account_balances()
+        balances = await call_binance("get_account_balances")
         return {"success": True, "data": balances}
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error: {str(e)}")
@@ -395,7 +663,7 @@ async def register_exchange_keys(key_data: ExchangeKeyCreate, db: Session = Depe
 @app.get("/api/crypto/test-connection")
 async def test_binance_connection():
     try:
-        result = binance_service.test_connection()
+        result = await call_binance("test_connection")
         return {
             "success": True,
             "data": result,
@@ -1,18 +1,100 @@
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import make_url
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
-import os
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 
-# 데이터베이스 파일 경로 설정
-current_dir = os.path.dirname(os.path.abspath(__file__))
-db_path = os.path.join(current_dir, "..", "deep_signal.db")
-SQLALCHEMY_DATABASE_URL = f"sqlite:///{db_path}"
+try:
+    from config import settings
+except ImportError:  # 저장소 루트에서 backend.* 로 임포트될 때
+    from backend.config import settings
 
-engine = create_engine(
-    SQLALCHEMY_DATABASE_URL, 
-    connect_args={"check_same_thread": False}
-)
+# 데이터베이스 URL (config/settings.py의 DATABASE_URL, 기본값은 backend/deep_signal.db)
+SQLALCHEMY_DATABASE_URL = settings.DATABASE_URL
+
+# 동기 URL -> 비동기 드라이버 URL
+ASYNC_DRIVERS = {
+    "sqlite": "sqlite+aiosqlite",
+    "postgresql": "postgresql+asyncpg",
+    "postgresql+psycopg2": "postgresql+asyncpg",
+}
+
+def is_sqlite(url: str) -> bool:
+    return make_url(url).get_backend_name() == "sqlite"
+
+def to_async_url(url: str) -> str:
+    parsed = make_url(url)
+    parsed = parsed.set(drivername=ASYNC_DRIVERS.get(parsed.drivername, parsed.drivername))
+    return parsed.render_as_string(hide_password=False)
+
+def _set_sqlite_pragmas(dbapi_connection, connection_record):
+    """연결마다 SQLite 튜닝 - WAL로 읽기와 쓰기가 서로 막지 않게 한다"""
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute("PRAGMA synchronous=NORMAL")
+    cursor.execute(f"PRAGMA busy_timeout={settings.SQLITE_BUSY_TIMEOUT_MS}")
+    cursor.execute("PRAGMA cache_size=-20000")
+    cursor.execute("PRAGMA temp_store=MEMORY")
+    cursor.close()
+
+def engine_options(url: str) -> dict:
+    """DB 종류별 엔진/풀 옵션"""
+    options = {
+        "echo": settings.DB_ECHO,
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+    }
+    if is_sqlite(url):
+        options["connect_args"] = {
+            "check_same_thread": False,
+            "timeout": settings.SQLITE_BUSY_TIMEOUT_MS / 1000,
+        }
+    else:
+        options["pool_recycle"] = settings.DB_POOL_RECYCLE
+        options["pool_pre_ping"] = True
+    return options
+
+def async_engine_options(url: str) -> dict:
+    """비동기 엔진 옵션 - aiosqlite 파일 DB의 기본 풀(NullPool)은 풀 크기 인자를 거부하므로 풀을 명시"""
+    options = engine_options(url)
+    if is_sqlite(url):
+        options["poolclass"] = AsyncAdaptedQueuePool
+    return options
+
+engine = create_engine(SQLALCHEMY_DATABASE_URL, **engine_options(SQLALCHEMY_DATABASE_URL))
+if is_sqlite(SQLALCHEMY_DATABASE_URL):
+    event.listen(engine, "connect", _set_sqlite_pragmas)
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
-Base = declarative_base()
\ No newline at end of file
+Base = declarative_base()
+
+def get_db():
+    db = SessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+# 비동기 엔진 (aiosqlite / asyncpg 필요) - async 핸들러가 이벤트 루프를 막지 않도록
+try:
+    from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+    ASYNC_DATABASE_URL = to_async_url(SQLALCHEMY_DATABASE_URL)
+    async_engine = create_async_engine(ASYNC_DATABASE_URL, **async_engine_options(SQLALCHEMY_DATABASE_URL))
+    if is_sqlite(SQLALCHEMY_DATABASE_URL):
+        event.listen(async_engine.sync_engine, "connect", _set_sqlite_pragmas)
+    AsyncSessionLocal = async_sessionmaker(async_engine, expire_on_commit=False, autoflush=False)
+    ASYNC_DB_AVAILABLE = True
+except ImportError as e:
+    print(f"⚠️ Async database driver unavailable: {e}")
+    async_engine = None
+    AsyncSessionLocal = None
+    ASYNC_DB_AVAILABLE = False
+
+async def get_async_db():
+    if AsyncSessionLocal is None:
+        raise RuntimeError("비동기 DB 드라이버가 설치되지 않았습니다 (aiosqlite / asyncpg)")
+    async with AsyncSessionLocal() as db:
+        yield db
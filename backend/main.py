@@ -1,12 +1,20 @@
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Response
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel
 from binance.client import Client
 import uvicorn
+import hashlib
 import time
 from typing import Optional, Dict
 
+from services.client_pool import ClientPool
+from services.metrics import CONTENT_TYPE, MetricsMiddleware, register_cache, registry, track_binance
+from services.rate_limiter import request_weight
+from services.signal_cache import signal_cache
+from services.kline_store import INTERVAL_MS
+
 app = FastAPI()
+app.add_middleware(MetricsMiddleware)
 
 app.add_middleware(
     CORSMiddleware,
@@ -17,7 +25,6 @@ app.add_middleware(
 )
 
 # 전역 변수
-binance_clients = {}
 active_trading = {}
 
 class BinanceConfig(BaseModel):
@@ -30,6 +37,20 @@ class TradingConfig(BaseModel):
     symbol: str = "BTCUSDT"
     leverage: int = 5
 
+# 자격 증명별 바이낸스 클라이언트 풀 (LRU/유휴 TTL, 최대 개수 제한)
+binance_clients = ClientPool(
+    factory=lambda api_key, secret_key, testnet: Client(api_key, secret_key, testnet=testnet),
+    on_evict=lambda client_id: active_trading.pop(client_id, None)
+)
+
+register_cache("binance_clients", binance_clients.stats)
+register_cache("signal", signal_cache.stats)
+
+def make_client_id(config: BinanceConfig) -> str:
+    """같은 자격 증명이면 같은 clientId (재연결 시 클라이언트 재사용)"""
+    digest = hashlib.sha256(f"{config.apiKey}:{config.secretKey}:{config.useTestnet}".encode()).hexdigest()
+    return f"{config.apiKey[:10]}_{digest[:12]}"
+
 @app.get("/")
 async def root():
     return {"message": "DeepSignal 백엔드 실행 중"}
@@ -41,13 +62,11 @@ async def health_check():
 @app.post("/api/binance/test-connection")
 async def test_binance_connection(config: BinanceConfig):
     try:
-        if config.useTestnet:
-            client = Client(config.apiKey, config.secretKey, testnet=True)
-        else:
-            client = Client(config.apiKey, config.secretKey)
+        client = binance_clients.get(make_client_id(config), config.apiKey, config.secretKey, config.useTestnet)
         
         # 연결 테스트
-        account = client.get_account()
+        with track_binance("account", request_weight("account")):
+            account = client.get_account()
         return {
             "success": True, 
             "message": "바이낸스 연결 성공",
@@ -65,15 +84,9 @@ async def test_binance_connection(config: BinanceConfig):
 @app.post("/api/binance/connect")
 async def connect_binance(config: BinanceConfig):
     try:
-        client_id = f"{config.apiKey[:10]}_{int(time.time())}"
-        
-        if config.useTestnet:
-            client = Client(config.apiKey, config.secretKey, testnet=True)
-        else:
-            client = Client(config.apiKey, config.secretKey)
-        
-        binance_clients[client_id] = client
-        active_trading[client_id] = False
+        client_id = make_client_id(config)
+        binance_clients.get(client_id, config.apiKey, config.secretKey, config.useTestnet)
+        active_trading.setdefault(client_id, False)
         
         return {
             "success": True,
@@ -89,11 +102,12 @@ async def connect_binance(config: BinanceConfig):
 @app.get("/api/binance/account")
 async def get_account_info(clientId: str):
     try:
-        if clientId not in binance_clients:
+        client = binance_clients.peek(clientId)
+        if client is None:
             raise HTTPException(status_code=400, detail="클라이언트를 찾을 수 없습니다")
         
-        client = binance_clients[clientId]
-        account = client.get_account()
+        with track_binance("account", request_weight("account")):
+            account = client.get_account()
         
         # USDT 잔고
         usdt_balance = next((item for item in account['balances'] if item['asset'] == 'USDT'), None)
@@ -148,9 +162,12 @@ async def get_crypto_prices(symbol: str = "BTCUSDT"):
 @app.post("/api/trading/start")
 async def start_trading(config: TradingConfig, clientId: str):
     try:
-        if clientId not in binance_clients:
+        if binance_clients.peek(clientId) is None:
             raise HTTPException(status_code=400, detail="클라이언트를 찾을 수 없습니다")
         
+        if not active_trading.get(clientId):
+            # 트레이딩 중에는 유휴 정리 대상에서 제외 (stop에서 release)
+            binance_clients.hold(clientId)
         active_trading[clientId] = True
         
         return {
@@ -172,9 +189,11 @@ async def start_trading(config: TradingConfig, clientId: str):
 @app.post("/api/trading/stop")
 async def stop_trading(clientId: str):
     try:
-        if clientId not in binance_clients:
+        if binance_clients.peek(clientId) is None:
             raise HTTPException(status_code=400, detail="클라이언트를 찾을 수 없습니다")
         
+        if active_trading.get(clientId):
+            binance_clients.release(clientId)
         active_trading[clientId] = False
         
         return {
@@ -190,23 +209,38 @@ async def stop_trading(clientId: str):
             "message": f"트레이딩 중지 실패: {str(e)}"
         }
 
+@app.get("/api/binance/pool-stats")
+async def get_client_pool_stats():
+    return {"success": True, "data": binance_clients.stats()}
+
+@app.get("/metrics")
+async def metrics():
+    """Prometheus 스크레이프 엔드포인트"""
+    return Response(registry.render(), media_type=CONTENT_TYPE)
+
 @app.get("/api/ai/signal")
-async def get_ai_signal(symbol: str = "BTCUSDT"):
-    import random
-    
-    signals = ["STRONG_BUY", "BUY", "HOLD", "SELL", "STRONG_SELL"]
-    confidence = random.uniform(0.5, 0.95)
-    signal = random.choice(signals)
-    
-    return {
-        "success": True,
-        "data": {
+async def get_ai_signal(symbol: str = "BTCUSDT", interval: str = "15m"):
+    """AI 신호 - 마감 봉 단위로 메모이즈 (같은 봉 안의 반복 호출은 캐시)"""
+    if interval not in INTERVAL_MS:
+        raise HTTPException(status_code=400, detail="지원하지 않는 인터벌")
+
+    async def compute():
+        import random
+
+        signals = ["STRONG_BUY", "BUY", "HOLD", "SELL", "STRONG_SELL"]
+        return {
             "symbol": symbol,
-            "signal": signal,
-            "confidence": confidence,
+            "signal": random.choice(signals),
+            "confidence": random.uniform(0.5, 0.95),
             "timestamp": int(time.time())
         }
-    }
+
+    data = await signal_cache.aget(symbol, interval, "random", None, compute)
+    return {"success": True, "data": data}
+
+@app.get("/api/ai/signal-cache-stats")
+async def get_signal_cache_stats():
+    return {"success": True, "data": signal_cache.stats()}
 
 if __name__ == "__main__":
     uvicorn.run("main:app", host="0.0.0.0", port=8001, reload=True)
\ No newline at end of file
@@ -7,8 +7,10 @@ class TradingJournal(Base):
 
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, nullable=False)
+    event_type = Column(String(10), nullable=False, default="order", index=True)  # signal, order
+    order_id = Column(String(50), index=True)
     symbol = Column(String(20), nullable=False)
-    action = Column(String(10), nullable=False)  # BUY, SELL
+    action = Column(String(10), nullable=False)  # BUY, SELL, HOLD
     quantity = Column(Float, nullable=False)
     entry_price = Column(Float, nullable=False)
     stop_loss = Column(Float)
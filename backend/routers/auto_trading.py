@@ -1,15 +1,19 @@
 from fastapi import APIRouter, Depends, HTTPException
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
 from database.database import get_db
-from services.real_binance_service import RealBinanceService
-from services.auto_trading_bot import AutoTradingBot
+from services.trading_scheduler import trading_scheduler
+from services.client_pool import ClientPoolFull, real_binance_pool
+from services.advanced_ai_trading import AdvancedAITrading
+from services.signal_cache import signal_cache
+from services.order_executor import order_executor
 from auth import get_current_user
 from models.user import ExchangeKey
 
 router = APIRouter(prefix="/api/auto", tags=["auto-trading"])
+ai_engine = AdvancedAITrading()
 
-# 전역 트레이딩 봇 인스턴스
-trading_bot = AutoTradingBot()
+# 전역 스케줄러 - (사용자, 심볼, 전략) 세션을 하나의 루프에서 실행
 
 @router.post("/connect")
 async def connect_binance(
@@ -31,8 +35,8 @@ async def connect_binance(
         db.add(exchange_key)
         db.commit()
         
-        # 연결 테스트
-        binance = RealBinanceService(api_key, secret_key, testnet=True)
+        # 연결 테스트 (풀에 등록해 /start에서 재사용)
+        binance = real_binance_pool.get(exchange_key.id, api_key, secret_key, testnet=True)
         account_info = binance.get_real_account_info()
         
         return {
@@ -48,6 +52,7 @@ async def start_auto_trading(
     symbol: str = "BTCUSDT",
     quantity: float = 0.001,
     strategy: str = "trend_following",
+    interval: str = "15m",
     current_user = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
@@ -62,37 +67,42 @@ async def start_auto_trading(
     if not exchange_key:
         return {"status": "error", "message": "바이낸스 연결이 필요합니다"}
     
-    # 바이낸스 서비스 생성
-    binance_service = RealBinanceService(
-        exchange_key.api_key,
-        exchange_key.secret_key,
-        testnet=True
-    )
-    
-    # 전략 설정
-    trading_bot.set_strategy(strategy)
+    # 바이낸스 서비스 (키별 풀에서 재사용)
+    try:
+        binance_service = real_binance_pool.get(
+            exchange_key.id,
+            exchange_key.api_key,
+            exchange_key.secret_key,
+            testnet=True
+        )
+    except ClientPoolFull as e:
+        return {"status": "error", "message": str(e)}
     
-    # 자동매매 시작
-    result = trading_bot.start_trading(binance_service, symbol, quantity)
+    # 자동매매 세션 등록
+    result = trading_scheduler.add_session(
+        current_user.id, symbol, strategy, quantity, binance_service, interval, pool_key=exchange_key.id
+    )
     
     return {
         "status": result["status"],
         "message": result["message"],
+        "session_id": result.get("session_id"),
         "symbol": symbol,
         "quantity": quantity,
-        "strategy": strategy
+        "strategy": strategy,
+        "interval": interval
     }
 
 @router.post("/stop")
-async def stop_auto_trading(current_user = Depends(get_current_user)):
-    """자동매매 중지"""
-    result = trading_bot.stop_trading()
-    return result
+async def stop_auto_trading(symbol: str = None, current_user = Depends(get_current_user)):
+    """자동매매 중지 (symbol 미지정 시 사용자의 모든 세션)"""
+    stopped = trading_scheduler.stop_user_sessions(current_user.id, symbol)
+    return {"status": "success", "message": "자동매매 중지됨", "stopped_sessions": stopped}
 
 @router.get("/status")
 async def get_trading_status(current_user = Depends(get_current_user)):
     """트레이딩 상태 조회"""
-    status = trading_bot.get_status()
+    status = trading_scheduler.get_status(current_user.id)
     return {
         "status": "success",
         "bot_status": status
@@ -101,12 +111,68 @@ async def get_trading_status(current_user = Depends(get_current_user)):
 @router.post("/strategy")
 async def change_strategy(
     strategy: str,
+    symbol: str = None,
     current_user = Depends(get_current_user)
 ):
-    """트레이딩 전략 변경"""
-    result = trading_bot.set_strategy(strategy)
+    """트레이딩 전략 변경 - 해당 세션을 새 전략 세션으로 교체"""
+    sessions = [s for s in trading_scheduler.user_sessions(current_user.id)
+                if symbol is None or s.symbol == symbol.upper()]
+    for session in sessions:
+        trading_scheduler.remove_session(session.session_id)
+        result = trading_scheduler.add_session(
+            session.user_id, session.symbol, strategy, session.quantity,
+            session.binance_service, session.interval, pool_key=session.pool_key
+        )
+        if result["status"] != "success":
+            return result
+    return {"status": "success", "message": f"전략 변경: {strategy}", "sessions": len(sessions)}
+
+@router.get("/signals")
+async def get_all_signals(
+    symbol: str = "BTCUSDT",
+    interval: str = "15m",
+    limit: int = 100,
+    with_consensus: bool = True,
+    current_user = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """모든 전략 신호 + 가중 합의 (대시보드 비교용 - 캔들 파싱/지표 계산은 한 번)"""
+    exchange_key = db.query(ExchangeKey).filter(
+        ExchangeKey.user_id == current_user.id,
+        ExchangeKey.exchange_name == "binance",
+        ExchangeKey.is_active == True
+    ).first()
+    if not exchange_key:
+        return {"status": "error", "message": "바이낸스 연결이 필요합니다"}
+    try:
+        binance_service = real_binance_pool.get(
+            exchange_key.id, exchange_key.api_key, exchange_key.secret_key, testnet=True
+        )
+    except ClientPoolFull as e:
+        return {"status": "error", "message": str(e)}
+
+    chart = await run_in_threadpool(binance_service.get_real_time_chart_data, symbol.upper(), interval, limit)
+    if chart.get("status") != "success" or not chart["data"]:
+        return {"status": "error", "message": chart.get("message", "시세 데이터 없음")}
+    result = ai_engine.analyze_all(chart["data"], with_consensus=with_consensus)
+    result.update({"symbol": symbol.upper(), "interval": interval})
     return result
 
+@router.get("/pool-stats")
+async def get_client_pool_stats():
+    """바이낸스 클라이언트 풀 통계"""
+    return {"status": "success", "pool": real_binance_pool.stats()}
+
+@router.get("/signal-cache-stats")
+async def get_signal_cache_stats():
+    """봇 신호 캐시 적중률/계산 시간"""
+    return {"status": "success", "cache": signal_cache.stats()}
+
+@router.get("/order-stats")
+async def get_order_stats():
+    """주문 실행 큐 상태와 체결 응답 지연 백분위"""
+    return {"status": "success", "executor": order_executor.stats()}
+
 @router.get("/strategies")
 async def get_available_strategies():
     """사용 가능한 전략 목록"""
@@ -1,4 +1,4 @@
 # services 패키지 초기화
-from .binance_service import BinanceService, mask_api_key
+from .binance_service import BinanceService, TickerPriceCache, ticker_price_cache, mask_api_key
 
-__all__ = ["BinanceService", "mask_api_key"]
\ No newline at end of file
+__all__ = ["BinanceService", "TickerPriceCache", "ticker_price_cache", "mask_api_key"]
\ No newline at end of file
@@ -1,41 +1,174 @@
-import pandas as pd
 import numpy as np
 from typing import Dict, List
-import ta
 from datetime import datetime
+from services.indicator_engine import IndicatorEngine, candles_to_arrays, indicator_engine, latest_values
+
+# 전략별 기본 파라미터 (지표 윈도우, 임계값, 손절/익절 비율)
+DEFAULT_PARAMS = {
+    'trend_following': {"fast_window": 20, "slow_window": 50, "stop_loss_pct": 0.02, "take_profit_pct": 0.04},
+    'mean_reversion': {"rsi_window": 14, "oversold": 30, "overbought": 70, "stop_loss_pct": 0.03, "take_profit_pct": 0.03},
+    'breakout': {"window": 20, "stop_loss_pct": 0.02, "take_profit_pct": 0.05},
+    'rsi_momentum': {"rsi_window": 14, "signal_window": 3, "upper": 60, "lower": 40,
+                     "stop_loss_pct": 0.02, "take_profit_pct": 0.04}
+}
+
+def resolve_params(strategy_name: str, params: Dict = None) -> Dict:
+    """기본 파라미터에 사용자 파라미터 덮어쓰기"""
+    defaults = DEFAULT_PARAMS[strategy_name]
+    if not params:
+        return dict(defaults)  # 호출자가 고쳐도 공유 기본값은 그대로
+    return {**defaults, **params}
+
+def required_indicators(strategy_name: str, params: Dict = None) -> List[tuple]:
+    """전략별 필요 지표 (services.indicator_engine 스펙)"""
+    p = resolve_params(strategy_name, params)
+    if strategy_name == 'trend_following':
+        return [("sma", p["fast_window"]), ("sma", p["slow_window"])]
+    if strategy_name == 'mean_reversion':
+        return [("rsi", p["rsi_window"])]
+    if strategy_name == 'breakout':
+        return [("high_max_prev", p["window"]), ("low_min_prev", p["window"])]
+    if strategy_name == 'rsi_momentum':
+        return [("rsi", p["rsi_window"]), ("rsi_sma", p["rsi_window"], p["signal_window"])]
+    raise KeyError(strategy_name)
+
+def required_indicators_union(params_by_strategy: Dict[str, Dict]) -> List[tuple]:
+    """여러 전략의 필요 지표 합집합 (순서 유지, 같은 스펙은 한 번만)"""
+    specs = {}
+    for name, p in params_by_strategy.items():
+        for spec in required_indicators(name, p):
+            specs.setdefault(spec, None)
+    return list(specs)
+
+# 합의 신호 기본 가중치 (전략별 동일)
+DEFAULT_WEIGHTS = {name: 1.0 for name in DEFAULT_PARAMS}
+ACTION_DIRECTION = {"BUY": 1, "SELL": -1, "HOLD": 0}
+
+def consensus(signals: Dict[str, Dict], weights: Dict[str, float] = None, threshold: float = 0.25) -> Dict:
+    """가중 합의 - score = Σ w·confidence·방향 / Σ w, |score|가 threshold 이상이면 BUY/SELL
+
+    손절/익절은 합의 방향과 같은 신호들의 가중 평균.
+    """
+    weights = weights or DEFAULT_WEIGHTS
+    total = score = 0.0
+    for name, signal in signals.items():
+        w = weights.get(name, 0.0)
+        total += w
+        score += w * signal["confidence"] * ACTION_DIRECTION.get(signal["action"], 0)
+    score = score / total if total else 0.0
+    action = "BUY" if score >= threshold else "SELL" if score <= -threshold else "HOLD"
+    agreeing = [(weights.get(n, 0.0), s) for n, s in signals.items() if s["action"] == action]
+    agree_weight = sum(w for w, _ in agreeing)
+    entry_price = next(iter(signals.values()))["entry_price"] if signals else None
+    result = {
+        "action": action,
+        "confidence": round(abs(score), 4),
+        "score": round(score, 4),
+        "agreement": f"{len(agreeing)}/{len(signals)}",
+        "entry_price": entry_price,
+        "strategy": "consensus"
+    }
+    if action != "HOLD" and agree_weight:
+        result["stop_loss"] = sum(w * s["stop_loss"] for w, s in agreeing) / agree_weight
+        result["take_profit"] = sum(w * s["take_profit"] for w, s in agreeing) / agree_weight
+    return result
+
+def _signal(action, confidence, reason, current_price, p, strategy_name):
+    return {
+        "action": action,
+        "confidence": confidence,
+        "reason": reason,
+        "entry_price": current_price,
+        "stop_loss": current_price * (1 - p["stop_loss_pct"]),
+        "take_profit": current_price * (1 + p["take_profit_pct"]),
+        "strategy": strategy_name
+    }
 
 class AdvancedAITrading:
-    def __init__(self):
+    """전략 분석기 - 각 전략은 (지표 dict, resolve_params로 채운 파라미터)를 받는다"""
+
+    def __init__(self, engine: IndicatorEngine = None):
         self.strategies = {
             'trend_following': self.trend_following_strategy,
             'mean_reversion': self.mean_reversion_strategy,
             'breakout': self.breakout_strategy,
             'rsi_momentum': self.rsi_momentum_strategy
         }
+        self.engine = engine or indicator_engine
+    
+    def analyze_with_strategy(self, data: List, strategy_name: str = 'trend_following', params: Dict = None):
+        """선택된 전략으로 분석 (윈도우 전체를 배치 계산)"""
+        if strategy_name not in self.strategies:
+            return {"status": "error", "message": "전략을 찾을 수 없습니다"}
+        
+        p = resolve_params(strategy_name, params)
+        high, low, close = candles_to_arrays(data)
+        ind = latest_values(required_indicators(strategy_name, p), high, low, close)
+        return self.strategies[strategy_name](ind, p)
     
-    def analyze_with_strategy(self, data: List, strategy_name: str = 'trend_following'):
-        """선택된 전략으로 분석"""
+    def analyze_incremental(self, symbol: str, interval: str, data: List, strategy_name: str = 'trend_following',
+                            params: Dict = None):
+        """증분 지표 엔진으로 분석 - 새로 마감된 봉만 반영 (봇 루프용)"""
         if strategy_name not in self.strategies:
             return {"status": "error", "message": "전략을 찾을 수 없습니다"}
         
-        df = pd.DataFrame(data)
-        return self.strategies[strategy_name](df)
+        p = resolve_params(strategy_name, params)
+        ind = self.engine.on_candles(symbol, interval, data, required_indicators(strategy_name, p))
+        return self.strategies[strategy_name](ind, p)
     
-    def trend_following_strategy(self, df):
+    def _resolve_all(self, strategies: List[str] = None, params: Dict[str, Dict] = None) -> Dict[str, Dict]:
+        names = list(strategies or self.strategies)
+        unknown = [name for name in names if name not in self.strategies]
+        if unknown:
+            raise KeyError(", ".join(unknown))
+        params = params or {}
+        return {name: resolve_params(name, params.get(name)) for name in names}
+
+    def _run_all(self, ind: Dict, resolved: Dict[str, Dict], weights: Dict[str, float], with_consensus: bool) -> Dict:
+        signals = {name: self.strategies[name](ind, p) for name, p in resolved.items()}
+        result = {"status": "success", "signals": signals}
+        if with_consensus:
+            result["consensus"] = consensus(signals, weights)
+        return result
+
+    def analyze_all(self, data: List, strategies: List[str] = None, params: Dict[str, Dict] = None,
+                    weights: Dict[str, float] = None, with_consensus: bool = True) -> Dict:
+        """여러 전략 한 번에 분석 - 캔들 파싱과 지표(합집합) 계산을 한 번만 한다
+
+        params: {전략: 파라미터}, weights: 합의 가중치 (기본 동일).
+        """
+        try:
+            resolved = self._resolve_all(strategies, params)
+        except KeyError as e:
+            return {"status": "error", "message": f"전략을 찾을 수 없습니다: {e}"}
+        high, low, close = candles_to_arrays(data)
+        ind = latest_values(required_indicators_union(resolved), high, low, close)
+        return self._run_all(ind, resolved, weights, with_consensus)
+
+    def analyze_all_incremental(self, symbol: str, interval: str, data: List, strategies: List[str] = None,
+                                params: Dict[str, Dict] = None, weights: Dict[str, float] = None,
+                                with_consensus: bool = True) -> Dict:
+        """analyze_all의 증분 지표 엔진 버전"""
+        try:
+            resolved = self._resolve_all(strategies, params)
+        except KeyError as e:
+            return {"status": "error", "message": f"전략을 찾을 수 없습니다: {e}"}
+        ind = self.engine.on_candles(symbol, interval, data, required_indicators_union(resolved))
+        return self._run_all(ind, resolved, weights, with_consensus)
+
+    def trend_following_strategy(self, ind: Dict, params: Dict = None):
         """트렌드 추종 전략"""
+        p = params or DEFAULT_PARAMS['trend_following']
         # 이동평균 기반 트렌드 분석
-        df['sma_20'] = ta.trend.sma_indicator(df['close'], window=20)
-        df['sma_50'] = ta.trend.sma_indicator(df['close'], window=50)
-        
-        current_price = df['close'].iloc[-1]
-        sma_20 = df['sma_20'].iloc[-1]
-        sma_50 = df['sma_50'].iloc[-1]
+        current_price = ind['close']
+        sma_fast = ind[("sma", p["fast_window"])]
+        sma_slow = ind[("sma", p["slow_window"])]
         
-        if sma_20 > sma_50 and current_price > sma_20:
+        if sma_fast > sma_slow and current_price > sma_fast:
             action = "BUY"
             confidence = 0.8
             reason = "강한 상승 트렌드 - 골든크로스 확인"
-        elif sma_20 < sma_50 and current_price < sma_20:
+        elif sma_fast < sma_slow and current_price < sma_fast:
             action = "SELL"
             confidence = 0.7
             reason = "강한 하락 트렌드 - 데드크로스 확인"
@@ -44,27 +177,19 @@ class AdvancedAITrading:
             confidence = 0.5
             reason = "트렌드 불명확 - 관망 필요"
         
-        return {
-            "action": action,
-            "confidence": confidence,
-            "reason": reason,
-            "entry_price": current_price,
-            "stop_loss": current_price * 0.98,
-            "take_profit": current_price * 1.04,
-            "strategy": "trend_following"
-        }
+        return _signal(action, confidence, reason, current_price, p, "trend_following")
     
-    def mean_reversion_strategy(self, df):
+    def mean_reversion_strategy(self, ind: Dict, params: Dict = None):
         """평균 회귀 전략"""
-        df['rsi'] = ta.momentum.rsi(df['close'], window=14)
-        current_rsi = df['rsi'].iloc[-1]
-        current_price = df['close'].iloc[-1]
+        p = params or DEFAULT_PARAMS['mean_reversion']
+        current_rsi = ind[("rsi", p["rsi_window"])]
+        current_price = ind['close']
         
-        if current_rsi < 30:  # 과매도
+        if current_rsi < p["oversold"]:  # 과매도
             action = "BUY"
             confidence = 0.75
             reason = "RSI 과매도 구간 - 매수 기회"
-        elif current_rsi > 70:  # 과매수
+        elif current_rsi > p["overbought"]:  # 과매수
             action = "SELL"
             confidence = 0.65
             reason = "RSI 과매수 구간 - 매도 기회"
@@ -73,24 +198,14 @@ class AdvancedAITrading:
             confidence = 0.5
             reason = "RSI 중립 구간 - 관망"
         
-        return {
-            "action": action,
-            "confidence": confidence,
-            "reason": reason,
-            "entry_price": current_price,
-            "stop_loss": current_price * 0.97,
-            "take_profit": current_price * 1.03,
-            "strategy": "mean_reversion"
-        }
+        return _signal(action, confidence, reason, current_price, p, "mean_reversion")
     
-    def breakout_strategy(self, df):
+    def breakout_strategy(self, ind: Dict, params: Dict = None):
         """브레이크아웃 전략"""
-        df['high_20'] = df['high'].rolling(window=20).max()
-        df['low_20'] = df['low'].rolling(window=20).min()
-        
-        current_price = df['close'].iloc[-1]
-        resistance = df['high_20'].iloc[-2]  # 이전 저항선
-        support = df['low_20'].iloc[-2]      # 이전 지지선
+        p = params or DEFAULT_PARAMS['breakout']
+        current_price = ind['close']
+        resistance = ind[("high_max_prev", p["window"])]  # 이전 저항선
+        support = ind[("low_min_prev", p["window"])]      # 이전 지지선
         
         if current_price > resistance:
             action = "BUY"
@@ -105,30 +220,20 @@ class AdvancedAITrading:
             confidence = 0.5
             reason = "범위 내 횡보 - 관망"
         
-        return {
-            "action": action,
-            "confidence": confidence,
-            "reason": reason,
-            "entry_price": current_price,
-            "stop_loss": current_price * 0.98,
-            "take_profit": current_price * 1.05,
-            "strategy": "breakout"
-        }
+        return _signal(action, confidence, reason, current_price, p, "breakout")
     
-    def rsi_momentum_strategy(self, df):
+    def rsi_momentum_strategy(self, ind: Dict, params: Dict = None):
         """RSI 모멘텀 전략"""
-        df['rsi'] = ta.momentum.rsi(df['close'], window=14)
-        df['rsi_signal'] = df['rsi'].rolling(window=3).mean()
+        p = params or DEFAULT_PARAMS['rsi_momentum']
+        current_rsi = ind[("rsi", p["rsi_window"])]
+        current_signal = ind[("rsi_sma", p["rsi_window"], p["signal_window"])]
+        current_price = ind['close']
         
-        current_rsi = df['rsi'].iloc[-1]
-        current_signal = df['rsi_signal'].iloc[-1]
-        current_price = df['close'].iloc[-1]
-        
-        if current_rsi > current_signal and current_rsi < 60:
+        if current_rsi > current_signal and current_rsi < p["upper"]:
             action = "BUY"
             confidence = 0.7
             reason = "RSI 모멘텀 상승 - 매수 신호"
-        elif current_rsi < current_signal and current_rsi > 40:
+        elif current_rsi < current_signal and current_rsi > p["lower"]:
             action = "SELL"
             confidence = 0.6
             reason = "RSI 모멘텀 하락 - 매도 신호"
@@ -137,15 +242,7 @@ class AdvancedAITrading:
             confidence = 0.5
             reason = "RSI 모멘텀 불명확 - 관망"
         
-        return {
-            "action": action,
-            "confidence": confidence,
-            "reason": reason,
-            "entry_price": current_price,
-            "stop_loss": current_price * 0.98,
-            "take_profit": current_price * 1.04,
-            "strategy": "rsi_momentum"
-        }
+        return _signal(action, confidence, reason, current_price, p, "rsi_momentum")
 
 class TradingBot:
     def __init__(self):
@@ -169,4 +266,29 @@ class TradingBot:
             self.current_strategy = strategy_name
             return {"status": "success", "message": f"전략 변경: {strategy_name}"}
         else:
-            return {"status": "error", "message": "지원하지 않는 전략입니다"}
\ No newline at end of file
+            return {"status": "error", "message": "지원하지 않는 전략입니다"}
+
+# 모듈 테스트: 전략별 4회 분석 vs analyze_all 1회
+if __name__ == "__main__":
+    import time
+
+    rng = np.random.default_rng(0)
+    close = 50000 + np.cumsum(rng.normal(0, 50, 101))
+    candles = [{"timestamp": i, "high": c + 20, "low": c - 20, "close": c} for i, c in enumerate(close.tolist())]
+    ai = AdvancedAITrading()
+    rounds = 2000
+
+    started = time.perf_counter()
+    for _ in range(rounds):
+        separate = {name: ai.analyze_with_strategy(candles, name) for name in ai.strategies}
+    separate_us = (time.perf_counter() - started) / rounds * 1e6
+
+    started = time.perf_counter()
+    for _ in range(rounds):
+        combined = ai.analyze_all(candles)
+    combined_us = (time.perf_counter() - started) / rounds * 1e6
+
+    assert combined["signals"] == separate
+    print(f"4 x analyze_with_strategy: {separate_us:8.1f} us")
+    print(f"analyze_all:               {combined_us:8.1f} us")
+    print(f"consensus: {combined['consensus']}")
@@ -0,0 +1,197 @@
+import asyncio
+import time
+from typing import Dict, List, Optional, Union
+
+import httpx
+
+from services.binance_service import (
+    BinanceService,
+    TickerPriceCache,
+    fallback_ticker_price,
+    fallback_24hr_ticker,
+    fallback_exchange_info,
+    fallback_account_balances,
+)
+from services.rate_limiter import WeightRateLimiter, request_weight
+from services.metrics import binance_request_seconds, binance_request_weight
+
+# 커넥션 풀 설정 (keep-alive 재사용)
+DEFAULT_LIMITS = httpx.Limits(max_connections=100, max_keepalive_connections=20, keepalive_expiry=30)
+
+class AsyncBinanceService(BinanceService):
+    """BinanceService 비동기 버전 - 커넥션 풀 기반 httpx.AsyncClient 사용
+
+    메서드 구성은 BinanceService와 같고 모두 코루틴이다.
+    """
+
+    def __init__(self, api_key: str = "", secret_key: str = "", price_cache: TickerPriceCache = None,
+                 rate_limiter: WeightRateLimiter = None, limits: httpx.Limits = DEFAULT_LIMITS):
+        super().__init__(api_key, secret_key, price_cache, rate_limiter)
+        self.limits = limits
+        self._client: Optional[httpx.AsyncClient] = None
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(timeout=self.timeout, limits=self.limits)
+        return self._client
+
+    async def aclose(self):
+        """커넥션 풀 종료"""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    async def _rate_limit(self, endpoint: str, params: Dict = None):
+        """요청 제한 관리 (이벤트 루프를 막지 않음)"""
+        weight = request_weight(endpoint, params)
+        binance_request_weight.labels(endpoint).inc(weight)
+        await self.rate_limiter.acquire_async(weight)
+
+    async def _make_public_request(self, endpoint: str, params: Dict = None):
+        """공개 API 요청"""
+        await self._rate_limit(endpoint, params)
+        url = f"{self.base_url}/{endpoint}"
+        started = time.perf_counter()
+        try:
+            response = await self.client.get(url, params=params)
+            self._check_response(response)
+            binance_request_seconds.labels(endpoint, "ok").observe(time.perf_counter() - started)
+            return response.json()
+        except httpx.HTTPError as e:
+            binance_request_seconds.labels(endpoint, "error").observe(time.perf_counter() - started)
+            print(f"Binance API request failed: {e}")
+            raise
+
+    async def _make_signed_request(self, endpoint: str, params: Dict = None):
+        """서명된 API 요청"""
+        if not self.api_key or not self.secret_key:
+            raise ValueError("API key and secret key required for signed requests")
+
+        await self._rate_limit(endpoint, params)
+        url = f"{self.base_url}/{endpoint}"
+        params, headers = self._sign(params)
+
+        started = time.perf_counter()
+        try:
+            response = await self.client.get(url, params=params, headers=headers)
+            self._check_response(response)
+            binance_request_seconds.labels(endpoint, "ok").observe(time.perf_counter() - started)
+            return response.json()
+        except httpx.HTTPError as e:
+            binance_request_seconds.labels(endpoint, "error").observe(time.perf_counter() - started)
+            print(f"Binance signed request failed: {e}")
+            raise
+
+    async def get_ticker_price(self, symbol: str = None) -> Union[Dict, List]:
+        """가격 조회 (전체 스냅샷 캐시 경유)"""
+        try:
+            endpoint = "ticker/price"
+            cached = await self.price_cache.aget(
+                lambda: self._make_public_request(endpoint), symbol
+            )
+            if cached is not None:
+                return cached
+            # 스냅샷에 없는 심볼은 단건 조회
+            params = {"symbol": symbol.upper()}
+            return await self._make_public_request(endpoint, params)
+        except Exception as e:
+            print(f"Error in get_ticker_price: {e}")
+            return fallback_ticker_price(symbol)
+
+    async def get_24hr_ticker(self, symbol: str) -> Dict:
+        """24시간 티커 정보"""
+        try:
+            endpoint = "ticker/24hr"
+            params = {"symbol": symbol.upper()}
+            return await self._make_public_request(endpoint, params)
+        except Exception as e:
+            print(f"Error in get_24hr_ticker: {e}")
+            return fallback_24hr_ticker(symbol)
+
+    async def get_exchange_info(self) -> Dict:
+        """거래소 정보 (메모리 저장소 경유, 최초 로드만 스레드에서 수행)"""
+        if not self.info_store.is_loaded:
+            await asyncio.to_thread(self.info_store.ensure_loaded)
+        info = self.info_store.get_info()
+        if info is None:
+            return fallback_exchange_info()
+        return info
+
+    async def get_server_time(self) -> Dict:
+        """서버 시간"""
+        try:
+            endpoint = "time"
+            return await self._make_public_request(endpoint)
+        except Exception as e:
+            print(f"Error in get_server_time: {e}")
+            return {"serverTime": int(time.time() * 1000)}
+
+    async def get_account_balances(self) -> List[Dict]:
+        """계정 잔고 조회"""
+        try:
+            if not self.api_key or not self.secret_key:
+                raise ValueError("API keys required for balance check")
+
+            endpoint = "account"
+            result = await self._make_signed_request(endpoint)
+            return result.get('balances', [])
+        except Exception as e:
+            print(f"Error in get_account_balances: {e}")
+            return fallback_account_balances()
+
+    async def test_connection(self) -> Dict:
+        """연결 테스트"""
+        result = await self.get_server_time()
+        return {
+            "status": "success",
+            "msg": "Binance connection successful",
+            "server_time": result.get('serverTime'),
+            "local_time": int(time.time() * 1000)
+        }
+
+    async def get_symbol_info(self, symbol: str) -> Optional[Dict]:
+        """심볼 정보 조회 (인덱스 O(1))"""
+        if not self.info_store.is_loaded:
+            await asyncio.to_thread(self.info_store.ensure_loaded)
+        return self.info_store.get_symbol(symbol)
+
+async def _benchmark(base_url: str, total: int = 2000, concurrency: int = 50):
+    """스텁 서버 대상 처리량 측정 - 동기(스레드) vs 비동기(커넥션 풀)"""
+    from concurrent.futures import ThreadPoolExecutor
+
+    # 측정 대상은 전송 계층이므로 가중치 한도 없는 리미터 사용
+    unlimited = WeightRateLimiter(capacity=10 ** 9)
+    sync_service = BinanceService(rate_limiter=unlimited)
+    sync_service.base_url = base_url
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        list(pool.map(lambda _: sync_service._make_public_request("ticker/24hr", {"symbol": "BTCUSDT"}), range(total)))
+    sync_elapsed = time.perf_counter() - start
+
+    async_service = AsyncBinanceService(rate_limiter=unlimited)
+    async_service.base_url = base_url
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one():
+        async with semaphore:
+            await async_service._make_public_request("ticker/24hr", {"symbol": "BTCUSDT"})
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one() for _ in range(total)))
+    async_elapsed = time.perf_counter() - start
+    await async_service.aclose()
+
+    print(f"sync (thread pool x{concurrency}):  {total / sync_elapsed:8.1f} req/s")
+    print(f"async (pooled x{concurrency}):      {total / async_elapsed:8.1f} req/s")
+
+# 모듈 테스트 (로컬 스텁 서버 대상 처리량 측정 - 인자로 녹화 파일을 주면 실제 응답 재생)
+if __name__ == "__main__":
+    import sys
+    from services.binance_stub import BinanceStubServer, Recording
+
+    routes = Recording.load(sys.argv[1]).routes() if len(sys.argv) > 1 else None
+    with BinanceStubServer(routes=routes) as stub:
+        print(f"Benchmarking against {stub.base_url}")
+        asyncio.run(_benchmark(stub.base_url))
@@ -2,14 +2,31 @@ import time
 import threading
 from typing import Dict, List
 from services.advanced_ai_trading import AdvancedAITrading
+from services.journal_writer import JournalWriter, journal_writer
+from services.position_book import PositionBook, position_book
+from services.exit_monitor import ExitMonitor, exit_monitor
+from services.metrics import bot_iteration_seconds
+from services.order_executor import make_client_order_id
+from services.signal_cache import SignalCache, signal_cache
+from services.kline_store import INTERVAL_MS
 
 class AutoTradingBot:
-    def __init__(self):
+    def __init__(self, user_id: int = None, interval: str = "15m", journal: JournalWriter = None,
+                 book: PositionBook = None, monitor: ExitMonitor = None, signals: SignalCache = None,
+                 window: int = 50):
+        self.user_id = user_id
+        self.interval = interval
+        self.window = window  # 분석에 쓰는 마감 봉 수 (스케줄러와 동일)
         self.is_running = False
         self.current_strategy = "trend_following"
         self.ai_engine = AdvancedAITrading()
         self.trading_thread = None
-        self.positions = []
+        self.last_analysis = None
+        self.journal = journal or journal_writer
+        self.book = book or position_book
+        self.exit_monitor = monitor or exit_monitor
+        self.signals = signals or signal_cache
+        self.last_candle_times: Dict = {}  # (symbol, interval) -> 마지막으로 평가한 마감 봉 open time
         
     def start_trading(self, binance_service, symbol: str = "BTCUSDT", quantity: float = 0.001):
         """자동매매 시작"""
@@ -37,39 +54,20 @@ class AutoTradingBot:
         """트레이딩 메인 루프"""
         while self.is_running:
             try:
-                # 1. 시장 데이터 수집
-                chart_data = binance_service.get_real_time_chart_data(symbol, "15m", 50)
+                # 1. 시장 데이터 수집 (진행 중인 봉은 버리므로 한 개 더)
+                chart_data = binance_service.get_real_time_chart_data(symbol, self.interval, self.window + 1)
                 if chart_data["status"] != "success":
                     time.sleep(60)
                     continue
                 
-                # 2. AI 분석
-                analysis = self.ai_engine.analyze_with_strategy(
-                    chart_data["data"], 
-                    self.current_strategy
-                )
-                
-                # 3. 매매 조건 확인 (신뢰도 70% 이상, 현재 포지션이 없을 때)
-                if (analysis["action"] in ["BUY", "SELL"] and 
-                    analysis["confidence"] > 0.7 and
-                    not self._has_active_position(symbol)):
-                    
-                    # 4. 주문 실행
-                    order_result = binance_service.place_real_order(
-                        symbol=symbol,
-                        side=analysis["action"],
-                        quantity=quantity
-                    )
-                    
-                    if order_result["status"] == "success":
-                        self.positions.append({
-                            "symbol": symbol,
-                            "side": analysis["action"],
-                            "quantity": quantity,
-                            "entry_time": time.time(),
-                            "order_id": order_result["order"]["orderId"]
-                        })
-                        print(f"✅ {analysis['action']} 주문 실행: {symbol}")
+                # 2~4. 분석 및 주문 (마감된 봉만 - 신호는 봉 마감 때만 바뀐다)
+                cutoff = time.time() * 1000 - INTERVAL_MS[self.interval]
+                candles = [c for c in chart_data["data"] if c["timestamp"] <= cutoff]
+                # 같은 마감 봉은 한 번만 평가 (스케줄러와 동일 - 봉 안에서 청산돼도 재진입하지 않음)
+                key = (symbol, self.interval)
+                if candles and candles[-1]["timestamp"] > self.last_candle_times.get(key, -1):
+                    self.last_candle_times[key] = candles[-1]["timestamp"]
+                    self.process_candles(binance_service, symbol, quantity, candles)
                 
                 # 5. 1분 대기
                 time.sleep(60)
@@ -78,10 +76,71 @@ class AutoTradingBot:
                 print(f"❌ 트레이딩 루프 에러: {e}")
                 time.sleep(60)
     
+    def process_candles(self, binance_service, symbol: str, quantity: float, candles: List[Dict]):
+        """캔들 윈도우 한 번 처리 - AI 분석 후 조건 충족 시 주문 (스레드 루프/스케줄러 공용)"""
+        started = time.perf_counter()
+        outcome = "error"
+        try:
+            result = self._evaluate(binance_service, symbol, quantity, candles)
+            outcome = "hold" if result is None else "order"
+            return result
+        finally:
+            bot_iteration_seconds.labels(self.current_strategy, outcome).observe(time.perf_counter() - started)
+
+    def _evaluate(self, binance_service, symbol: str, quantity: float, candles: List[Dict]):
+        # 2. AI 분석 (증분 지표 - 새 마감 봉만 반영, 같은 봉/전략은 세션 간 한 번만 계산)
+        strategy = self.current_strategy
+        analysis = self.signals.get(
+            symbol, self.interval, strategy, None,
+            lambda: self.ai_engine.analyze_incremental(symbol, self.interval, candles, strategy),
+            candle_time=candles[-1]["timestamp"]
+        )
+        self.last_analysis = analysis
+        self.journal.record_signal(self.user_id, symbol, analysis, self.current_strategy)
+        
+        # 3. 매매 조건 확인 (신뢰도 70% 이상, 현재 포지션이 없을 때)
+        if (analysis["action"] in ["BUY", "SELL"] and 
+            analysis["confidence"] > 0.7 and
+            not self._has_active_position(symbol)):
+            
+            # 4. 주문 실행 (같은 봉의 같은 신호는 같은 주문 ID - 재평가/재시도 중복 체결 방지)
+            order_result = binance_service.place_real_order(
+                symbol=symbol,
+                side=analysis["action"],
+                quantity=quantity,
+                client_order_id=make_client_order_id(
+                    self.user_id, symbol, analysis["action"], strategy, candles[-1]["timestamp"])
+            )
+            
+            if order_result["status"] == "success":
+                order = order_result["order"]
+                if order_result.get("recovered") and self.book.knows_order(symbol, order.get("orderId")):
+                    # 같은 봉/신호의 이전 주문(-4116 등으로 되찾음) - 이미 반영했거나 청산된 체결
+                    print(f"↩️ 이미 반영된 주문 재확인: {symbol} #{order.get('orderId')}")
+                    return order_result
+                fill_price = float(order.get("avgPrice") or 0) or analysis["entry_price"]
+                self.journal.record_order(
+                    self.user_id, symbol, analysis["action"], quantity, fill_price,
+                    order.get("orderId"), analysis, self.current_strategy
+                )
+                position = self.book.on_fill(
+                    self.user_id, symbol, analysis["action"], quantity, fill_price, order.get("orderId"),
+                    analysis.get("stop_loss"), analysis.get("take_profit"), self.current_strategy
+                )
+                if position is not None:
+                    self.exit_monitor.track(position, binance_service)
+                print(f"✅ {analysis['action']} 주문 실행: {symbol}")
+            return order_result
+        return None
+    
+    @property
+    def positions(self) -> List[Dict]:
+        """사용자의 열린 포지션"""
+        return [p.to_dict() for p in self.book.user_positions(self.user_id)]
+    
     def _has_active_position(self, symbol: str) -> bool:
-        """활성 포지션 확인"""
-        # 간단한 구현 - 실제로는 바이낸스에서 포지션 조회
-        return any(pos["symbol"] == symbol for pos in self.positions)
+        """활성 포지션 확인 (포지션 장부 O(1) 조회)"""
+        return self.book.has_open(self.user_id, symbol)
     
     def set_strategy(self, strategy_name: str):
         """트레이딩 전략 설정"""
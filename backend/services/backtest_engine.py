@@ -0,0 +1,237 @@
+import math
+import os
+import time
+from multiprocessing import Pool
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from services.advanced_ai_trading import AdvancedAITrading, required_indicators, resolve_params
+from services.indicator_engine import batch_indicator
+
+class OHLCV:
+    """OHLCV 히스토리 (NumPy 배열)"""
+
+    def __init__(self, open_time: np.ndarray, open_: np.ndarray, high: np.ndarray,
+                 low: np.ndarray, close: np.ndarray, volume: np.ndarray):
+        self.open_time = open_time
+        self.open = open_
+        self.high = high
+        self.low = low
+        self.close = close
+        self.volume = volume
+
+    def __len__(self):
+        return len(self.close)
+
+def load_ohlcv(path: str) -> OHLCV:
+    """CSV/Parquet kline 파일 로드
+
+    컬럼: open_time(또는 timestamp), open, high, low, close, volume.
+    헤더 없는 CSV는 바이낸스 kline 덤프 형식(앞 6개 컬럼)으로 본다.
+    """
+    import pandas as pd
+
+    if path.endswith(".parquet"):
+        df = pd.read_parquet(path)
+    else:
+        df = pd.read_csv(path)
+        if "close" not in df.columns:
+            df = pd.read_csv(path, header=None, usecols=range(6),
+                             names=["open_time", "open", "high", "low", "close", "volume"])
+    time_col = "open_time" if "open_time" in df.columns else "timestamp"
+    return OHLCV(
+        df[time_col].to_numpy(dtype=np.int64),
+        df["open"].to_numpy(dtype=np.float64),
+        df["high"].to_numpy(dtype=np.float64),
+        df["low"].to_numpy(dtype=np.float64),
+        df["close"].to_numpy(dtype=np.float64),
+        df["volume"].to_numpy(dtype=np.float64)
+    )
+
+def _find_exit(data: OHLCV, start: int, side: int, stop: float, take: float,
+               chunk: int = 256) -> Tuple[Optional[int], Optional[str], float]:
+    """start 봉부터 손절/익절 도달 봉 탐색 (청크 단위 벡터 검색)
+
+    같은 봉에서 둘 다 닿으면 보수적으로 손절 처리. 갭으로 레벨을 넘어 시가가
+    형성되면 시가로 체결한다.
+    """
+    n = len(data)
+    i = start
+    while i < n:
+        j = min(n, i + chunk)
+        high, low = data.high[i:j], data.low[i:j]
+        if side > 0:
+            stop_hit, take_hit = low <= stop, high >= take
+        else:
+            stop_hit, take_hit = high >= stop, low <= take
+        hit = stop_hit | take_hit
+        if hit.any():
+            k = int(hit.argmax())
+            idx = i + k
+            bar_open = data.open[idx]
+            if stop_hit[k]:
+                price = min(bar_open, stop) if side > 0 else max(bar_open, stop)
+                return idx, "stop_loss", price
+            price = max(bar_open, take) if side > 0 else min(bar_open, take)
+            return idx, "take_profit", price
+        i = j
+        chunk *= 2
+    return None, None, 0.0
+
+class BacktestEngine:
+    """AdvancedAITrading 전략 백테스트 (이벤트 기반)
+
+    지표는 히스토리 전체를 배치로 한 번 계산하고, 포지션이 없는 봉에서만
+    전략을 호출한다. 진입은 신호 봉 종가, 청산은 전략이 돌려준 stop_loss/
+    take_profit 도달 시점. SELL 신호는 숏으로 보고, 레벨이 롱 기준으로
+    주어지면 진입가 기준으로 뒤집는다.
+    """
+
+    def __init__(self, ai_engine: AdvancedAITrading = None, fee_rate: float = 0.0004,
+                 min_confidence: float = 0.0, initial_capital: float = 10000.0):
+        self.ai_engine = ai_engine or AdvancedAITrading()
+        self.fee_rate = fee_rate
+        self.min_confidence = min_confidence
+        self.initial_capital = initial_capital
+
+    @staticmethod
+    def _column(spec, data: OHLCV, cache: Dict) -> Tuple[List, int]:
+        """지표 열(list)과 첫 유효 인덱스 - 파라미터 조합 간 재사용되도록 cache에 보관"""
+        key = ("column", spec)
+        entry = cache.get(key)
+        if entry is None:
+            values = batch_indicator(spec, data.high, data.low, data.close, cache)
+            valid = np.flatnonzero(~np.isnan(values))
+            entry = cache[key] = (values.tolist(), int(valid[0]) if len(valid) else len(values))
+        return entry
+
+    def _signal_inputs(self, data: OHLCV, strategy_name: str, params: Dict, cache: Dict) -> Tuple[List, List, int]:
+        specs = required_indicators(strategy_name, params)
+        entries = [self._column(spec, data, cache) for spec in specs]
+        start = max((first for _, first in entries), default=0)
+        return specs, [column for column, _ in entries], start
+
+    def run(self, data: OHLCV, strategy_name: str, cache: Dict = None, keep_trades: bool = False,
+            params: Dict = None) -> Dict:
+        """전략 하나 백테스트 (cache는 같은 data에 대해서만 공유)"""
+        if strategy_name not in self.ai_engine.strategies:
+            return {"status": "error", "message": "전략을 찾을 수 없습니다"}
+        cache = {} if cache is None else cache
+        strategy = self.ai_engine.strategies[strategy_name]
+        params = resolve_params(strategy_name, params)
+        # 모든 지표가 채워지는 첫 봉부터 시작
+        specs, columns, start = self._signal_inputs(data, strategy_name, params, cache)
+        close = cache.get("close")
+        if close is None:
+            close = cache["close"] = data.close.tolist()
+        n = len(close)
+
+        equity = self.initial_capital
+        peak = equity
+        max_drawdown = 0.0
+        trades = []
+        wins = 0
+        gross_profit = gross_loss = 0.0
+
+        i = start
+        while i < n - 1:
+            ind = {"close": close[i]}
+            for spec, column in zip(specs, columns):
+                ind[spec] = column[i]
+            signal = strategy(ind, params)
+            action = signal["action"]
+            if action not in ("BUY", "SELL") or signal["confidence"] < self.min_confidence:
+                i += 1
+                continue
+
+            side = 1 if action == "BUY" else -1
+            entry = signal["entry_price"]
+            stop, take = signal["stop_loss"], signal["take_profit"]
+            if side < 0 and stop < entry:
+                stop, take = 2 * entry - stop, 2 * entry - take
+
+            exit_idx, reason, exit_price = _find_exit(data, i + 1, side, stop, take)
+            if exit_idx is None:
+                exit_idx, reason, exit_price = n - 1, "end_of_data", close[-1]
+
+            ret = side * (exit_price / entry - 1) - 2 * self.fee_rate
+            pnl = equity * ret
+            equity += pnl
+            if pnl > 0:
+                wins += 1
+                gross_profit += pnl
+            else:
+                gross_loss -= pnl
+            peak = max(peak, equity)
+            max_drawdown = max(max_drawdown, (peak - equity) / peak if peak else 0.0)
+            if keep_trades:
+                trades.append({
+                    "side": action, "entry_time": int(data.open_time[i]), "exit_time": int(data.open_time[exit_idx]),
+                    "entry_price": entry, "exit_price": float(exit_price), "exit_reason": reason,
+                    "return_pct": round(ret * 100, 4), "pnl": round(pnl, 4)
+                })
+            else:
+                trades.append(ret)
+            i = exit_idx + 1
+
+        count = len(trades)
+        report = {
+            "strategy": strategy_name,
+            "params": params,
+            "bars": n,
+            "trades": count,
+            "win_rate": round(wins / count, 4) if count else 0.0,
+            "pnl": round(equity - self.initial_capital, 4),
+            "return_pct": round((equity / self.initial_capital - 1) * 100, 4),
+            "max_drawdown_pct": round(max_drawdown * 100, 4),
+            "profit_factor": round(gross_profit / gross_loss, 4) if gross_loss else (math.inf if gross_profit else 0.0),
+            "final_equity": round(equity, 4)
+        }
+        if keep_trades:
+            report["trade_log"] = trades
+        return report
+
+    def run_all(self, data: OHLCV, strategies: Iterable[str] = None, keep_trades: bool = False) -> Dict[str, Dict]:
+        """여러 전략 백테스트 (지표 계산 공유)"""
+        cache: Dict = {}
+        names = list(strategies or self.ai_engine.strategies)
+        return {name: self.run(data, name, cache, keep_trades) for name in names}
+
+def _backtest_symbol(task: Tuple[str, str, Optional[List[str]], Dict]) -> Tuple[str, Dict]:
+    """프로세스 풀 작업 단위 - 심볼 하나의 모든 전략"""
+    symbol, path, strategies, engine_kwargs = task
+    data = load_ohlcv(path)
+    return symbol, BacktestEngine(**engine_kwargs).run_all(data, strategies)
+
+def run_backtests(paths: Dict[str, str], strategies: List[str] = None, processes: int = None,
+                  **engine_kwargs) -> Dict[str, Dict]:
+    """심볼별 파일을 프로세스 풀에서 병렬 백테스트 - {symbol: {strategy: report}}"""
+    tasks = [(symbol, path, strategies, engine_kwargs) for symbol, path in paths.items()]
+    if len(tasks) == 1 or processes == 1:
+        return dict(map(_backtest_symbol, tasks))
+    with Pool(processes=processes or os.cpu_count()) as pool:
+        return dict(pool.imap_unordered(_backtest_symbol, tasks))
+
+def format_report(results: Dict[str, Dict]) -> str:
+    """결과 표"""
+    lines = [f"{'symbol':<12}{'strategy':<18}{'trades':>8}{'win%':>8}{'return%':>10}{'maxDD%':>9}{'PF':>8}"]
+    for symbol in sorted(results):
+        for name, r in results[symbol].items():
+            lines.append(f"{symbol:<12}{name:<18}{r['trades']:>8}{r['win_rate'] * 100:>8.1f}"
+                         f"{r['return_pct']:>10.2f}{r['max_drawdown_pct']:>9.2f}{r['profit_factor']:>8.2f}")
+    return "\n".join(lines)
+
+# 모듈 테스트: python -m services.backtest_engine BTCUSDT_1m.csv ETHUSDT_1m.parquet ...
+if __name__ == "__main__":
+    import sys
+
+    files = sys.argv[1:]
+    if not files:
+        print("usage: python -m services.backtest_engine <SYMBOL_xxx.csv|parquet> ...")
+        sys.exit(1)
+    paths = {os.path.basename(f).split("_")[0].split(".")[0].upper(): f for f in files}
+    started = time.perf_counter()
+    results = run_backtests(paths)
+    print(format_report(results))
+    print(f"\n{len(paths)} symbols in {time.perf_counter() - started:.1f}s")
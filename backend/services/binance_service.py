@@ -1,55 +1,278 @@
+import asyncio
 import hmac
 import hashlib
 import requests
+from requests.adapters import HTTPAdapter
 from typing import Dict, List, Optional, Union
 from urllib.parse import urlencode
 import time
+import os
+import threading
 from datetime import datetime
 
+from .exchange_info_store import ExchangeInfoStore, exchange_info_store
+from .rate_limiter import WeightRateLimiter, binance_rate_limiter, request_weight
+from .metrics import binance_request_seconds, binance_request_weight
+
 def mask_api_key(api_key: str) -> str:
     """API 키 마스킹"""
     if len(api_key) <= 8:
         return api_key
     return api_key[:4] + "****" + api_key[-4:]
 
+# 프로세스 공유 HTTP 세션 (keep-alive 커넥션 재사용)
+http_session = requests.Session()
+http_session.mount("https://", HTTPAdapter(pool_connections=10, pool_maxsize=50))
+http_session.mount("http://", HTTPAdapter(pool_connections=10, pool_maxsize=50))
+
+FALLBACK_PRICES = {
+    "BTCUSDT": {"symbol": "BTCUSDT", "price": "43250.75"},
+    "ETHUSDT": {"symbol": "ETHUSDT", "price": "2580.40"},
+    "BNBUSDT": {"symbol": "BNBUSDT", "price": "315.20"},
+    "ADAUSDT": {"symbol": "ADAUSDT", "price": "0.52"},
+    "DOTUSDT": {"symbol": "DOTUSDT", "price": "7.15"}
+}
+
+def fallback_ticker_price(symbol: str = None) -> Union[Dict, List]:
+    """폴백 가격 데이터"""
+    if symbol and symbol in FALLBACK_PRICES:
+        return FALLBACK_PRICES[symbol]
+    elif symbol:
+        return {"symbol": symbol, "price": "100.00"}
+    else:
+        return [FALLBACK_PRICES[k] for k in FALLBACK_PRICES]
+
+def fallback_24hr_ticker(symbol: str) -> Dict:
+    """폴백 24시간 티커 데이터"""
+    current_time = int(time.time() * 1000)
+    return {
+        "symbol": symbol.upper(),
+        "priceChange": "1250.50",
+        "priceChangePercent": "2.98",
+        "weightedAvgPrice": "43150.25",
+        "prevClosePrice": "42000.25",
+        "lastPrice": "43250.75",
+        "bidPrice": "43250.00",
+        "askPrice": "43251.00",
+        "openPrice": "42000.25",
+        "highPrice": "43500.00",
+        "lowPrice": "41950.75",
+        "volume": "28500.50",
+        "quoteVolume": "1228500000.00",
+        "openTime": current_time - 86400000,  # 24시간 전
+        "closeTime": current_time,
+        "count": "152000"
+    }
+
+def fallback_exchange_info() -> Dict:
+    """폴백 거래소 정보"""
+    return {
+        "timezone": "UTC",
+        "serverTime": int(time.time() * 1000),
+        "symbols": [
+            {"symbol": "BTCUSDT", "status": "TRADING", "baseAsset": "BTC", "quoteAsset": "USDT"},
+            {"symbol": "ETHUSDT", "status": "TRADING", "baseAsset": "ETH", "quoteAsset": "USDT"},
+            {"symbol": "BNBUSDT", "status": "TRADING", "baseAsset": "BNB", "quoteAsset": "USDT"}
+        ]
+    }
+
+def fallback_account_balances() -> List[Dict]:
+    """폴백 잔고 데이터"""
+    return [
+        {"asset": "BTC", "free": "0.125", "locked": "0.0"},
+        {"asset": "ETH", "free": "3.2", "locked": "0.0"},
+        {"asset": "USDT", "free": "1250.50", "locked": "0.0"}
+    ]
+
+class TickerPriceCache:
+    """ticker/price 전체 스냅샷 캐시 (프로세스 공유)
+
+    심볼 단건 조회도 전체 스냅샷에서 응답하고, TTL 만료 시 동시에 들어온
+    미스 요청은 하나의 업스트림 조회로 합쳐진다.
+    """
+
+    def __init__(self, ttl: float = 1.0, wait_timeout: float = 10):
+        self.ttl = ttl
+        self.wait_timeout = wait_timeout
+        self._lock = threading.Lock()
+        self._inflight: Optional[threading.Event] = None
+        self._async_inflight: Optional[asyncio.Future] = None
+        self._prices: Dict[str, Dict] = {}
+        self._snapshot: List[Dict] = []
+        self._fetched_at = 0.0
+
+        # 통계
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.refreshes = 0
+        self.errors = 0
+
+    def _is_fresh(self, now: float) -> bool:
+        return bool(self._snapshot) and now - self._fetched_at < self.ttl
+
+    def _store(self, snapshot: List[Dict]):
+        self._snapshot = snapshot
+        self._prices = {item["symbol"]: item for item in snapshot}
+        self._fetched_at = time.monotonic()
+        self.refreshes += 1
+
+    def _lookup(self, symbol: Optional[str]) -> Union[Dict, List, None]:
+        if symbol is None:
+            return self._snapshot
+        return self._prices.get(symbol.upper())
+
+    def get(self, fetch_all, symbol: str = None) -> Union[Dict, List, None]:
+        """캐시 조회 - 만료 시 fetch_all()로 전체 스냅샷 갱신
+
+        스냅샷에 없는 심볼이면 None을 반환한다. 갱신 실패 시 이전 스냅샷이
+        있으면 그대로 사용하고, 없으면 예외를 올린다.
+        """
+        with self._lock:
+            if self._is_fresh(time.monotonic()):
+                self.hits += 1
+                return self._lookup(symbol)
+            self.misses += 1
+            event = self._inflight
+            is_leader = event is None
+            if is_leader:
+                event = self._inflight = threading.Event()
+            else:
+                self.coalesced += 1
+
+        if is_leader:
+            try:
+                snapshot = fetch_all()
+            except Exception:
+                with self._lock:
+                    self.errors += 1
+                if not self._snapshot:
+                    raise
+            else:
+                with self._lock:
+                    self._store(snapshot)
+            finally:
+                # 어떤 식으로 끝나든 대기자를 풀어준다
+                with self._lock:
+                    self._inflight = None
+                event.set()
+        else:
+            event.wait(self.wait_timeout)
+
+        with self._lock:
+            if not self._snapshot:
+                raise RuntimeError("Ticker price snapshot unavailable")
+            return self._lookup(symbol)
+
+    async def aget(self, fetch_all, symbol: str = None) -> Union[Dict, List, None]:
+        """비동기 캐시 조회 - fetch_all은 코루틴 함수, 동시 미스는 하나의 Future로 합친다"""
+        with self._lock:
+            if self._is_fresh(time.monotonic()):
+                self.hits += 1
+                return self._lookup(symbol)
+            self.misses += 1
+            future = self._async_inflight
+            is_leader = future is None
+            if is_leader:
+                future = self._async_inflight = asyncio.get_running_loop().create_future()
+            else:
+                self.coalesced += 1
+
+        if is_leader:
+            try:
+                snapshot = await fetch_all()
+            except Exception:
+                with self._lock:
+                    self.errors += 1
+                if not self._snapshot:
+                    raise
+            else:
+                with self._lock:
+                    self._store(snapshot)
+            finally:
+                # 취소(CancelledError)로 끝나도 자리를 비우고 대기자를 깨운다
+                with self._lock:
+                    self._async_inflight = None
+                if not future.done():
+                    future.set_result(None)
+        else:
+            await asyncio.wait_for(asyncio.shield(future), self.wait_timeout)
+
+        with self._lock:
+            if not self._snapshot:
+                raise RuntimeError("Ticker price snapshot unavailable")
+            return self._lookup(symbol)
+
+    def invalidate(self):
+        """캐시 무효화"""
+        with self._lock:
+            self._fetched_at = 0.0
+
+    def stats(self) -> Dict:
+        """캐시 통계 (hit/miss/age)"""
+        with self._lock:
+            total = self.hits + self.misses
+            age = time.monotonic() - self._fetched_at if self._snapshot else None
+            return {
+                "ttl": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "coalesced": self.coalesced,
+                "hit_ratio": round(self.hits / total, 4) if total else 0.0,
+                "refreshes": self.refreshes,
+                "errors": self.errors,
+                "symbols": len(self._prices),
+                "age_seconds": round(age, 3) if age is not None else None
+            }
+
+# 프로세스 전역 가격 캐시 (모든 BinanceService 인스턴스가 공유)
+ticker_price_cache = TickerPriceCache(ttl=float(os.getenv("BINANCE_PRICE_CACHE_TTL", "1.0")))
+
 class BinanceService:
-    def __init__(self, api_key: str = "", secret_key: str = ""):
+    def __init__(self, api_key: str = "", secret_key: str = "", price_cache: TickerPriceCache = None,
+                 rate_limiter: WeightRateLimiter = None, info_store: ExchangeInfoStore = None):
         self.api_key = api_key
         self.secret_key = secret_key
         self.base_url = "https://api.binance.com/api/v3"
         self.timeout = 10
+        self.price_cache = price_cache or ticker_price_cache
+        
+        # 요청 제한 관리 (프로세스 공유 가중치 버킷)
+        self.rate_limiter = rate_limiter or binance_rate_limiter
         
-        # 요청 제한 관리
-        self.last_request_time = 0
-        self.min_request_interval = 0.1  # 초
+        # exchangeInfo 메모리 저장소 (프로세스 공유)
+        self.info_store = info_store or exchange_info_store
     
-    def _rate_limit(self):
-        """요청 제한 관리"""
-        current_time = time.time()
-        elapsed = current_time - self.last_request_time
-        if elapsed < self.min_request_interval:
-            time.sleep(self.min_request_interval - elapsed)
-        self.last_request_time = time.time()
+    def _rate_limit(self, endpoint: str, params: Dict = None):
+        """요청 제한 관리 - 엔드포인트 가중치만큼 예약"""
+        weight = request_weight(endpoint, params)
+        binance_request_weight.labels(endpoint).inc(weight)
+        self.rate_limiter.acquire(weight)
+    
+    def _check_response(self, response):
+        """사용 가중치 헤더 반영 및 429/418 처리"""
+        self.rate_limiter.update_from_headers(response.headers)
+        if response.status_code in (418, 429):
+            self.rate_limiter.penalize(response.headers.get("Retry-After"))
+        response.raise_for_status()
     
     def _make_public_request(self, endpoint: str, params: Dict = None):
         """공개 API 요청"""
-        self._rate_limit()
+        self._rate_limit(endpoint, params)
         url = f"{self.base_url}/{endpoint}"
+        started = time.perf_counter()
         try:
-            response = requests.get(url, params=params, timeout=self.timeout)
-            response.raise_for_status()
+            response = http_session.get(url, params=params, timeout=self.timeout)
+            self._check_response(response)
+            binance_request_seconds.labels(endpoint, "ok").observe(time.perf_counter() - started)
             return response.json()
         except requests.exceptions.RequestException as e:
+            binance_request_seconds.labels(endpoint, "error").observe(time.perf_counter() - started)
             print(f"Binance API request failed: {e}")
             raise
     
-    def _make_signed_request(self, endpoint: str, params: Dict = None):
-        """서명된 API 요청"""
-        if not self.api_key or not self.secret_key:
-            raise ValueError("API key and secret key required for signed requests")
-        
-        self._rate_limit()
-        url = f"{self.base_url}/{endpoint}"
+    def _sign(self, params: Dict = None):
+        """서명 파라미터 및 헤더 생성"""
         timestamp = int(time.time() * 1000)
         
         if params is None:
@@ -69,41 +292,43 @@ class BinanceService:
             'X-MBX-APIKEY': self.api_key,
             'Content-Type': 'application/json'
         }
+        return params, headers
+    
+    def _make_signed_request(self, endpoint: str, params: Dict = None):
+        """서명된 API 요청"""
+        if not self.api_key or not self.secret_key:
+            raise ValueError("API key and secret key required for signed requests")
         
+        self._rate_limit(endpoint, params)
+        url = f"{self.base_url}/{endpoint}"
+        params, headers = self._sign(params)
+        
+        started = time.perf_counter()
         try:
-            response = requests.get(url, params=params, headers=headers, timeout=self.timeout)
-            response.raise_for_status()
+            response = http_session.get(url, params=params, headers=headers, timeout=self.timeout)
+            self._check_response(response)
+            binance_request_seconds.labels(endpoint, "ok").observe(time.perf_counter() - started)
             return response.json()
         except requests.exceptions.RequestException as e:
+            binance_request_seconds.labels(endpoint, "error").observe(time.perf_counter() - started)
             print(f"Binance signed request failed: {e}")
             raise
     
     def get_ticker_price(self, symbol: str = None) -> Union[Dict, List]:
-        """가격 조회"""
+        """가격 조회 (전체 스냅샷 캐시 경유)"""
         try:
-            if symbol:
-                endpoint = "ticker/price"
-                params = {"symbol": symbol.upper()}
-                return self._make_public_request(endpoint, params)
-            else:
-                endpoint = "ticker/price"
-                return self._make_public_request(endpoint)
+            endpoint = "ticker/price"
+            cached = self.price_cache.get(
+                lambda: self._make_public_request(endpoint), symbol
+            )
+            if cached is not None:
+                return cached
+            # 스냅샷에 없는 심볼은 단건 조회
+            params = {"symbol": symbol.upper()}
+            return self._make_public_request(endpoint, params)
         except Exception as e:
             print(f"Error in get_ticker_price: {e}")
-            # 향상된 폴백 데이터
-            fallback_prices = {
-                "BTCUSDT": {"symbol": "BTCUSDT", "price": "43250.75"},
-                "ETHUSDT": {"symbol": "ETHUSDT", "price": "2580.40"},
-                "BNBUSDT": {"symbol": "BNBUSDT", "price": "315.20"},
-                "ADAUSDT": {"symbol": "ADAUSDT", "price": "0.52"},
-                "DOTUSDT": {"symbol": "DOTUSDT", "price": "7.15"}
-            }
-            if symbol and symbol in fallback_prices:
-                return fallback_prices[symbol]
-            elif symbol:
-                return {"symbol": symbol, "price": "100.00"}
-            else:
-                return [fallback_prices[k] for k in fallback_prices]
+            return fallback_ticker_price(symbol)
     
     def get_24hr_ticker(self, symbol: str) -> Dict:
         """24시간 티커 정보"""
@@ -113,43 +338,14 @@ class BinanceService:
             return self._make_public_request(endpoint, params)
         except Exception as e:
             print(f"Error in get_24hr_ticker: {e}")
-            # 상세한 폴백 데이터
-            current_time = int(time.time() * 1000)
-            return {
-                "symbol": symbol.upper(),
-                "priceChange": "1250.50",
-                "priceChangePercent": "2.98",
-                "weightedAvgPrice": "43150.25",
-                "prevClosePrice": "42000.25",
-                "lastPrice": "43250.75",
-                "bidPrice": "43250.00",
-                "askPrice": "43251.00",
-                "openPrice": "42000.25",
-                "highPrice": "43500.00",
-                "lowPrice": "41950.75",
-                "volume": "28500.50",
-                "quoteVolume": "1228500000.00",
-                "openTime": current_time - 86400000,  # 24시간 전
-                "closeTime": current_time,
-                "count": "152000"
-            }
+            return fallback_24hr_ticker(symbol)
     
     def get_exchange_info(self) -> Dict:
-        """거래소 정보"""
-        try:
-            endpoint = "exchangeInfo"
-            return self._make_public_request(endpoint)
-        except Exception as e:
-            print(f"Error in get_exchange_info: {e}")
-            return {
-                "timezone": "UTC",
-                "serverTime": int(time.time() * 1000),
-                "symbols": [
-                    {"symbol": "BTCUSDT", "status": "TRADING", "baseAsset": "BTC", "quoteAsset": "USDT"},
-                    {"symbol": "ETHUSDT", "status": "TRADING", "baseAsset": "ETH", "quoteAsset": "USDT"},
-                    {"symbol": "BNBUSDT", "status": "TRADING", "baseAsset": "BNB", "quoteAsset": "USDT"}
-                ]
-            }
+        """거래소 정보 (메모리 저장소 경유)"""
+        info = self.info_store.get_info()
+        if info is None:
+            return fallback_exchange_info()
+        return info
     
     def get_server_time(self) -> Dict:
         """서버 시간"""
@@ -171,11 +367,7 @@ class BinanceService:
             return result.get('balances', [])
         except Exception as e:
             print(f"Error in get_account_balances: {e}")
-            return [
-                {"asset": "BTC", "free": "0.125", "locked": "0.0"},
-                {"asset": "ETH", "free": "3.2", "locked": "0.0"},
-                {"asset": "USDT", "free": "1250.50", "locked": "0.0"}
-            ]
+            return fallback_account_balances()
     
     def test_connection(self) -> Dict:
         """연결 테스트"""
@@ -196,13 +388,9 @@ class BinanceService:
             }
     
     def get_symbol_info(self, symbol: str) -> Optional[Dict]:
-        """심볼 정보 조회"""
+        """심볼 정보 조회 (인덱스 O(1))"""
         try:
-            info = self.get_exchange_info()
-            for sym_info in info.get('symbols', []):
-                if sym_info['symbol'] == symbol.upper():
-                    return sym_info
-            return None
+            return self.info_store.get_symbol(symbol)
         except Exception as e:
             print(f"Error in get_symbol_info: {e}")
             return None
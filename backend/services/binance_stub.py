@@ -0,0 +1,526 @@
+import argparse
+import asyncio
+import json
+import random
+import threading
+import time
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, List, Optional, Tuple
+from urllib.parse import urlparse, parse_qs
+
+from services.binance_service import (BinanceService, fallback_24hr_ticker, fallback_exchange_info,
+                                      fallback_account_balances, http_session)
+from services.rate_limiter import request_weight
+
+# 경로 -> 핸들러(query dict) -> (status, body) 또는 (status, body, headers)
+Route = Callable[[Dict[str, str]], Tuple]
+
+def default_routes(symbol_count: int = 500) -> Dict[str, Route]:
+    """기본 응답 (실제 바이낸스 응답 형식을 따르는 고정 데이터)"""
+    prices = [{"symbol": "BTCUSDT", "price": "43250.75"}, {"symbol": "ETHUSDT", "price": "2580.40"}]
+    prices += [{"symbol": f"SYM{i}USDT", "price": f"{1 + i * 0.01:.8f}"} for i in range(symbol_count)]
+    price_index = {item["symbol"]: item for item in prices}
+
+    def ticker_price(query):
+        symbol = query.get("symbol")
+        if symbol is None:
+            return 200, prices
+        if symbol not in price_index:
+            return 400, {"code": -1121, "msg": "Invalid symbol."}
+        return 200, price_index[symbol]
+
+    return {
+        "/api/v3/ticker/price": ticker_price,
+        "/api/v3/ticker/24hr": lambda query: (200, fallback_24hr_ticker(query.get("symbol", "BTCUSDT"))),
+        "/api/v3/exchangeInfo": lambda query: (200, fallback_exchange_info()),
+        "/api/v3/time": lambda query: (200, {"serverTime": int(time.time() * 1000)}),
+        "/api/v3/account": lambda query: (200, {"balances": fallback_account_balances()}),
+    }
+
+class _StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive 지원
+    disable_nagle_algorithm = True  # 헤더/본문 분할 전송 시 지연 ACK 대기 방지
+
+    def _dispatch(self, method: str):
+        parsed = urlparse(self.path)
+        query = {k: v[-1] for k, v in parse_qs(parsed.query).items()}
+        length = int(self.headers.get("Content-Length") or 0)
+        if length:
+            # 서명 요청 본문 (application/x-www-form-urlencoded)
+            body = self.rfile.read(length).decode()
+            query.update({k: v[-1] for k, v in parse_qs(body).items()})
+        api_key = self.headers.get("X-MBX-APIKEY")
+        if api_key:
+            query["_apiKey"] = api_key  # 계좌를 구분하는 대역 서버용 (시뮬레이터)
+        # GET은 경로만, 그 외 메서드는 "POST /fapi/v1/order" 형식의 키
+        key = parsed.path if method == "GET" else f"{method} {parsed.path}"
+        route = self.server.routes.get(key)
+        headers = {}
+        if route is None:
+            status, body = 404, {"code": -1, "msg": "Not found"}
+        else:
+            status, body, *extra = route(query)
+            if extra:
+                headers = extra[0]
+        if status is None:
+            # 응답 없이 연결 종료 (요청은 처리됐지만 클라이언트는 결과를 모르는 상황)
+            self.close_connection = True
+            return
+        # bytes 본문은 그대로 (Content-Type은 라우트 헤더로)
+        payload = body if isinstance(body, bytes) else json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", headers.get("Content-Type", "application/json"))
+        self.send_header("Content-Length", str(len(payload)))
+        for name, value in headers.items():
+            if name != "Content-Type":
+                self.send_header(name, str(value))
+        try:
+            self.end_headers()
+            self.wfile.write(payload)
+        except (BrokenPipeError, ConnectionResetError):
+            pass  # 클라이언트가 타임아웃으로 먼저 끊은 경우
+
+    def do_GET(self):
+        self._dispatch("GET")
+
+    def do_POST(self):
+        self._dispatch("POST")
+
+    def do_DELETE(self):
+        self._dispatch("DELETE")
+
+    def log_message(self, format, *args):
+        pass
+
+class FakeFuturesExchange:
+    """선물 주문 엔드포인트 대역 (/fapi/v1/order)
+
+    시장가 주문은 즉시 mark_price로 체결된다. newClientOrderId 중복은 실제와
+    같이 -4116으로 거절하고, fail_next()로 다음 주문들에 장애를 주입한다:
+    "5xx" / "429" (주문 미처리), "-1007" (처리 후 결과 불명 응답),
+    "drop" (처리 후 응답 없이 연결 종료), 초 단위 float (지연 후 정상 처리).
+    """
+
+    def __init__(self, mark_price: float = 43250.75):
+        self.mark_price = mark_price
+        self._lock = threading.Lock()
+        self._orders: Dict[str, Dict] = {}
+        self._faults: List[object] = []
+        self._next_id = 1
+        self.requests = 0
+
+    def fail_next(self, *faults):
+        with self._lock:
+            self._faults.extend(faults)
+
+    @property
+    def fills(self) -> int:
+        return len(self._orders)
+
+    def _fill(self, query: Dict[str, str]) -> Dict:
+        client_id = query["newClientOrderId"]
+        order = {
+            "orderId": self._next_id,
+            "symbol": query["symbol"],
+            "status": "FILLED",
+            "clientOrderId": client_id,
+            "avgPrice": f"{self.mark_price:.2f}",
+            "origQty": query["quantity"],
+            "executedQty": query["quantity"],
+            "side": query["side"],
+            "type": query.get("type", "MARKET"),
+            "reduceOnly": query.get("reduceOnly") == "true",
+            "updateTime": int(time.time() * 1000),
+        }
+        self._next_id += 1
+        self._orders[client_id] = order
+        return order
+
+    def create_order(self, query: Dict[str, str]):
+        with self._lock:
+            self.requests += 1
+            fault = self._faults.pop(0) if self._faults else None
+            if fault == "5xx":
+                return 503, {"code": -1001, "msg": "Internal error; unable to process your request."}
+            if fault == "429":
+                return 429, {"code": -1003, "msg": "Too many requests."}
+            query = dict(query)
+            query.setdefault("newClientOrderId", f"stub-{self._next_id}")
+            if query["newClientOrderId"] in self._orders:
+                return 400, {"code": -4116, "msg": "ClientOrderId is duplicated."}
+            if not isinstance(fault, (int, float)):
+                order = self._fill(query)
+                if fault == "-1007":
+                    return 408, {"code": -1007, "msg": "Timeout waiting for response from backend server."}
+                if fault == "drop":
+                    return None, None
+                return 200, order
+        time.sleep(fault)  # 지연 주입은 락 밖에서
+        with self._lock:
+            if query["newClientOrderId"] in self._orders:
+                return 400, {"code": -4116, "msg": "ClientOrderId is duplicated."}
+            return 200, self._fill(query)
+
+    def get_order(self, query: Dict[str, str]):
+        with self._lock:
+            order = self._orders.get(query.get("origClientOrderId"))
+        if order is None:
+            return 400, {"code": -2013, "msg": "Order does not exist."}
+        return 200, order
+
+    def routes(self) -> Dict[str, Route]:
+        return {
+            "POST /fapi/v1/order": self.create_order,
+            "/fapi/v1/order": self.get_order,
+            "/fapi/v1/time": lambda query: (200, {"serverTime": int(time.time() * 1000)}),
+        }
+
+class BinanceStubServer:
+    """로컬 바이낸스 대역 서버 (처리량 측정/테스트용)"""
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, routes: Optional[Dict[str, Route]] = None):
+        self.httpd = ThreadingHTTPServer((host, port), _StubHandler)
+        self.httpd.daemon_threads = True
+        self.httpd.routes = routes or default_routes()
+        self.thread: Optional[threading.Thread] = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}/api/v3"
+
+    @property
+    def futures_url(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}/fapi"
+
+    def start(self) -> "BinanceStubServer":
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+        if self.thread:
+            self.thread.join(timeout=5)
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+# 녹화 대상 엔드포인트와 녹화 시 버리는 파라미터/보존할 헤더
+REST_BASE_URL = "https://api.binance.com/api/v3"
+RECORDED_ENDPOINTS = ("ticker/price", "ticker/24hr", "exchangeInfo", "klines", "account")
+VOLATILE_PARAMS = {"timestamp", "signature", "recvWindow", "_apiKey"}
+RECORDED_HEADERS = ("X-MBX-USED-WEIGHT-1M", "X-MBX-USED-WEIGHT")
+
+def recording_plan(symbols: Tuple[str, ...] = ("BTCUSDT", "ETHUSDT"), intervals: Tuple[str, ...] = ("1m", "15m"),
+                   kline_limit: int = 500, with_account: bool = False) -> List[Tuple[str, Dict]]:
+    """녹화할 (엔드포인트, 파라미터) 목록"""
+    plan = [("ticker/price", {}), ("exchangeInfo", {})]
+    for symbol in symbols:
+        plan += [("ticker/price", {"symbol": symbol}), ("ticker/24hr", {"symbol": symbol})]
+        plan += [("klines", {"symbol": symbol, "interval": i, "limit": kline_limit}) for i in intervals]
+    if with_account:
+        plan.append(("account", {}))
+    return plan
+
+def record_responses(path: str, plan: List[Tuple[str, Dict]] = None,
+                     base_url: str = REST_BASE_URL,
+                     api_key: str = "", secret_key: str = "", timeout: float = 10) -> int:
+    """실제 응답을 파일로 녹화 (서명 요청은 키가 있을 때만, 서명/시각 파라미터는 저장하지 않음)"""
+    signer = BinanceService(api_key, secret_key)
+    prefix = urlparse(base_url).path.rstrip("/")
+    entries = []
+    for endpoint, params in plan or recording_plan(with_account=bool(api_key and secret_key)):
+        params, headers = dict(params), {}
+        if endpoint == "account":
+            if not (api_key and secret_key):
+                continue
+            params, headers = signer._sign(params)
+        started = time.perf_counter()
+        response = http_session.get(f"{base_url}/{endpoint}", params=params, headers=headers, timeout=timeout)
+        entry = {
+            "path": f"{prefix}/{endpoint}",
+            "query": {k: str(v) for k, v in params.items() if k not in VOLATILE_PARAMS},
+            "status": response.status_code,
+            "headers": {h: response.headers[h] for h in RECORDED_HEADERS if h in response.headers},
+            "latency_ms": round((time.perf_counter() - started) * 1000, 3)
+        }
+        try:
+            entry["body"] = response.json()
+        except ValueError:
+            # 프록시/WAF의 HTML 오류 페이지 등 - 원문과 Content-Type을 그대로 보관
+            entry.update(body=response.text, raw=True)
+            entry["headers"]["Content-Type"] = response.headers.get("Content-Type", "text/plain")
+        entries.append(entry)
+        print(f"📼 {endpoint} {params.get('symbol', '')} -> {response.status_code}")
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"recorded_at": datetime.utcnow().isoformat(), "base_url": base_url, "entries": entries}, f)
+    return len(entries)
+
+class Recording:
+    """녹화 응답 재생
+
+    같은 경로/파라미터의 녹화가 있으면 그대로 돌려주고, 없으면 녹화로부터
+    만들 수 있는 응답을 만든다: 전체 ticker/price에서 단일 심볼, 더 긴 klines
+    녹화에서 최근 limit개. 그래도 없으면 같은 경로/심볼의 아무 녹화나 쓴다.
+    JSON이 아니던 응답(raw)은 원문 그대로 재생한다.
+    """
+
+    def __init__(self, entries: List[Dict], base_url: str = REST_BASE_URL):
+        self.base_url = base_url
+        self._exact: Dict[Tuple[str, frozenset], Dict] = {}
+        self._by_path: Dict[str, List[Dict]] = {}
+        for entry in entries:
+            self._exact[(entry["path"], frozenset(entry["query"].items()))] = entry
+            self._by_path.setdefault(entry["path"], []).append(entry)
+
+    @classmethod
+    def load(cls, path: str) -> "Recording":
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        return cls(data["entries"], data.get("base_url", REST_BASE_URL))
+
+    @property
+    def paths(self) -> List[str]:
+        return list(self._by_path)
+
+    @staticmethod
+    def _response(entry: Dict) -> Tuple:
+        body = entry["body"].encode() if entry.get("raw") else entry["body"]
+        return entry["status"], body, entry["headers"]
+
+    def lookup(self, path: str, query: Dict[str, str]) -> Optional[Tuple]:
+        query = {k: v for k, v in query.items() if k not in VOLATILE_PARAMS}
+        entry = self._exact.get((path, frozenset(query.items())))
+        if entry is not None:
+            return self._response(entry)
+        # 파생 응답은 JSON 녹화로만 만든다
+        candidates = [e for e in self._by_path.get(path, []) if not e.get("raw")]
+        symbol = query.get("symbol")
+        if path.endswith("/ticker/price") and symbol:
+            for entry in candidates:
+                if "symbol" not in entry["query"] and isinstance(entry["body"], list):
+                    item = next((i for i in entry["body"] if i["symbol"] == symbol), None)
+                    if item is None:
+                        return 400, {"code": -1121, "msg": "Invalid symbol."}, {}
+                    return entry["status"], item, entry["headers"]
+        if path.endswith("/klines"):
+            limit = int(query.get("limit", 500))
+            for entry in candidates:
+                q = entry["query"]
+                if (q.get("symbol") == symbol and q.get("interval") == query.get("interval")
+                        and isinstance(entry["body"], list)):
+                    return entry["status"], entry["body"][-limit:], entry["headers"]
+        for entry in self._by_path.get(path, []):
+            if entry["query"].get("symbol") == symbol:
+                return self._response(entry)
+        return None
+
+    def routes(self) -> Dict[str, Route]:
+        def route_for(path):
+            def route(query):
+                found = self.lookup(path, query)
+                return found if found is not None else (404, {"code": -1, "msg": "Not recorded"})
+            return route
+        routes = {path: route_for(path) for path in self._by_path}
+        prefix = urlparse(self.base_url).path.rstrip("/")
+        routes.setdefault(f"{prefix}/time", lambda query: (200, {"serverTime": int(time.time() * 1000)}))
+        return routes
+
+class FaultInjector:
+    """라우트 래퍼 - 지연/오류/429 주입과 사용 가중치 헤더
+
+    요청마다 latency + U(0, jitter)초를 기다린 뒤 rate_limit_rate 확률로 429,
+    error_rate 확률로 503(-1001)을 돌려준다. weight_limit을 주면 창(window)마다
+    엔드포인트 가중치를 합산해 한도를 넘는 요청은 429 + Retry-After로 막고,
+    모든 응답에 X-MBX-USED-WEIGHT-1M을 붙인다. seed로 주입 순서를 고정한다.
+    """
+
+    def __init__(self, latency: float = 0.0, jitter: float = 0.0, error_rate: float = 0.0,
+                 rate_limit_rate: float = 0.0, retry_after: int = 1, weight_limit: Optional[int] = None,
+                 window: float = 60.0, seed: Optional[int] = None):
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.rate_limit_rate = rate_limit_rate
+        self.retry_after = retry_after
+        self.weight_limit = weight_limit
+        self.window = window
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._window_start = time.monotonic()
+        self._used_weight = 0
+
+        # 통계
+        self.requests = 0
+        self.injected_errors = 0
+        self.injected_429 = 0
+        self.weight_limited = 0
+
+    def _decide(self, endpoint: str, query: Dict[str, str]) -> Tuple[float, Optional[Tuple], Dict]:
+        with self._lock:
+            self.requests += 1
+            delay = self.latency + (self._random.uniform(0, self.jitter) if self.jitter else 0.0)
+            roll = self._random.random()
+            now = time.monotonic()
+            if now - self._window_start >= self.window:
+                self._window_start, self._used_weight = now, 0
+            self._used_weight += request_weight(endpoint, query)
+            headers = {"X-MBX-USED-WEIGHT-1M": self._used_weight}
+            if self.weight_limit is not None and self._used_weight > self.weight_limit:
+                self.weight_limited += 1
+                headers["Retry-After"] = max(1, int(self._window_start + self.window - now + 0.999))
+                return delay, (429, {"code": -1003, "msg": "Too much request weight used."}), headers
+            if roll < self.rate_limit_rate:
+                self.injected_429 += 1
+                headers["Retry-After"] = self.retry_after
+                return delay, (429, {"code": -1003, "msg": "Too many requests."}), headers
+            if roll < self.rate_limit_rate + self.error_rate:
+                self.injected_errors += 1
+                return delay, (503, {"code": -1001, "msg": "Internal error; unable to process your request."}), headers
+            return delay, None, headers
+
+    def wrap(self, routes: Dict[str, Route]) -> Dict[str, Route]:
+        def wrapped(key, route):
+            endpoint = key.split(" ")[-1].split("/", 3)[-1]  # "/api/v3/ticker/price" -> "ticker/price"
+
+            def handle(query):
+                delay, fault, headers = self._decide(endpoint, query)
+                if delay:
+                    time.sleep(delay)
+                if fault is not None:
+                    return fault + (headers,)
+                status, body, *extra = route(query)
+                return status, body, {**(extra[0] if extra else {}), **headers}
+            return handle
+        return {key: wrapped(key, route) for key, route in routes.items()}
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {
+                "requests": self.requests,
+                "injected_errors": self.injected_errors,
+                "injected_429": self.injected_429,
+                "weight_limited": self.weight_limited,
+                "used_weight": self._used_weight
+            }
+
+def load_frames(path: str) -> List[str]:
+    """녹화된 웹소켓 프레임 로드 (한 줄에 프레임 하나)"""
+    with open(path, "r", encoding="utf-8") as f:
+        return [line.rstrip("\n") for line in f if line.strip()]
+
+async def record_frames(url: str, path: str, count: int = 1000):
+    """실제 스트림 프레임 녹화"""
+    import websockets
+
+    async with websockets.connect(url) as ws:
+        with open(path, "w", encoding="utf-8") as f:
+            for _ in range(count):
+                f.write(str(await ws.recv()) + "\n")
+
+class FrameReplayServer:
+    """녹화된 프레임을 재생하는 로컬 웹소켓 대역 서버
+
+    접속한 클라이언트마다 frames를 interval 간격으로 보낸다. close_after를
+    주면 그만큼 보낸 뒤 연결을 끊어 재연결 경로를 시험할 수 있다.
+    """
+
+    def __init__(self, frames: List[str], interval: float = 0.0, loop_frames: bool = False,
+                 close_after: Optional[int] = None, host: str = "127.0.0.1", port: int = 0):
+        self.frames = frames
+        self.interval = interval
+        self.loop_frames = loop_frames
+        self.close_after = close_after
+        self.host = host
+        self.port = port
+        self.connections = 0
+        self._server = None
+
+    @property
+    def url(self) -> str:
+        return f"ws://{self.host}:{self.port}"
+
+    async def _handler(self, websocket, *args):
+        self.connections += 1
+        sent = 0
+        while True:
+            for frame in self.frames:
+                if self.close_after is not None and sent >= self.close_after:
+                    await websocket.close()
+                    return
+                await websocket.send(frame)
+                sent += 1
+                if self.interval:
+                    await asyncio.sleep(self.interval)
+            if not self.loop_frames:
+                break
+        await websocket.wait_closed()
+
+    async def start(self) -> "FrameReplayServer":
+        import websockets
+
+        self._server = await websockets.serve(self._handler, self.host, self.port)
+        self.port = next(iter(self._server.sockets)).getsockname()[1]
+        return self
+
+    async def stop(self):
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+
+    async def __aenter__(self):
+        return await self.start()
+
+    async def __aexit__(self, *exc):
+        await self.stop()
+
+if __name__ == "__main__":
+    # 녹화: python -m services.binance_stub record rec.json --symbols BTCUSDT ETHUSDT
+    # 재생: python -m services.binance_stub serve --recording rec.json --latency-ms 50 --error-rate 0.01
+    parser = argparse.ArgumentParser(description="바이낸스 대역 서버 (녹화/재생, 장애 주입)")
+    sub = parser.add_subparsers(dest="command")
+    record = sub.add_parser("record")
+    record.add_argument("path")
+    record.add_argument("--symbols", nargs="+", default=["BTCUSDT", "ETHUSDT"])
+    record.add_argument("--intervals", nargs="+", default=["1m", "15m"])
+    record.add_argument("--base-url", default=REST_BASE_URL)
+    record.add_argument("--api-key", default="")
+    record.add_argument("--secret-key", default="")
+    serve = sub.add_parser("serve")
+    serve.add_argument("--recording", default=None)
+    serve.add_argument("--port", type=int, default=8900)
+    serve.add_argument("--latency-ms", type=float, default=0.0)
+    serve.add_argument("--jitter-ms", type=float, default=0.0)
+    serve.add_argument("--error-rate", type=float, default=0.0)
+    serve.add_argument("--rate-limit-rate", type=float, default=0.0)
+    serve.add_argument("--weight-limit", type=int, default=None)
+    serve.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+
+    if args.command == "record":
+        plan = recording_plan(tuple(args.symbols), tuple(args.intervals),
+                              with_account=bool(args.api_key and args.secret_key))
+        count = record_responses(args.path, plan, args.base_url, args.api_key, args.secret_key)
+        print(f"✅ {count} responses recorded to {args.path}")
+    else:
+        routes = Recording.load(args.recording).routes() if args.command == "serve" and args.recording else default_routes()
+        injector = None
+        if args.command == "serve":
+            injector = FaultInjector(args.latency_ms / 1000, args.jitter_ms / 1000, args.error_rate,
+                                     args.rate_limit_rate, weight_limit=args.weight_limit, seed=args.seed)
+            routes = injector.wrap(routes)
+        server = BinanceStubServer(port=getattr(args, "port", 8900), routes=routes).start()
+        print(f"Binance stub listening on {server.base_url}")
+        try:
+            server.thread.join()
+        except KeyboardInterrupt:
+            server.stop()
+            if injector is not None:
+                print(injector.stats())
@@ -0,0 +1,196 @@
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, Hashable, Optional, Tuple
+
+# factory(api_key, secret_key, testnet) -> 클라이언트
+ClientFactory = Callable[[str, str, bool], object]
+
+class ClientPoolFull(Exception):
+    """모든 클라이언트가 사용 중이라 새로 만들 수 없음"""
+
+def _default_factory(api_key: str, secret_key: str, testnet: bool):
+    if os.getenv("EXCHANGE_SIMULATOR", "").lower() in ("1", "true", "yes"):
+        # 오프라인 부하 테스트 - 로컬 매칭 엔진 (API 키별 시뮬레이터 계좌)
+        from services.exchange_sim import SimBinanceService, default_exchange
+        return SimBinanceService(default_exchange(), api_key, secret_key, testnet=testnet)
+    from services.real_binance_service import RealBinanceService
+    return RealBinanceService(api_key, secret_key, testnet=testnet)
+
+def _close_client(client):
+    """클라이언트 HTTP 세션 정리"""
+    close = getattr(client, "close", None) or getattr(client, "close_connection", None)
+    if close is not None:
+        try:
+            close()
+        except Exception as e:
+            print(f"⚠️ 클라이언트 종료 실패: {e}")
+
+class _PoolEntry:
+    def __init__(self, client, secret_key: str, fingerprint: Tuple):
+        self.client = client
+        self.secret_key = secret_key  # 복호화된 비밀 키 - 클라이언트 수명 동안만 보관
+        self.fingerprint = fingerprint
+        self.created_at = time.time()
+        self.last_used = self.created_at
+        self.holds = 0
+        self.uses = 0
+
+class ClientPool:
+    """거래소 키별 클라이언트 풀
+
+    키(ExchangeKey.id 등)마다 살아 있는 클라이언트를 재사용하고, idle_ttl초 동안
+    쓰이지 않은 것은 정리한다. 최대 max_size개를 넘으면 가장 오래 안 쓴 것부터
+    내보낸다. 자동매매 세션처럼 오래 쓰는 쪽은 hold/release로 고정한다.
+    API 키나 암호화된 비밀 키가 바뀌면 클라이언트를 새로 만든다.
+    """
+
+    def __init__(self, factory: ClientFactory = None, max_size: int = 256, idle_ttl: float = 900.0,
+                 on_evict: Callable[[Hashable], None] = None):
+        self.factory = factory or _default_factory
+        self.max_size = max_size
+        self.idle_ttl = idle_ttl
+        self.on_evict = on_evict
+        self._entries: "OrderedDict[Hashable, _PoolEntry]" = OrderedDict()
+        self._lock = threading.Lock()
+
+        # 통계
+        self.hits = 0
+        self.misses = 0
+        self.created = 0
+        self.decrypts = 0
+        self.evicted_idle = 0
+        self.evicted_lru = 0
+
+    # ---- 조회 ----
+
+    def get(self, key: Hashable, api_key: str, secret_key: str, testnet: bool = True,
+            decrypt: Callable[[str], str] = None):
+        """키에 해당하는 클라이언트 (없으면 생성) - secret_key가 암호문이면 decrypt 지정"""
+        fingerprint = (api_key, secret_key, testnet)
+        with self._lock:
+            self._evict_idle(time.time())
+            entry = self._entries.get(key)
+            if entry is not None and entry.fingerprint == fingerprint:
+                self._touch(key, entry)
+                self.hits += 1
+                return entry.client
+            self.misses += 1
+
+        # 생성은 네트워크 호출(ping)을 포함하므로 락 밖에서
+        if decrypt is not None:
+            plain_secret = decrypt(secret_key)
+            self.decrypts += 1
+        else:
+            plain_secret = secret_key
+        client = self.factory(api_key, plain_secret, testnet)
+
+        with self._lock:
+            current = self._entries.get(key)
+            if current is not None and current.fingerprint == fingerprint:
+                # 동시에 다른 요청이 먼저 만들었으면 그쪽을 사용
+                self._touch(key, current)
+                _close_client(client)
+                return current.client
+            if current is not None:
+                self._drop(key)
+            try:
+                self._make_room()
+            except ClientPoolFull:
+                _close_client(client)  # 방금 만든 클라이언트의 세션/연결 정리
+                raise
+            entry = self._entries[key] = _PoolEntry(client, plain_secret, fingerprint)
+            entry.uses += 1
+            self.created += 1
+            return client
+
+    def hold(self, key: Hashable) -> bool:
+        """release할 때까지 정리 대상에서 제외 (자동매매 세션 등)"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return False
+            entry.holds += 1
+            return True
+
+    def release(self, key: Hashable):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry.holds > 0:
+                entry.holds -= 1
+                entry.last_used = time.time()
+
+    def peek(self, key: Hashable):
+        """이미 만들어진 클라이언트만 조회 (없으면 None)"""
+        with self._lock:
+            self._evict_idle(time.time())
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            self._touch(key, entry)
+            self.hits += 1
+            return entry.client
+
+    def _touch(self, key: Hashable, entry: _PoolEntry):
+        entry.last_used = time.time()
+        entry.uses += 1
+        self._entries.move_to_end(key)
+
+    # ---- 정리 ----
+
+    def _drop(self, key: Hashable):
+        entry = self._entries.pop(key)
+        _close_client(entry.client)
+        if self.on_evict is not None:
+            self.on_evict(key)
+
+    def _evict_idle(self, now: float):
+        expired = [key for key, entry in self._entries.items()
+                   if entry.holds == 0 and now - entry.last_used > self.idle_ttl]
+        for key in expired:
+            self._drop(key)
+        self.evicted_idle += len(expired)
+
+    def _make_room(self):
+        while len(self._entries) >= self.max_size:
+            victim = next((key for key, entry in self._entries.items() if entry.holds == 0), None)
+            if victim is None:
+                raise ClientPoolFull(f"클라이언트 풀 가득 참 ({self.max_size})")
+            self._drop(victim)
+            self.evicted_lru += 1
+
+    def invalidate(self, key: Hashable):
+        """키 삭제/변경 시 클라이언트 정리"""
+        with self._lock:
+            if key in self._entries:
+                self._drop(key)
+
+    def close_all(self):
+        with self._lock:
+            for key in list(self._entries):
+                self._drop(key)
+
+    def stats(self) -> Dict:
+        """풀 통계"""
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "held": sum(1 for entry in self._entries.values() if entry.holds),
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": round(self.hits / total, 4) if total else 0.0,
+                "created": self.created,
+                "decrypts": self.decrypts,
+                "evicted_idle": self.evicted_idle,
+                "evicted_lru": self.evicted_lru,
+                "idle_ttl": self.idle_ttl
+            }
+
+# 자동매매용 RealBinanceService 풀 (키: ExchangeKey.id)
+real_binance_pool = ClientPool(
+    max_size=int(os.getenv("BINANCE_CLIENT_POOL_SIZE", "256")),
+    idle_ttl=float(os.getenv("BINANCE_CLIENT_IDLE_TTL", "900"))
+)
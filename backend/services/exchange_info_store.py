@@ -0,0 +1,193 @@
+import json
+import os
+import threading
+import time
+from collections import defaultdict
+from typing import Callable, Dict, List, Optional
+
+def _default_loader() -> Dict:
+    """exchangeInfo 원본 조회 (실패 시 예외 - 폴백 데이터는 저장하지 않음)"""
+    from .binance_service import BinanceService
+    return BinanceService()._make_public_request("exchangeInfo")
+
+class _ExchangeInfoIndex:
+    """exchangeInfo 스냅샷과 인덱스 (생성 후 변경하지 않음)"""
+
+    def __init__(self, info: Dict, loaded_at: float):
+        self.info = info
+        self.loaded_at = loaded_at
+        self.by_symbol: Dict[str, Dict] = {}
+        self.by_base: Dict[str, List[Dict]] = defaultdict(list)
+        self.by_quote: Dict[str, List[Dict]] = defaultdict(list)
+        self.by_status: Dict[str, List[Dict]] = defaultdict(list)
+        for sym_info in info.get("symbols", []):
+            self.by_symbol[sym_info["symbol"]] = sym_info
+            if "baseAsset" in sym_info:
+                self.by_base[sym_info["baseAsset"]].append(sym_info)
+            if "quoteAsset" in sym_info:
+                self.by_quote[sym_info["quoteAsset"]].append(sym_info)
+            if "status" in sym_info:
+                self.by_status[sym_info["status"]].append(sym_info)
+
+class ExchangeInfoStore:
+    """exchangeInfo 메모리 저장소
+
+    최초 1회 로드 후 백그라운드 스레드가 주기적으로 갱신한다. 심볼/기초자산/
+    견적자산/상태 인덱스를 갖고, snapshot_path를 주면 디스크에 스냅샷을 저장해
+    콜드 스타트 시 네트워크 없이 로드한다. 미로드 상태의 로드 실패 후
+    retry_delay 동안은 업스트림을 다시 부르지 않고 바로 실패를 돌려준다.
+    """
+
+    def __init__(self, loader: Callable[[], Dict] = None, refresh_interval: float = 3600,
+                 snapshot_path: Optional[str] = None, retry_delay: float = 30.0):
+        self.loader = loader or _default_loader
+        self.refresh_interval = refresh_interval
+        self.snapshot_path = snapshot_path
+        self.retry_delay = retry_delay
+        self._index: Optional[_ExchangeInfoIndex] = None
+        self._failed_at: Optional[float] = None  # 마지막 초기 로드 실패 시각 (monotonic)
+        self._load_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+        # 통계
+        self.refreshes = 0
+        self.errors = 0
+        self.lookups = 0
+
+    @property
+    def is_loaded(self) -> bool:
+        return self._index is not None
+
+    def _load_snapshot(self) -> bool:
+        """디스크 스냅샷 로드"""
+        if not self.snapshot_path or not os.path.exists(self.snapshot_path):
+            return False
+        try:
+            with open(self.snapshot_path, "r", encoding="utf-8") as f:
+                info = json.load(f)
+            self._index = _ExchangeInfoIndex(info, os.path.getmtime(self.snapshot_path))
+            print(f"✅ exchangeInfo snapshot loaded: {len(self._index.by_symbol)} symbols")
+            return True
+        except Exception as e:
+            print(f"⚠️ exchangeInfo snapshot load failed: {e}")
+            return False
+
+    def _save_snapshot(self, info: Dict):
+        """디스크 스냅샷 저장 (임시 파일 후 교체)"""
+        if not self.snapshot_path:
+            return
+        try:
+            tmp_path = f"{self.snapshot_path}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(info, f)
+            os.replace(tmp_path, self.snapshot_path)
+        except Exception as e:
+            print(f"⚠️ exchangeInfo snapshot save failed: {e}")
+
+    def refresh(self) -> bool:
+        """업스트림에서 다시 받아 인덱스 교체"""
+        try:
+            info = self.loader()
+        except Exception as e:
+            self.errors += 1
+            print(f"Error refreshing exchangeInfo: {e}")
+            return False
+        self._index = _ExchangeInfoIndex(info, time.time())
+        self.refreshes += 1
+        self._save_snapshot(info)
+        return True
+
+    def _backing_off(self) -> bool:
+        return self._failed_at is not None and time.monotonic() - self._failed_at < self.retry_delay
+
+    def ensure_loaded(self) -> bool:
+        """미로드 상태면 스냅샷 또는 업스트림에서 로드 (동시 호출은 한 번만, 실패 후엔 retry_delay 대기)"""
+        if self._index is not None:
+            return True
+        if self._backing_off():
+            return False
+        with self._load_lock:
+            if self._index is None and not self._backing_off() and not self._load_snapshot():
+                self._failed_at = None if self.refresh() else time.monotonic()
+        return self._index is not None
+
+    def _refresh_loop(self):
+        while not self._stop.is_set():
+            index = self._index
+            age = time.time() - index.loaded_at if index else self.refresh_interval
+            wait = max(0.0, self.refresh_interval - age)
+            if self._stop.wait(wait):
+                break
+            if not self.refresh():
+                # 실패 시 짧게 재시도
+                self._stop.wait(min(60.0, self.refresh_interval))
+
+    def start(self):
+        """백그라운드 갱신 시작"""
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._refresh_loop, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """백그라운드 갱신 중지"""
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout=5)
+
+    def get_info(self) -> Optional[Dict]:
+        """전체 exchangeInfo"""
+        if not self.ensure_loaded():
+            return None
+        return self._index.info
+
+    def get_symbol(self, symbol: str) -> Optional[Dict]:
+        """심볼 정보 (O(1))"""
+        if not self.ensure_loaded():
+            return None
+        self.lookups += 1
+        return self._index.by_symbol.get(symbol.upper())
+
+    def find_symbols(self, base_asset: str = None, quote_asset: str = None, status: str = None) -> List[Dict]:
+        """기초자산/견적자산/상태 조건으로 심볼 조회"""
+        if not self.ensure_loaded():
+            return []
+        index = self._index
+        candidates = None
+        for value, table in ((base_asset, index.by_base), (quote_asset, index.by_quote), (status, index.by_status)):
+            if value is None:
+                continue
+            matches = table.get(value.upper(), [])
+            if candidates is None or len(matches) < len(candidates):
+                candidates = matches
+        if candidates is None:
+            return list(index.by_symbol.values())
+        return [
+            s for s in candidates
+            if (base_asset is None or s.get("baseAsset") == base_asset.upper())
+            and (quote_asset is None or s.get("quoteAsset") == quote_asset.upper())
+            and (status is None or s.get("status") == status.upper())
+        ]
+
+    def stats(self) -> Dict:
+        """저장소 통계"""
+        index = self._index
+        return {
+            "loaded": index is not None,
+            "symbols": len(index.by_symbol) if index else 0,
+            "age_seconds": round(time.time() - index.loaded_at, 1) if index else None,
+            "refresh_interval": self.refresh_interval,
+            "retry_delay": self.retry_delay,
+            "refreshes": self.refreshes,
+            "errors": self.errors,
+            "lookups": self.lookups
+        }
+
+# 프로세스 전역 저장소
+exchange_info_store = ExchangeInfoStore(
+    refresh_interval=float(os.getenv("BINANCE_EXCHANGE_INFO_REFRESH", "3600")),
+    snapshot_path=os.getenv("BINANCE_EXCHANGE_INFO_SNAPSHOT") or None,
+    retry_delay=float(os.getenv("BINANCE_EXCHANGE_INFO_RETRY_DELAY", "30"))
+)
@@ -4,6 +4,7 @@ from sqlalchemy.orm import Session
 from backend.models.user import ExchangeKey
 from backend.schemas.user import ExchangeKeyCreate
 from backend.services.binance_service import BinanceService, mask_api_key
+from backend.services.client_pool import ClientPool
 from cryptography.fernet import Fernet
 import os
 from dotenv import load_dotenv
@@ -17,6 +18,9 @@ if not ENCRYPTION_KEY:
     
 fernet = Fernet(ENCRYPTION_KEY.encode())
 
+# 거래소 키별 BinanceService 풀 - 복호화된 비밀 키는 클라이언트 수명 동안 재사용
+binance_service_pool = ClientPool(factory=lambda api_key, secret_key, testnet: BinanceService(api_key, secret_key))
+
 class ExchangeService:
     @staticmethod
     def encrypt_secret_key(secret_key: str) -> str:
@@ -77,6 +81,7 @@ class ExchangeService:
         if key:
             db.delete(key)
             db.commit()
+            binance_service_pool.invalidate(key_id)
             return True
         return False
 
@@ -92,6 +97,7 @@ class ExchangeService:
         if not key:
             raise ValueError("No active API key found")
         
-        # 비밀 키 복호화
-        decrypted_secret = ExchangeService.decrypt_secret_key(key.secret_key)
-        return BinanceService(key.api_key, decrypted_secret)
\ No newline at end of file
+        # 풀에 없을 때만 비밀 키 복호화
+        return binance_service_pool.get(
+            key.id, key.api_key, key.secret_key, decrypt=ExchangeService.decrypt_secret_key
+        )
\ No newline at end of file
@@ -0,0 +1,919 @@
+import asyncio
+import heapq
+import itertools
+import json
+import math
+import os
+import random
+import threading
+import time
+from collections import OrderedDict, deque
+from datetime import datetime
+from typing import Callable, Deque, Dict, List, Optional, Tuple
+
+from services.kline_store import INTERVAL_MS, KlineStore
+from services.order_executor import UNKNOWN_ORDER_CODE, OrderError, OrderExecutor
+
+TAKER_FEE = 0.0004
+MAKER_FEE = 0.0002
+DEFAULT_LEVERAGE = 20
+MAX_LEVERAGE = 125
+EPSILON = 1e-12
+OPEN_STATUSES = ("NEW", "PARTIALLY_FILLED")
+
+# 기본 상장 심볼과 시작 가격
+DEFAULT_SYMBOLS = {
+    "BTCUSDT": 43250.75, "ETHUSDT": 2580.40, "BNBUSDT": 315.20, "ADAUSDT": 0.52, "DOTUSDT": 7.15
+}
+
+def _reject(message: str, code: int, status: int = 400) -> OrderError:
+    return OrderError(message, code, status)
+
+class SimOrder:
+    __slots__ = ("order_id", "client_order_id", "account", "symbol", "side", "type", "price", "quantity",
+                 "filled", "quote", "status", "reduce_only", "time_in_force", "time", "update_time",
+                 "margin_per_unit")
+
+    def __init__(self, order_id: int, client_order_id: str, account: "SimAccount", symbol: str, side: str,
+                 order_type: str, price: float, quantity: float, reduce_only: bool, time_in_force: str,
+                 now_ms: int):
+        self.order_id = order_id
+        self.client_order_id = client_order_id
+        self.account = account
+        self.symbol = symbol
+        self.side = side
+        self.type = order_type
+        self.price = price
+        self.quantity = quantity
+        self.filled = 0.0
+        self.quote = 0.0
+        self.status = "NEW"
+        self.reduce_only = reduce_only
+        self.time_in_force = time_in_force
+        self.time = now_ms
+        self.update_time = now_ms
+        self.margin_per_unit = 0.0  # 미체결 지정가의 단위 수량당 예약 증거금
+
+    @property
+    def remaining(self) -> float:
+        return self.quantity - self.filled
+
+    def to_dict(self) -> Dict:
+        """선물 주문 응답 형식"""
+        avg_price = self.quote / self.filled if self.filled else 0.0
+        return {
+            "orderId": self.order_id,
+            "symbol": self.symbol,
+            "status": self.status,
+            "clientOrderId": self.client_order_id,
+            "price": f"{self.price:.8f}",
+            "avgPrice": f"{avg_price:.8f}",
+            "origQty": f"{self.quantity:.8f}",
+            "executedQty": f"{self.filled:.8f}",
+            "cumQuote": f"{self.quote:.8f}",
+            "timeInForce": self.time_in_force,
+            "type": self.type,
+            "reduceOnly": self.reduce_only,
+            "side": self.side,
+            "time": self.time,
+            "updateTime": self.update_time
+        }
+
+class SimAccount:
+    """교차 증거금 USDT 선물 계좌 (단방향 포지션)"""
+
+    def __init__(self, api_key: str, balance: float, leverage: int):
+        self.api_key = api_key
+        self.wallet = balance
+        self.default_leverage = leverage
+        self.leverage: Dict[str, int] = {}
+        self.positions: Dict[str, List[float]] = {}  # symbol -> [부호 있는 수량, 진입가]
+        self.client_orders: Dict[str, SimOrder] = {}
+        self.open_orders: Dict[int, SimOrder] = {}
+        self.order_margin = 0.0
+        self.realized_pnl = 0.0
+        self.commission = 0.0
+
+    def leverage_for(self, symbol: str) -> int:
+        return self.leverage.get(symbol, self.default_leverage)
+
+    def unrealized(self, marks: Dict[str, float]) -> float:
+        return sum(amount * (marks[symbol] - entry) for symbol, (amount, entry) in self.positions.items())
+
+    def position_margin(self, marks: Dict[str, float]) -> float:
+        return sum(abs(amount) * marks[symbol] / self.leverage_for(symbol)
+                   for symbol, (amount, entry) in self.positions.items())
+
+    def available(self, marks: Dict[str, float]) -> float:
+        return self.wallet + self.unrealized(marks) - self.position_margin(marks) - self.order_margin
+
+class OrderBook:
+    """가격-시간 우선 호가창
+
+    가격 레벨은 dict(price -> deque)이고 최우선 가격은 힙으로 찾는다. 취소된
+    주문과 빈 레벨은 조회 시점에 지연 삭제한다.
+    """
+
+    def __init__(self, symbol: str):
+        self.symbol = symbol
+        self._bids: List[float] = []  # -price 최소 힙
+        self._asks: List[float] = []
+        self._bid_levels: Dict[float, Deque[SimOrder]] = {}
+        self._ask_levels: Dict[float, Deque[SimOrder]] = {}
+
+    def add(self, order: SimOrder):
+        levels, heap = (self._bid_levels, self._bids) if order.side == "BUY" else (self._ask_levels, self._asks)
+        queue = levels.get(order.price)
+        if queue is None:
+            queue = levels[order.price] = deque()
+            heapq.heappush(heap, -order.price if order.side == "BUY" else order.price)
+        queue.append(order)
+
+    def best(self, side: str) -> Tuple[Optional[float], Optional[Deque[SimOrder]]]:
+        """side 쪽 최우선 (가격, 주문 큐) - 비어 있으면 (None, None)"""
+        is_bid = side == "BUY"
+        levels, heap = (self._bid_levels, self._bids) if is_bid else (self._ask_levels, self._asks)
+        while heap:
+            price = -heap[0] if is_bid else heap[0]
+            queue = levels.get(price)
+            while queue and queue[0].status not in OPEN_STATUSES:
+                queue.popleft()
+            if queue:
+                return price, queue
+            levels.pop(price, None)
+            heapq.heappop(heap)
+        return None, None
+
+    def depth(self, limit: int = 20) -> Dict[str, List[List[str]]]:
+        def side_levels(levels, reverse):
+            rows = []
+            for price in sorted(levels, reverse=reverse):
+                quantity = sum(o.remaining for o in levels[price] if o.status in OPEN_STATUSES)
+                if quantity > EPSILON:
+                    rows.append([f"{price:.8f}", f"{quantity:.8f}"])
+                    if len(rows) >= limit:
+                        break
+            return rows
+        return {"bids": side_levels(self._bid_levels, True), "asks": side_levels(self._ask_levels, False)}
+
+class SimulatedExchange:
+    """로컬 매칭 엔진 거래소 시뮬레이터
+
+    심볼마다 가격-시간 우선 호가창과 마크 가격을 둔다. 들어온 주문은 먼저
+    호가창의 반대편 주문과 체결되고, 남은 수량은 마크 가격의 외부 유동성
+    (slippage_bps 반영)과 체결된다. 미체결 지정가는 호가창에 남아 있다가
+    마크 가격이 지나가면 지정가로 체결된다. 계좌는 USDT 교차 증거금 선물
+    (단방향 포지션, 심볼별 레버리지, 수수료, 실현/미실현 손익)이다.
+    같은 계좌끼리는 체결하지 않고 들어온 주문의 나머지를 만료한다 (EXPIRE_TAKER).
+    """
+
+    def __init__(self, symbols: Dict[str, float] = None, starting_balance: float = 10_000.0,
+                 leverage: int = DEFAULT_LEVERAGE, slippage_bps: float = 0.0,
+                 taker_fee: float = TAKER_FEE, maker_fee: float = MAKER_FEE,
+                 history: int = 500, max_closed_orders: int = 100_000,
+                 clock: Callable[[], float] = time.time, seed: Optional[int] = None):
+        self.starting_balance = starting_balance
+        self.default_leverage = leverage
+        self.slippage = slippage_bps / 10_000
+        self.taker_fee = taker_fee
+        self.maker_fee = maker_fee
+        self.history = history
+        self.max_closed_orders = max_closed_orders
+        self.clock = clock
+        self.random = random.Random(seed)
+        self.listeners: List[Callable[[str, float], None]] = []
+
+        self._lock = threading.RLock()
+        self._order_ids = itertools.count(1)
+        self._marks: Dict[str, float] = {}
+        self._books: Dict[str, OrderBook] = {}
+        self._tickers: Dict[str, Dict] = {}
+        self._candles: Dict[str, Dict[str, Deque[list]]] = {}  # symbol -> interval -> 캔들
+        self._accounts: Dict[str, SimAccount] = {}
+        self._closed: "OrderedDict[int, SimOrder]" = OrderedDict()
+
+        # 통계
+        self.orders = 0
+        self.rejects = 0
+        self.trades = 0
+        self.price_updates = 0
+
+        for symbol, price in (symbols or DEFAULT_SYMBOLS).items():
+            self.add_symbol(symbol, price)
+
+    def _now_ms(self) -> int:
+        return int(self.clock() * 1000)
+
+    # ---- 시세 ----
+
+    def add_symbol(self, symbol: str, price: float):
+        symbol = symbol.upper()
+        with self._lock:
+            self._marks[symbol] = price
+            self._books[symbol] = OrderBook(symbol)
+            self._tickers[symbol] = {"open": price, "high": price, "low": price, "volume": 0.0,
+                                     "quote_volume": 0.0, "count": 0, "open_time": self._now_ms()}
+
+    def _symbol(self, symbol: str) -> str:
+        symbol = symbol.upper()
+        if symbol not in self._marks:
+            raise _reject("Invalid symbol.", -1121)
+        return symbol
+
+    def _series(self, symbol: str, interval: str) -> Deque[list]:
+        """인터벌 캔들 시리즈 - 처음 요청될 때 현재 가격으로 끝나는 랜덤워크 이력 생성"""
+        series = self._candles.get(symbol, {}).get(interval)
+        if series is not None:
+            return series
+        interval_ms = INTERVAL_MS.get(interval)
+        if interval_ms is None:
+            raise _reject("Invalid interval.", -1120)
+        volatility = 0.002 * math.sqrt(interval_ms / 60_000)
+        closes = [1.0]
+        for _ in range(self.history - 1):
+            closes.append(closes[-1] * math.exp(self.random.gauss(0, volatility)))
+        scale = self._marks[symbol] / closes[-1]
+        current = self._now_ms() // interval_ms * interval_ms
+        series = deque(maxlen=self.history)
+        previous = closes[0] * scale
+        for i, close in enumerate(closes):
+            close *= scale
+            wick = abs(self.random.gauss(0, volatility / 2)) * close
+            series.append([current - (self.history - 1 - i) * interval_ms, previous,
+                           max(previous, close) + wick, min(previous, close) - wick, close,
+                           self.random.uniform(10, 1000)])
+            previous = close
+        self._candles.setdefault(symbol, {})[interval] = series
+        return series
+
+    def _update_candles(self, symbol: str, price: float, volume: float, now_ms: int):
+        for interval, series in self._candles.get(symbol, {}).items():
+            open_time = now_ms // INTERVAL_MS[interval] * INTERVAL_MS[interval]
+            last = series[-1]
+            if last[0] == open_time:
+                last[2] = max(last[2], price)
+                last[3] = min(last[3], price)
+                last[4] = price
+                last[5] += volume
+            elif open_time > last[0]:
+                series.append([open_time, last[4], max(last[4], price), min(last[4], price), price, volume])
+
+    def set_price(self, symbol: str, price: float):
+        """마크 가격 갱신 - 가격을 지나친 미체결 지정가 체결, 캔들/티커 갱신, 리스너 통지"""
+        symbol = self._symbol(symbol)
+        with self._lock:
+            self._marks[symbol] = price
+            self.price_updates += 1
+            ticker = self._tickers[symbol]
+            ticker["high"] = max(ticker["high"], price)
+            ticker["low"] = min(ticker["low"], price)
+            self._update_candles(symbol, price, 0.0, self._now_ms())
+            book = self._books[symbol]
+            # 마크 가격 이상 매수 / 이하 매도 지정가는 외부 유동성과 지정가로 체결 (메이커)
+            for side, crossed in (("BUY", lambda level: level >= price), ("SELL", lambda level: level <= price)):
+                while True:
+                    level, queue = book.best(side)
+                    if level is None or not crossed(level):
+                        break
+                    maker = queue.popleft()
+                    quantity = self._fillable(maker)
+                    if quantity > EPSILON:
+                        self._execute(maker, quantity, level, maker=True)
+                    if maker.remaining > EPSILON:
+                        # 줄일 포지션이 남지 않은 reduceOnly 나머지
+                        self._close_order(maker, "EXPIRED")
+        for listener in self.listeners:
+            listener(symbol, price)
+
+    def random_walk(self, steps: int = 1, volatility: float = 0.001):
+        """모든 심볼 가격을 기하 랜덤워크로 steps번 이동"""
+        for _ in range(steps):
+            for symbol in list(self._marks):
+                self.set_price(symbol, self._marks[symbol] * math.exp(self.random.gauss(0, volatility)))
+
+    def add_listener(self, listener: Callable[[str, float], None]):
+        """가격 리스너 (MarketDataStream과 같은 (symbol, price) 시그니처)"""
+        self.listeners.append(listener)
+
+    def ticker_price(self, symbol: str = None):
+        with self._lock:
+            if symbol is not None:
+                symbol = self._symbol(symbol)
+                return {"symbol": symbol, "price": f"{self._marks[symbol]:.8f}"}
+            return [{"symbol": s, "price": f"{p:.8f}"} for s, p in self._marks.items()]
+
+    def ticker_24hr(self, symbol: str) -> Dict:
+        symbol = self._symbol(symbol)
+        with self._lock:
+            t = self._tickers[symbol]
+            last = self._marks[symbol]
+            bid, _ = self._books[symbol].best("BUY")
+            ask, _ = self._books[symbol].best("SELL")
+        change = last - t["open"]
+        return {
+            "symbol": symbol,
+            "priceChange": f"{change:.8f}",
+            "priceChangePercent": f"{change / t['open'] * 100:.3f}",
+            "weightedAvgPrice": f"{t['quote_volume'] / t['volume'] if t['volume'] else last:.8f}",
+            "prevClosePrice": f"{t['open']:.8f}",
+            "lastPrice": f"{last:.8f}",
+            "bidPrice": f"{bid or last:.8f}",
+            "askPrice": f"{ask or last:.8f}",
+            "openPrice": f"{t['open']:.8f}",
+            "highPrice": f"{t['high']:.8f}",
+            "lowPrice": f"{t['low']:.8f}",
+            "volume": f"{t['volume']:.8f}",
+            "quoteVolume": f"{t['quote_volume']:.8f}",
+            "openTime": t["open_time"],
+            "closeTime": self._now_ms(),
+            "count": t["count"]
+        }
+
+    def mini_ticker(self, symbol: str) -> Dict:
+        """웹소켓 24hrMiniTicker 이벤트 형식"""
+        t = self.ticker_24hr(symbol)
+        return {"e": "24hrMiniTicker", "E": t["closeTime"], "s": t["symbol"], "c": t["lastPrice"],
+                "o": t["openPrice"], "h": t["highPrice"], "l": t["lowPrice"], "v": t["volume"],
+                "q": t["quoteVolume"]}
+
+    def klines(self, symbol: str, interval: str, limit: int = 500) -> List[list]:
+        """바이낸스 kline 원본 행 형식"""
+        symbol = self._symbol(symbol)
+        with self._lock:
+            rows = list(self._series(symbol, interval))[-limit:]
+        interval_ms = INTERVAL_MS[interval]
+        return [[r[0], f"{r[1]:.8f}", f"{r[2]:.8f}", f"{r[3]:.8f}", f"{r[4]:.8f}", f"{r[5]:.8f}",
+                 r[0] + interval_ms - 1, f"{r[5] * r[4]:.8f}", 0, "0", "0", "0"] for r in rows]
+
+    def depth(self, symbol: str, limit: int = 20) -> Dict:
+        symbol = self._symbol(symbol)
+        with self._lock:
+            book = self._books[symbol].depth(limit)
+        return {"lastUpdateId": self.trades, **book}
+
+    def exchange_info(self) -> Dict:
+        symbols = []
+        for symbol in self._marks:
+            quote = "USDT" if symbol.endswith("USDT") else symbol[-4:]
+            symbols.append({
+                "symbol": symbol,
+                "status": "TRADING",
+                "baseAsset": symbol[:-len(quote)],
+                "quoteAsset": quote,
+                "filters": [
+                    {"filterType": "PRICE_FILTER", "minPrice": "0.00000001", "maxPrice": "10000000", "tickSize": "0.00000001"},
+                    {"filterType": "LOT_SIZE", "minQty": "0.00000001", "maxQty": "10000000", "stepSize": "0.00000001"}
+                ]
+            })
+        return {"timezone": "UTC", "serverTime": self._now_ms(), "rateLimits": [], "symbols": symbols}
+
+    # ---- 계좌 ----
+
+    def account(self, api_key: str) -> SimAccount:
+        account = self._accounts.get(api_key)
+        if account is None:
+            with self._lock:
+                account = self._accounts.get(api_key)
+                if account is None:
+                    account = self._accounts[api_key] = SimAccount(api_key, self.starting_balance,
+                                                                   self.default_leverage)
+        return account
+
+    def deposit(self, api_key: str, amount: float):
+        with self._lock:
+            self.account(api_key).wallet += amount
+
+    def set_leverage(self, api_key: str, symbol: str, leverage: int) -> Dict:
+        symbol = self._symbol(symbol)
+        leverage = int(leverage)
+        if not 1 <= leverage <= MAX_LEVERAGE:
+            raise _reject("Leverage is not valid.", -4028)
+        with self._lock:
+            self.account(api_key).leverage[symbol] = leverage
+        return {"symbol": symbol, "leverage": leverage, "maxNotionalValue": "1000000"}
+
+    def futures_account(self, api_key: str) -> Dict:
+        """선물 계좌 응답 형식 (futures_account)"""
+        with self._lock:
+            account = self.account(api_key)
+            marks = self._marks
+            unrealized = account.unrealized(marks)
+            positions = [{
+                "symbol": symbol,
+                "positionAmt": f"{amount:.8f}",
+                "entryPrice": f"{entry:.8f}",
+                "markPrice": f"{marks[symbol]:.8f}",
+                "unrealizedProfit": f"{amount * (marks[symbol] - entry):.8f}",
+                "leverage": str(account.leverage_for(symbol)),
+                "isolated": False,
+                "positionSide": "BOTH"
+            } for symbol, (amount, entry) in account.positions.items()]
+            return {
+                "totalWalletBalance": f"{account.wallet:.8f}",
+                "totalUnrealizedProfit": f"{unrealized:.8f}",
+                "totalMarginBalance": f"{account.wallet + unrealized:.8f}",
+                "totalPositionInitialMargin": f"{account.position_margin(marks):.8f}",
+                "totalOpenOrderInitialMargin": f"{account.order_margin:.8f}",
+                "availableBalance": f"{account.available(marks):.8f}",
+                "assets": [{"asset": "USDT", "walletBalance": f"{account.wallet:.8f}",
+                            "unrealizedProfit": f"{unrealized:.8f}"}],
+                "positions": positions
+            }
+
+    def balances(self, api_key: str) -> List[Dict]:
+        """현물 잔고 응답 형식 (USDT 가용/증거금 묶임)"""
+        with self._lock:
+            account = self.account(api_key)
+            available = account.available(self._marks)
+            locked = account.position_margin(self._marks) + account.order_margin
+        return [{"asset": "USDT", "free": f"{max(available, 0.0):.8f}", "locked": f"{locked:.8f}"}]
+
+    # ---- 주문 ----
+
+    def create_order(self, api_key: str, params: Dict) -> Dict:
+        """선물 주문 (futures_create_order 파라미터) - 거절 시 OrderError"""
+        try:
+            return self._create_order(api_key, params)
+        except OrderError:
+            self.rejects += 1
+            raise
+
+    def _create_order(self, api_key: str, params: Dict) -> Dict:
+        symbol = self._symbol(params["symbol"])
+        side = str(params["side"]).upper()
+        if side not in ("BUY", "SELL"):
+            raise _reject("Invalid side.", -1117)
+        order_type = str(params.get("type", "MARKET")).upper()
+        if order_type not in ("MARKET", "LIMIT"):
+            raise _reject("Invalid orderType.", -1116)
+        quantity = float(params["quantity"])
+        if quantity <= 0:
+            raise _reject("Quantity less than or equal to zero.", -4003)
+        price = 0.0
+        if order_type == "LIMIT":
+            if not params.get("price"):
+                raise _reject("Mandatory parameter 'price' was not sent, was empty/null, or malformed.", -1102)
+            price = float(params["price"])
+        time_in_force = str(params.get("timeInForce", "GTC")).upper() if order_type == "LIMIT" else "GTC"
+        reduce_only = str(params.get("reduceOnly", "false")).lower() == "true"
+        client_order_id = params.get("newClientOrderId")
+
+        with self._lock:
+            account = self.account(api_key)
+            order_id = next(self._order_ids)
+            client_order_id = client_order_id or f"sim-{order_id}"
+            if client_order_id in account.client_orders:
+                raise _reject("ClientOrderId is duplicated.", -4116)
+
+            amount = account.positions.get(symbol, (0.0, 0.0))[0]
+            signed = quantity if side == "BUY" else -quantity
+            closing = min(abs(amount), quantity) if amount * signed < 0 else 0.0
+            if reduce_only:
+                if closing <= 0:
+                    raise _reject("ReduceOnly Order is rejected.", -2022)
+                quantity = closing  # 포지션보다 큰 reduceOnly는 포지션 크기로 줄임
+            else:
+                reference = price if order_type == "LIMIT" else self._marks[symbol]
+                required = (quantity - closing) * reference / account.leverage_for(symbol)
+                required += quantity * reference * self.taker_fee
+                if required > account.available(self._marks) + EPSILON:
+                    raise _reject("Margin is insufficient.", -2019)
+
+            now_ms = self._now_ms()
+            order = SimOrder(order_id, client_order_id, account, symbol, side, order_type, price, quantity,
+                             reduce_only, time_in_force, now_ms)
+            account.client_orders[client_order_id] = order
+            self.orders += 1
+            self._match(order, now_ms)
+
+            if order.status == "EXPIRED":  # 자기 체결 방지로 만료
+                self._archive(order)
+            elif order.remaining > EPSILON:
+                if order_type == "LIMIT" and time_in_force == "GTC":
+                    if not reduce_only:
+                        order.margin_per_unit = price / account.leverage_for(symbol)
+                        account.order_margin += order.remaining * order.margin_per_unit
+                    account.open_orders[order_id] = order
+                    self._books[symbol].add(order)
+                else:
+                    order.status = "EXPIRED"
+                    self._archive(order)
+            return order.to_dict()
+
+    def _crosses(self, order: SimOrder, price: float) -> bool:
+        if order.type == "MARKET":
+            return True
+        return price <= order.price if order.side == "BUY" else price >= order.price
+
+    def _fillable(self, order: SimOrder) -> float:
+        """지금 체결 가능한 수량 - reduceOnly는 남아 있는 반대 포지션까지만"""
+        if not order.reduce_only:
+            return order.remaining
+        amount = order.account.positions.get(order.symbol, (0.0, 0.0))[0]
+        if amount == 0 or (amount > 0) == (order.side == "BUY"):
+            return 0.0
+        return min(order.remaining, abs(amount))
+
+    def _match(self, order: SimOrder, now_ms: int):
+        book = self._books[order.symbol]
+        opposite = "SELL" if order.side == "BUY" else "BUY"
+        while order.remaining > EPSILON:
+            level, queue = book.best(opposite)
+            if level is None or not self._crosses(order, level):
+                break
+            maker = queue[0]
+            if maker.account is order.account:
+                order.status = "EXPIRED"  # 자기 체결 방지 - 남은 수량은 외부 유동성과도 체결하지 않음
+                return
+            available = self._fillable(maker)
+            if available <= EPSILON:
+                queue.popleft()
+                self._close_order(maker, "EXPIRED")
+                continue
+            quantity = min(order.remaining, available)
+            self._execute(maker, quantity, level, maker=True)
+            self._execute(order, quantity, level, maker=False)
+            if maker.remaining <= EPSILON:
+                queue.popleft()
+        if order.remaining > EPSILON:
+            # 호가창에 없는 나머지는 마크 가격의 외부 유동성과 체결
+            mark = self._marks[order.symbol]
+            fill_price = mark * (1 + self.slippage) if order.side == "BUY" else mark * (1 - self.slippage)
+            if self._crosses(order, fill_price):
+                self._execute(order, order.remaining, fill_price, maker=False)
+
+    def _execute(self, order: SimOrder, quantity: float, price: float, maker: bool):
+        account = order.account
+        order.filled += quantity
+        order.quote += quantity * price
+        order.update_time = self._now_ms()
+        if order.margin_per_unit:
+            account.order_margin -= quantity * order.margin_per_unit
+        fee = quantity * price * (self.maker_fee if maker else self.taker_fee)
+        account.wallet -= fee
+        account.commission += fee
+        self._apply_position(account, order.symbol, quantity if order.side == "BUY" else -quantity, price)
+
+        ticker = self._tickers[order.symbol]
+        ticker["volume"] += quantity
+        ticker["quote_volume"] += quantity * price
+        ticker["count"] += 1
+        if not maker:
+            self.trades += 1
+            self._update_candles(order.symbol, self._marks[order.symbol], quantity, order.update_time)
+        if order.remaining <= EPSILON:
+            order.status = "FILLED"
+            account.open_orders.pop(order.order_id, None)
+            self._archive(order)
+        else:
+            order.status = "PARTIALLY_FILLED"
+
+    @staticmethod
+    def _apply_position(account: SimAccount, symbol: str, delta: float, price: float):
+        position = account.positions.get(symbol)
+        amount, entry = position if position is not None else (0.0, 0.0)
+        if amount == 0 or (amount > 0) == (delta > 0):
+            new_amount = amount + delta
+            entry = (abs(amount) * entry + abs(delta) * price) / abs(new_amount)
+        else:
+            closing = min(abs(amount), abs(delta))
+            pnl = closing * (price - entry) * (1 if amount > 0 else -1)
+            account.wallet += pnl
+            account.realized_pnl += pnl
+            new_amount = amount + delta
+            if abs(new_amount) > EPSILON and (new_amount > 0) != (amount > 0):
+                entry = price  # 반대 방향으로 뒤집힌 나머지
+        if abs(new_amount) <= EPSILON:
+            account.positions.pop(symbol, None)
+        else:
+            account.positions[symbol] = [new_amount, entry]
+
+    def _archive(self, order: SimOrder):
+        """종료 주문 보관 (오래된 것부터 정리 - 클라이언트 ID 색인도 함께)"""
+        self._closed[order.order_id] = order
+        while len(self._closed) > self.max_closed_orders:
+            _, old = self._closed.popitem(last=False)
+            if old.account.client_orders.get(old.client_order_id) is old:
+                del old.account.client_orders[old.client_order_id]
+
+    def _close_order(self, order: SimOrder, status: str):
+        """미체결 주문 종료 (취소/만료) - 예약 증거금 반환, 호가창에서는 지연 삭제"""
+        order.status = status
+        order.update_time = self._now_ms()
+        order.account.order_margin -= order.remaining * order.margin_per_unit
+        order.account.open_orders.pop(order.order_id, None)
+        self._archive(order)
+
+    def _find(self, account: SimAccount, order_id=None, client_order_id: str = None) -> SimOrder:
+        order = None
+        if client_order_id is not None:
+            order = account.client_orders.get(client_order_id)
+        elif order_id is not None:
+            order_id = int(order_id)
+            order = account.open_orders.get(order_id) or self._closed.get(order_id)
+            if order is not None and order.account is not account:
+                order = None
+        if order is None:
+            raise _reject("Order does not exist.", UNKNOWN_ORDER_CODE)
+        return order
+
+    def get_order(self, api_key: str, symbol: str, order_id=None, client_order_id: str = None) -> Dict:
+        with self._lock:
+            return self._find(self.account(api_key), order_id, client_order_id).to_dict()
+
+    def cancel_order(self, api_key: str, symbol: str, order_id=None, client_order_id: str = None) -> Dict:
+        with self._lock:
+            account = self.account(api_key)
+            order = self._find(account, order_id, client_order_id)
+            if order.status not in OPEN_STATUSES:
+                raise _reject("Unknown order sent.", -2011)
+            self._close_order(order, "CANCELED")
+            return order.to_dict()
+
+    def open_orders(self, api_key: str, symbol: str = None) -> List[Dict]:
+        with self._lock:
+            return [o.to_dict() for o in self.account(api_key).open_orders.values()
+                    if symbol is None or o.symbol == symbol.upper()]
+
+    # ---- HTTP 대역 서버 라우트 ----
+
+    def routes(self) -> Dict[str, Callable]:
+        """BinanceStubServer 라우트 (API 키는 X-MBX-APIKEY 헤더 -> query["_apiKey"])"""
+        def handle(fn):
+            def route(query):
+                try:
+                    return 200, fn(query)
+                except OrderError as e:
+                    return e.status or 400, {"code": e.code, "msg": str(e)}
+                except (KeyError, ValueError) as e:
+                    return 400, {"code": -1102, "msg": f"Mandatory parameter missing or malformed: {e}"}
+            return route
+
+        def key(query):
+            return query.get("_apiKey") or "sim"
+
+        def symbol_or_none(query):
+            return query.get("symbol")
+
+        routes = {}
+        for prefix in ("/api/v3", "/fapi/v1"):
+            routes.update({
+                f"{prefix}/ticker/price": handle(lambda q: self.ticker_price(symbol_or_none(q))),
+                f"{prefix}/ticker/24hr": handle(lambda q: self.ticker_24hr(q["symbol"])),
+                f"{prefix}/exchangeInfo": handle(lambda q: self.exchange_info()),
+                f"{prefix}/time": handle(lambda q: {"serverTime": self._now_ms()}),
+                f"{prefix}/klines": handle(lambda q: self.klines(q["symbol"], q["interval"], int(q.get("limit", 500)))),
+                f"{prefix}/depth": handle(lambda q: self.depth(q["symbol"], int(q.get("limit", 20)))),
+            })
+        routes.update({
+            "/api/v3/account": handle(lambda q: {"balances": self.balances(key(q))}),
+            "/fapi/v1/account": handle(lambda q: self.futures_account(key(q))),
+            "/fapi/v2/account": handle(lambda q: self.futures_account(key(q))),
+            "POST /fapi/v1/order": handle(lambda q: self.create_order(key(q), q)),
+            "/fapi/v1/order": handle(lambda q: self.get_order(key(q), q.get("symbol"), q.get("orderId"),
+                                                              q.get("origClientOrderId"))),
+            "DELETE /fapi/v1/order": handle(lambda q: self.cancel_order(key(q), q.get("symbol"), q.get("orderId"),
+                                                                       q.get("origClientOrderId"))),
+            "/fapi/v1/openOrders": handle(lambda q: self.open_orders(key(q), symbol_or_none(q))),
+            "POST /fapi/v1/leverage": handle(lambda q: self.set_leverage(key(q), q["symbol"], q["leverage"])),
+        })
+        return routes
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {
+                "symbols": len(self._marks),
+                "accounts": len(self._accounts),
+                "orders": self.orders,
+                "rejects": self.rejects,
+                "trades": self.trades,
+                "resting_orders": sum(len(a.open_orders) for a in self._accounts.values()),
+                "price_updates": self.price_updates
+            }
+
+class SimGateway:
+    """OrderExecutor 게이트웨이 (in-process 시뮬레이터 직접 호출)"""
+
+    def __init__(self, exchange: SimulatedExchange, api_key: str):
+        self.exchange = exchange
+        self.api_key = api_key
+
+    def create_order(self, params: Dict) -> Dict:
+        return self.exchange.create_order(self.api_key, params)
+
+    def get_order(self, symbol: str, client_order_id: str) -> Optional[Dict]:
+        try:
+            return self.exchange.get_order(self.api_key, symbol, client_order_id=client_order_id)
+        except OrderError as e:
+            if e.code == UNKNOWN_ORDER_CODE:
+                return None
+            raise
+
+class SimBinanceService:
+    """시뮬레이터 클라이언트 - RealBinanceService/BinanceService와 같은 메서드
+
+    executor를 주면 실제 서비스처럼 주문 실행 큐를 거치고, 없으면 매칭 엔진을
+    직접 호출한다 (부하 테스트 시 스레드 전환 없이 최대 처리량).
+    """
+
+    def __init__(self, exchange: SimulatedExchange, api_key: str = "sim", secret_key: str = "",
+                 testnet: bool = True, kline_store: KlineStore = None, executor: OrderExecutor = None):
+        self.exchange = exchange
+        self.api_key = api_key
+        self.secret_key = secret_key
+        self.is_testnet = testnet
+        self.connected = True
+        self.kline_store = kline_store or KlineStore()
+        self.executor = executor
+        self.order_gateway = SimGateway(exchange, api_key)
+
+    def close(self):
+        pass
+
+    # RealBinanceService
+
+    def get_real_account_info(self):
+        return {"status": "success", "account": self.exchange.futures_account(self.api_key), "connected": True}
+
+    def place_real_order(self, symbol: str, side: str, quantity: float, order_type: str = "MARKET",
+                         reduce_only: bool = False, client_order_id: str = None, **extra):
+        if self.executor is not None:
+            return self.executor.execute(self.order_gateway, symbol, side, quantity, order_type=order_type,
+                                         reduce_only=reduce_only, client_order_id=client_order_id, **extra)
+        params = {"symbol": symbol, "side": side, "type": order_type, "quantity": quantity, **extra}
+        if reduce_only:
+            params["reduceOnly"] = "true"
+        if client_order_id:
+            params["newClientOrderId"] = client_order_id
+        try:
+            order = self.exchange.create_order(self.api_key, params)
+            return {"status": "success", "order": order, "client_order_id": order["clientOrderId"]}
+        except OrderError as e:
+            return {"status": "error", "message": str(e), "code": e.code}
+
+    def cancel_order(self, symbol: str, order_id=None, client_order_id: str = None):
+        try:
+            return {"status": "success",
+                    "order": self.exchange.cancel_order(self.api_key, symbol, order_id, client_order_id)}
+        except OrderError as e:
+            return {"status": "error", "message": str(e), "code": e.code}
+
+    def set_leverage(self, symbol: str, leverage: int):
+        return self.exchange.set_leverage(self.api_key, symbol, leverage)
+
+    def _fetch_klines(self, symbol: str, interval: str, limit: int) -> List[list]:
+        return self.exchange.klines(symbol, interval, limit)
+
+    def get_real_time_chart_data(self, symbol: str, interval: str = "15m", limit: int = 50):
+        try:
+            data = self.kline_store.get_window(symbol, interval, limit, self._fetch_klines)
+            return {"status": "success", "symbol": symbol, "interval": interval, "data": data}
+        except Exception as e:
+            return {"status": "error", "message": str(e)}
+
+    # BinanceService
+
+    def get_ticker_price(self, symbol: str = None):
+        return self.exchange.ticker_price(symbol)
+
+    def get_24hr_ticker(self, symbol: str) -> Dict:
+        return self.exchange.ticker_24hr(symbol)
+
+    def get_exchange_info(self) -> Dict:
+        return self.exchange.exchange_info()
+
+    def get_server_time(self) -> Dict:
+        return {"serverTime": self.exchange._now_ms()}
+
+    def get_account_balances(self) -> List[Dict]:
+        return self.exchange.balances(self.api_key)
+
+    def test_connection(self) -> Dict:
+        return {
+            "status": "success",
+            "msg": "Simulated exchange",
+            "server_time": self.exchange._now_ms(),
+            "local_time": int(time.time() * 1000),
+            "timestamp": datetime.utcnow().isoformat()
+        }
+
+    def get_symbol_info(self, symbol: str) -> Optional[Dict]:
+        return next((s for s in self.exchange.exchange_info()["symbols"] if s["symbol"] == symbol.upper()), None)
+
+class SimStreamServer:
+    """시뮬레이터 시세 웹소켓 (combined stream !miniTicker@arr 형식)
+
+    MarketDataStream(base_url=server.url)이 그대로 붙는다. 가격이 바뀐 심볼만
+    interval마다 한 프레임으로 묶어 모든 연결에 보낸다.
+    """
+
+    def __init__(self, exchange: SimulatedExchange, host: str = "127.0.0.1", port: int = 0,
+                 interval: float = 1.0):
+        self.exchange = exchange
+        self.host = host
+        self.port = port
+        self.interval = interval
+        self._changed: Dict[str, float] = {}
+        self._clients = set()
+        self._server = None
+        self._task: Optional[asyncio.Task] = None
+        self.frames_sent = 0
+        exchange.add_listener(self._on_price)
+
+    @property
+    def url(self) -> str:
+        return f"ws://{self.host}:{self.port}"
+
+    def _on_price(self, symbol: str, price: float):
+        self._changed[symbol] = price
+
+    async def _handler(self, websocket, *args):
+        self._clients.add(websocket)
+        try:
+            await websocket.wait_closed()
+        finally:
+            self._clients.discard(websocket)
+
+    async def _broadcast(self):
+        while True:
+            await asyncio.sleep(self.interval)
+            if not self._changed or not self._clients:
+                continue
+            changed, self._changed = self._changed, {}
+            frame = json.dumps({"stream": "!miniTicker@arr",
+                                "data": [self.exchange.mini_ticker(s) for s in changed]})
+            for websocket in list(self._clients):
+                try:
+                    await websocket.send(frame)
+                    self.frames_sent += 1
+                except Exception:
+                    self._clients.discard(websocket)
+
+    async def start(self) -> "SimStreamServer":
+        import websockets
+
+        self._server = await websockets.serve(self._handler, self.host, self.port)
+        self.port = next(iter(self._server.sockets)).getsockname()[1]
+        self._task = asyncio.create_task(self._broadcast())
+        return self
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+
+    async def __aenter__(self):
+        return await self.start()
+
+    async def __aexit__(self, *exc):
+        await self.stop()
+
+_default_exchange: Optional[SimulatedExchange] = None
+
+def default_exchange() -> SimulatedExchange:
+    """프로세스 공유 시뮬레이터 (EXCHANGE_SIMULATOR 모드의 클라이언트 풀이 사용)"""
+    global _default_exchange
+    if _default_exchange is None:
+        _default_exchange = SimulatedExchange(
+            starting_balance=float(os.getenv("EXCHANGE_SIMULATOR_BALANCE", "10000")),
+            slippage_bps=float(os.getenv("EXCHANGE_SIMULATOR_SLIPPAGE_BPS", "1"))
+        )
+    return _default_exchange
+
+# 모듈 테스트: 주문 처리량과 HTTP 대역 서버 동작
+if __name__ == "__main__":
+    exchange = SimulatedExchange(starting_balance=1e12, seed=1)
+    users = [f"user-{i}" for i in range(100)]
+    rng = random.Random(2)
+    count = 200_000
+    started = time.perf_counter()
+    for i in range(count):
+        side = "BUY" if rng.random() < 0.5 else "SELL"
+        if i % 4 == 0:
+            params = {"symbol": "BTCUSDT", "side": side, "type": "MARKET", "quantity": 0.01}
+        else:
+            offset = rng.uniform(-20, 20)
+            params = {"symbol": "BTCUSDT", "side": side, "type": "LIMIT", "timeInForce": "GTC",
+                      "quantity": 0.01, "price": round(43250.75 + offset, 1)}
+        exchange.create_order(users[i % len(users)], params)
+        if i % 1000 == 0:
+            exchange.random_walk()
+    elapsed = time.perf_counter() - started
+    print(f"in-process: {count / elapsed:,.0f} orders/s  {exchange.stats()}")
+
+    from services.binance_stub import BinanceStubServer
+
+    with BinanceStubServer(routes=exchange.routes()) as server:
+        from services.order_executor import FuturesRestGateway
+
+        gateway = FuturesRestGateway("http-user", "secret", server.futures_url)
+        executor = OrderExecutor(max_senders=8, max_queue=2000)
+        started = time.perf_counter()
+        futures = [executor.submit(gateway, "ETHUSDT", "BUY", 0.1) for _ in range(2000)]
+        results = [f.result() for f in futures]
+        elapsed = time.perf_counter() - started
+        print(f"http: {sum(r['status'] == 'success' for r in results)}/2000 in {elapsed:.2f}s, "
+              f"position={exchange.futures_account('http-user')['positions']}")
+        executor.shutdown()
@@ -0,0 +1,200 @@
+import bisect
+import itertools
+import math
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+from services.order_executor import make_client_order_id
+from services.position_book import Position, PositionBook, position_book
+
+# (가격, 순번, (user_id, symbol), 사유) - 가격 순 정렬 (upper 리스트에는 음수 가격으로 저장)
+Trigger = Tuple[float, int, Tuple[int, str], str]
+
+class _SymbolTriggers:
+    """심볼별 트리거 레벨 (정렬 리스트)
+
+    upper: 가격이 레벨 이상이면 발동 (롱 익절, 숏 손절) - 가격을 음수로 저장해 내림차순
+    lower: 가격이 레벨 이하이면 발동 (롱 손절, 숏 익절) - 오름차순
+    두 리스트 모두 발동할 레벨이 끝쪽에 모이므로 꼬리만 잘라낸다.
+    """
+
+    def __init__(self):
+        self.upper: List[Trigger] = []
+        self.lower: List[Trigger] = []
+
+    def add(self, trigger: Trigger, upper: bool) -> Tuple[List[Trigger], Trigger]:
+        """레벨 등록 - (리스트, 저장된 항목) 반환 (discard용)"""
+        if upper:
+            levels, trigger = self.upper, (-trigger[0],) + trigger[1:]
+        else:
+            levels = self.lower
+        bisect.insort(levels, trigger)
+        return levels, trigger
+
+    def pop_crossed(self, price: float) -> List[Trigger]:
+        """price에 닿은 레벨만 꺼냄 - 이분 탐색 + 꼬리 삭제, O(log n + k)"""
+        k = bisect.bisect_left(self.upper, (-price, -math.inf))
+        crossed = [(-level, seq, key, reason) for level, seq, key, reason in self.upper[k:]]
+        del self.upper[k:]
+        k = bisect.bisect_left(self.lower, (price, -math.inf))
+        crossed += self.lower[k:]
+        del self.lower[k:]
+        return crossed
+
+    @staticmethod
+    def discard(levels: List[Trigger], trigger: Trigger):
+        i = bisect.bisect_left(levels, trigger)
+        if i < len(levels) and levels[i] is trigger:
+            del levels[i]
+
+    def __len__(self):
+        return len(self.upper) + len(self.lower)
+
+class ExitMonitor:
+    """손절/익절 감시기 - 가격 이벤트마다 교차한 레벨만 처리
+
+    포지션은 (손절, 익절) 두 트리거로 색인되고, 한쪽이 발동하면 다른 쪽은
+    제거된다. 청산 주문은 워커 풀에서 RealBinanceService로 내고, 체결되면
+    포지션 장부를 통해 매매일지에 기록한다.
+    """
+
+    def __init__(self, book: PositionBook = None, max_workers: int = 4):
+        self.book = book or position_book
+        self._symbols: Dict[str, _SymbolTriggers] = {}
+        self._tracked: Dict[Tuple[int, str], Dict] = {}
+        self._seq = itertools.count()
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="exit-monitor")
+
+        # 통계
+        self.ticks = 0
+        self.triggered = 0
+        self.closed = 0
+        self.errors = 0
+
+    def track(self, position: Position, binance_service) -> bool:
+        """포지션 손절/익절 등록 (레벨이 없으면 무시)"""
+        if position.stop_loss is None or position.take_profit is None:
+            return False
+        entry, stop, take = position.entry_price, position.stop_loss, position.take_profit
+        if position.side == "SELL" and stop < entry:
+            # 전략은 롱 기준 레벨을 주므로 숏은 진입가 기준으로 뒤집는다
+            stop, take = 2 * entry - stop, 2 * entry - take
+        key = (position.user_id, position.symbol)
+
+        with self._lock:
+            self._untrack(key)
+            triggers = self._symbols.setdefault(position.symbol, _SymbolTriggers())
+            stop_trigger = (stop, next(self._seq), key, "stop_loss")
+            take_trigger = (take, next(self._seq), key, "take_profit")
+            is_long = position.side == "BUY"
+            placed = [triggers.add(stop_trigger, upper=not is_long), triggers.add(take_trigger, upper=is_long)]
+            self._tracked[key] = {"position": position, "service": binance_service, "triggers": placed}
+        return True
+
+    def untrack(self, user_id: int, symbol: str):
+        with self._lock:
+            self._untrack((user_id, symbol.upper()))
+
+    def _untrack(self, key: Tuple[int, str]):
+        tracked = self._tracked.pop(key, None)
+        if tracked is None:
+            return
+        for levels, trigger in tracked["triggers"]:
+            _SymbolTriggers.discard(levels, trigger)
+
+    def on_price(self, symbol: str, price: float):
+        """가격 이벤트 처리 (웹소켓 리스너/스케줄러에서 호출)"""
+        triggers = self._symbols.get(symbol)
+        if not triggers:
+            return
+        with self._lock:
+            self.ticks += 1
+            crossed = triggers.pop_crossed(price)
+            fired = []
+            for level, _, key, reason in crossed:
+                tracked = self._tracked.get(key)
+                if tracked is None:
+                    continue
+                self._untrack(key)
+                # 다른 경로로 이미 청산/교체된 포지션은 건너뜀
+                if self.book.get(*key) is not tracked["position"]:
+                    continue
+                fired.append((tracked, level, reason))
+        for tracked, level, reason in fired:
+            self.triggered += 1
+            self._executor.submit(self._close, tracked, level, reason)
+
+    def _close(self, tracked: Dict, level: float, reason: str):
+        """청산 주문 (reduceOnly 시장가) 후 장부/일지 반영"""
+        position: Position = tracked["position"]
+        side = "SELL" if position.side == "BUY" else "BUY"
+        try:
+            result = tracked["service"].place_real_order(
+                symbol=position.symbol, side=side, quantity=position.quantity, reduce_only=True,
+                client_order_id=make_client_order_id(position.user_id, position.symbol, "close",
+                                                     position.opened_at, position.quantity)
+            )
+        except Exception as e:
+            result = {"status": "error", "message": str(e)}
+        if result.get("status") != "success":
+            # 실패 시 다시 감시 - 다음 가격 이벤트에서 재시도
+            self.errors += 1
+            print(f"❌ 청산 주문 실패 ({position.symbol} {reason}): {result.get('message')}")
+            if self.book.get(position.user_id, position.symbol) is position:
+                self.track(position, tracked["service"])
+            return
+        exit_price = float(result["order"].get("avgPrice") or 0) or level
+        self.book.close(position.user_id, position.symbol, exit_price, reason)
+        self.closed += 1
+        print(f"✅ {reason} 청산: {position.symbol} @ {exit_price}")
+
+    def shutdown(self):
+        self._executor.shutdown(wait=True)
+
+    def stats(self) -> Dict:
+        """감시기 통계"""
+        with self._lock:
+            return {
+                "tracked_positions": len(self._tracked),
+                "levels": sum(len(t) for t in self._symbols.values()),
+                "ticks": self.ticks,
+                "triggered": self.triggered,
+                "closed": self.closed,
+                "errors": self.errors
+            }
+
+# 프로세스 전역 감시기
+exit_monitor = ExitMonitor()
+
+# 모듈 테스트: 포지션 수와 무관한 틱 비용 확인
+if __name__ == "__main__":
+    import random
+    import time
+
+    class _Journal:
+        def record_close(self, *args, **kwargs):
+            pass
+
+    class _Service:
+        def place_real_order(self, symbol, side, quantity, reduce_only=False, client_order_id=None):
+            return {"status": "success", "order": {"avgPrice": "0"}}
+
+    for count in (1_000, 100_000):
+        book = PositionBook(journal=_Journal())
+        monitor = ExitMonitor(book)
+        service = _Service()
+        for user_id in range(count):
+            price = 100 * random.uniform(0.9, 1.1)
+            position = book.on_fill(user_id, "BTCUSDT", random.choice(["BUY", "SELL"]), 1.0, price,
+                                    user_id, price * 0.98, price * 1.02)
+            monitor.track(position, service)
+        started = time.perf_counter()
+        ticks = 100_000
+        for i in range(ticks):
+            monitor.on_price("BTCUSDT", 100 + math.sin(i / 5000) * 15)
+        per_tick = (time.perf_counter() - started) / ticks * 1e6
+        monitor.shutdown()
+        print(f"{count:>7} positions: {per_tick:.2f}µs/tick, triggered={monitor.triggered}, "
+              f"closed={monitor.closed}, open={book.stats()['open_positions']}")
@@ -0,0 +1,385 @@
+import math
+import threading
+from collections import deque
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+# 지표 스펙 (튜플)
+#   ("sma", window)                    종가 단순이동평균 (현재 봉 포함)
+#   ("rsi", window)                    Wilder RSI (ta.momentum.rsi 와 동일)
+#   ("rsi_sma", rsi_window, window)    RSI 이동평균
+#   ("high_max_prev", window)          직전 봉까지 window개 고가 최대값 (저항선)
+#   ("low_min_prev", window)           직전 봉까지 window개 저가 최소값 (지지선)
+Spec = Tuple
+
+NAN = float("nan")
+
+# ---------------------------------------------------------------------------
+# 배치 모드 (히스토리 전체 NumPy 배열 -> 봉별 지표 배열, 부족 구간은 NaN)
+# ---------------------------------------------------------------------------
+
+def batch_sma(values: np.ndarray, window: int) -> np.ndarray:
+    """단순이동평균"""
+    out = np.full(len(values), np.nan)
+    if len(values) >= window:
+        out[window - 1:] = sliding_window_view(values, window).mean(axis=1)
+    return out
+
+def batch_rsi(close: np.ndarray, window: int) -> np.ndarray:
+    """Wilder RSI - ta.momentum.rsi(fillna=False) 와 같은 결과"""
+    n = len(close)
+    out = np.full(n, np.nan)
+    if n == 0:
+        return out
+    diff = np.diff(close, prepend=close[0])
+    up = np.where(diff > 0, diff, 0.0).tolist()
+    down = np.where(diff < 0, -diff, 0.0).tolist()
+    alpha = 1.0 / window
+    avg_up, avg_down = up[0], down[0]
+    rsi = [NAN] * n
+    for i in range(n):
+        if i:
+            avg_up += alpha * (up[i] - avg_up)
+            avg_down += alpha * (down[i] - avg_down)
+        if i >= window - 1:
+            rsi[i] = 100.0 if avg_down == 0 else 100.0 - 100.0 / (1.0 + avg_up / avg_down)
+    out[:] = rsi
+    return out
+
+def batch_rolling_max_prev(values: np.ndarray, window: int) -> np.ndarray:
+    """직전 봉까지 window개 최대값"""
+    out = np.full(len(values), np.nan)
+    if len(values) > window:
+        out[window:] = sliding_window_view(values, window).max(axis=1)[:-1]
+    return out
+
+def batch_rolling_min_prev(values: np.ndarray, window: int) -> np.ndarray:
+    """직전 봉까지 window개 최소값"""
+    out = np.full(len(values), np.nan)
+    if len(values) > window:
+        out[window:] = sliding_window_view(values, window).min(axis=1)[:-1]
+    return out
+
+def batch_indicator(spec: Spec, high: np.ndarray, low: np.ndarray, close: np.ndarray,
+                    cache: Optional[Dict] = None) -> np.ndarray:
+    """스펙 하나를 히스토리 전체에 대해 계산 (cache가 있으면 재사용)"""
+    if cache is not None and spec in cache:
+        return cache[spec]
+    kind = spec[0]
+    if kind == "sma":
+        result = batch_sma(close, spec[1])
+    elif kind == "rsi":
+        result = batch_rsi(close, spec[1])
+    elif kind == "rsi_sma":
+        result = batch_sma(batch_indicator(("rsi", spec[1]), high, low, close, cache), spec[2])
+    elif kind == "high_max_prev":
+        result = batch_rolling_max_prev(high, spec[1])
+    elif kind == "low_min_prev":
+        result = batch_rolling_min_prev(low, spec[1])
+    else:
+        raise ValueError(f"Unknown indicator spec: {spec}")
+    if cache is not None:
+        cache[spec] = result
+    return result
+
+def candles_to_arrays(data: Sequence[Dict]) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """analyze_with_strategy 입력(dict 목록) -> (high, low, close) 배열"""
+    n = len(data)
+    high = np.fromiter((float(c["high"]) for c in data), dtype=np.float64, count=n)
+    low = np.fromiter((float(c["low"]) for c in data), dtype=np.float64, count=n)
+    close = np.fromiter((float(c["close"]) for c in data), dtype=np.float64, count=n)
+    return high, low, close
+
+def latest_indicator(spec: Spec, high: np.ndarray, low: np.ndarray, close: np.ndarray,
+                     cache: Optional[Dict] = None) -> float:
+    """스펙 하나의 마지막 봉 값 - 필요한 꼬리 구간만 계산 (RSI는 순차라 전체 배열을 cache에 보관)"""
+    kind, n = spec[0], len(close)
+    if kind == "sma":
+        return float(close[-spec[1]:].mean()) if n >= spec[1] else NAN
+    if kind == "rsi_sma":
+        rsi = batch_indicator(("rsi", spec[1]), high, low, close, cache)
+        return float(rsi[-spec[2]:].mean()) if n >= spec[2] else NAN
+    if kind == "high_max_prev":
+        return float(high[-spec[1] - 1:-1].max()) if n > spec[1] else NAN
+    if kind == "low_min_prev":
+        return float(low[-spec[1] - 1:-1].min()) if n > spec[1] else NAN
+    return float(batch_indicator(spec, high, low, close, cache)[-1])
+
+def latest_values(specs: Iterable[Spec], high: np.ndarray, low: np.ndarray, close: np.ndarray) -> Dict:
+    """마지막 봉 기준 지표 스냅샷 (같은 호출 안에서 RSI 등 중간 결과 공유)"""
+    cache: Dict = {}
+    snapshot = {"close": float(close[-1])}
+    for spec in specs:
+        snapshot[spec] = latest_indicator(spec, high, low, close, cache)
+    return snapshot
+
+# ---------------------------------------------------------------------------
+# 증분 모드 (마감 봉마다 O(1) 갱신, 진행 중 봉은 커밋 없이 미리보기)
+# ---------------------------------------------------------------------------
+
+class RollingMean:
+    """이동평균 - 누적합 유지 (NaN 포함 구간은 NaN, 주기적 재합산으로 오차 누적 방지)"""
+
+    def __init__(self, window: int):
+        self.window = window
+        self.values = deque(maxlen=window)
+        self.total = 0.0
+        self.nans = 0
+        self._updates = 0
+
+    def push(self, x: float):
+        if len(self.values) == self.window:
+            oldest = self.values[0]
+            if math.isnan(oldest):
+                self.nans -= 1
+            else:
+                self.total -= oldest
+        self.values.append(x)
+        if math.isnan(x):
+            self.nans += 1
+        else:
+            self.total += x
+        self._updates += 1
+        if self._updates % 4096 == 0:
+            self.total = math.fsum(v for v in self.values if not math.isnan(v))
+
+    def peek(self, x: float) -> float:
+        """x를 다음 값으로 넣었을 때의 평균 (커밋하지 않음)"""
+        if len(self.values) < self.window - 1 or math.isnan(x):
+            return NAN
+        total, nans = self.total + x, self.nans
+        if len(self.values) == self.window:
+            oldest = self.values[0]
+            if math.isnan(oldest):
+                nans -= 1
+            else:
+                total -= oldest
+        if nans:
+            return NAN
+        return total / self.window
+
+class WilderRSI:
+    """Wilder RSI 상태 (ta.momentum.rsi 와 같은 초기화)"""
+
+    def __init__(self, window: int):
+        self.window = window
+        self.alpha = 1.0 / window
+        self.count = 0
+        self.prev_close = NAN
+        self.avg_up = 0.0
+        self.avg_down = 0.0
+
+    def _step(self, close: float) -> Tuple[float, float]:
+        if self.count == 0:
+            return 0.0, 0.0
+        diff = close - self.prev_close
+        up, down = (diff, 0.0) if diff > 0 else (0.0, -diff if diff < 0 else 0.0)
+        return (self.avg_up + self.alpha * (up - self.avg_up),
+                self.avg_down + self.alpha * (down - self.avg_down))
+
+    def _value(self, count: int, avg_up: float, avg_down: float) -> float:
+        if count < self.window:
+            return NAN
+        return 100.0 if avg_down == 0 else 100.0 - 100.0 / (1.0 + avg_up / avg_down)
+
+    def push(self, close: float) -> float:
+        self.avg_up, self.avg_down = self._step(close)
+        self.prev_close = close
+        self.count += 1
+        return self._value(self.count, self.avg_up, self.avg_down)
+
+    def peek(self, close: float) -> float:
+        avg_up, avg_down = self._step(close)
+        return self._value(self.count + 1, avg_up, avg_down)
+
+class RollingExtreme:
+    """단조 덱 기반 이동 최대/최소 (직전 window개 마감 봉 기준)"""
+
+    def __init__(self, window: int, maximum: bool = True):
+        self.window = window
+        self.maximum = maximum
+        self.items = deque()  # (index, value) - 값이 단조
+        self.index = 0
+
+    def push(self, x: float):
+        items = self.items
+        if self.maximum:
+            while items and items[-1][1] <= x:
+                items.pop()
+        else:
+            while items and items[-1][1] >= x:
+                items.pop()
+        items.append((self.index, x))
+        self.index += 1
+        if items[0][0] <= self.index - 1 - self.window:
+            items.popleft()
+
+    def value(self) -> float:
+        if self.index < self.window:
+            return NAN
+        return self.items[0][1]
+
+class IndicatorState:
+    """심볼/인터벌 하나의 증분 지표 상태"""
+
+    def __init__(self, specs: Iterable[Spec]):
+        self.specs = list(dict.fromkeys(specs))
+        self.sma: Dict[int, RollingMean] = {}
+        self.rsi: Dict[int, WilderRSI] = {}
+        self.rsi_history: Dict[int, deque] = {}
+        self.rsi_sma: Dict[Tuple[int, int], RollingMean] = {}
+        self.high_max: Dict[int, RollingExtreme] = {}
+        self.low_min: Dict[int, RollingExtreme] = {}
+        for spec in self.specs:
+            self._register(spec)
+        self.last_open_time: Optional[int] = None
+        self.bars = 0
+
+    def _register(self, spec: Spec):
+        kind = spec[0]
+        if kind == "sma":
+            self.sma.setdefault(spec[1], RollingMean(spec[1]))
+        elif kind == "rsi":
+            self.rsi.setdefault(spec[1], WilderRSI(spec[1]))
+        elif kind == "rsi_sma":
+            self._register(("rsi", spec[1]))
+            self.rsi_sma.setdefault((spec[1], spec[2]), RollingMean(spec[2]))
+        elif kind == "high_max_prev":
+            self.high_max.setdefault(spec[1], RollingExtreme(spec[1], maximum=True))
+        elif kind == "low_min_prev":
+            self.low_min.setdefault(spec[1], RollingExtreme(spec[1], maximum=False))
+        else:
+            raise ValueError(f"Unknown indicator spec: {spec}")
+
+    def update(self, high: float, low: float, close: float, open_time: Optional[int] = None):
+        """마감 봉 커밋 - O(지표 수)"""
+        for mean in self.sma.values():
+            mean.push(close)
+        rsi_now = {w: rsi.push(close) for w, rsi in self.rsi.items()}
+        for (w, _), mean in self.rsi_sma.items():
+            mean.push(rsi_now[w])
+        for extreme in self.high_max.values():
+            extreme.push(high)
+        for extreme in self.low_min.values():
+            extreme.push(low)
+        self.last_open_time = open_time
+        self.bars += 1
+
+    def snapshot(self, high: float, low: float, close: float) -> Dict:
+        """진행 중(또는 마지막) 봉을 포함한 지표 값 - 상태는 바꾸지 않음"""
+        snapshot = {"close": close}
+        rsi_now = {w: rsi.peek(close) for w, rsi in self.rsi.items()}
+        for spec in self.specs:
+            kind = spec[0]
+            if kind == "sma":
+                snapshot[spec] = self.sma[spec[1]].peek(close)
+            elif kind == "rsi":
+                snapshot[spec] = rsi_now[spec[1]]
+            elif kind == "rsi_sma":
+                snapshot[spec] = self.rsi_sma[(spec[1], spec[2])].peek(rsi_now[spec[1]])
+            elif kind == "high_max_prev":
+                snapshot[spec] = self.high_max[spec[1]].value()
+            elif kind == "low_min_prev":
+                snapshot[spec] = self.low_min[spec[1]].value()
+        return snapshot
+
+class IndicatorEngine:
+    """(심볼, 인터벌)별 증분 지표 상태 관리
+
+    on_candles()에 kline 윈도우(마지막 원소는 진행 중 봉)를 넘기면 새로 마감된
+    봉만 커밋하고 최신 스냅샷을 돌려준다. 윈도우가 마지막 커밋 이후를 덮지
+    못하면(공백) 윈도우로 상태를 다시 만든다.
+    """
+
+    def __init__(self):
+        self._states: Dict[Tuple[str, str], IndicatorState] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _can_continue(state: IndicatorState, specs: List[Spec], closed: Sequence[Dict]) -> bool:
+        if any(spec not in state.specs for spec in specs) or state.last_open_time is None:
+            return False
+        # 윈도우 안에 마지막 커밋 봉이 있어야 공백 없이 이어진다
+        return not closed or closed[0]["timestamp"] <= state.last_open_time
+
+    def on_candles(self, symbol: str, interval: str, data: Sequence[Dict], specs: Iterable[Spec]) -> Dict:
+        """새 마감 봉만 커밋하고 진행 중 봉 기준 스냅샷 반환"""
+        specs = list(specs)
+        key = (symbol.upper(), interval)
+        closed = data[:-1]
+        with self._lock:
+            state = self._states.get(key)
+            if state is not None and not self._can_continue(state, specs, closed):
+                specs = state.specs + specs
+                state = None
+            if state is None:
+                state = self._states[key] = IndicatorState(specs)
+                new_bars = closed
+            else:
+                new_bars = [c for c in closed if c["timestamp"] > state.last_open_time]
+            for c in new_bars:
+                state.update(float(c["high"]), float(c["low"]), float(c["close"]), c["timestamp"])
+            current = data[-1]
+            return state.snapshot(float(current["high"]), float(current["low"]), float(current["close"]))
+
+    def reset(self, symbol: str = None, interval: str = None):
+        with self._lock:
+            if symbol is None:
+                self._states.clear()
+            else:
+                self._states.pop((symbol.upper(), interval), None)
+
+# 프로세스 공유 엔진
+indicator_engine = IndicatorEngine()
+
+def _benchmark(ticks: int = 2000, window: int = 50):
+    """틱당 지연 비교 - 기존 pandas/ta 재계산 경로 vs 증분 엔진"""
+    import time
+    import pandas as pd
+    import ta
+
+    rng = np.random.default_rng(0)
+    close = 50000 + np.cumsum(rng.normal(0, 50, ticks + window))
+    high = close + rng.random(len(close)) * 30
+    low = close - rng.random(len(close)) * 30
+    candles = [{"timestamp": i, "high": h, "low": l, "close": c}
+               for i, (h, l, c) in enumerate(zip(high.tolist(), low.tolist(), close.tolist()))]
+    specs = [("sma", 20), ("sma", 50), ("rsi", 14), ("rsi_sma", 14, 3),
+             ("high_max_prev", 20), ("low_min_prev", 20)]
+
+    def pandas_tick(data):
+        df = pd.DataFrame(data)
+        sma_20 = ta.trend.sma_indicator(df['close'], window=20).iloc[-1]
+        sma_50 = ta.trend.sma_indicator(df['close'], window=50).iloc[-1]
+        rsi = ta.momentum.rsi(df['close'], window=14)
+        rsi_signal = rsi.rolling(window=3).mean().iloc[-1]
+        resistance = df['high'].rolling(window=20).max().iloc[-2]
+        support = df['low'].rolling(window=20).min().iloc[-2]
+        return sma_20, sma_50, rsi.iloc[-1], rsi_signal, resistance, support
+
+    start = time.perf_counter()
+    for i in range(ticks):
+        pandas_tick(candles[i:i + window + 1])
+    pandas_us = (time.perf_counter() - start) / ticks * 1e6
+
+    start = time.perf_counter()
+    for i in range(ticks):
+        high_a, low_a, close_a = candles_to_arrays(candles[i:i + window + 1])
+        latest_values(specs, high_a, low_a, close_a)
+    batch_us = (time.perf_counter() - start) / ticks * 1e6
+
+    engine = IndicatorEngine()
+    start = time.perf_counter()
+    for i in range(ticks):
+        engine.on_candles("BTCUSDT", "1m", candles[i:i + window + 1], specs)
+    engine_us = (time.perf_counter() - start) / ticks * 1e6
+
+    print(f"pandas/ta recompute:   {pandas_us:9.1f} us/tick")
+    print(f"numpy batch (latest):  {batch_us:9.1f} us/tick")
+    print(f"incremental engine:    {engine_us:9.1f} us/tick")
+
+# 모듈 테스트 (벤치마크)
+if __name__ == "__main__":
+    _benchmark()
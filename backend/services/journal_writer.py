@@ -0,0 +1,239 @@
+import atexit
+import queue
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Callable, Dict, List, Optional
+
+# 큐 항목 종류
+_INSERT = "insert"
+_CLOSE = "close"
+_FLUSH = "flush"
+_STOP = "stop"
+
+def _now() -> datetime:
+    return datetime.now(timezone.utc)
+
+class JournalWriter:
+    """매매일지 백그라운드 기록기
+
+    봇 루프는 큐에 넣기만 하고 (블로킹 없음), 전용 스레드가 모인 이벤트를
+    batch_size개 또는 flush_interval초 단위로 묶어 한 트랜잭션으로 커밋한다.
+    신호/주문은 TradingJournal 행 추가, 청산은 order_id로 주문 행을 갱신한다.
+    """
+
+    def __init__(self, session_factory: Callable = None, batch_size: int = 200,
+                 flush_interval: float = 0.5, max_queue: int = 100_000, max_retries: int = 3):
+        self._session_factory = session_factory
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_retries = max_retries
+        self._queue: "queue.Queue" = queue.Queue(maxsize=max_queue)
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        atexit.register(self.stop)  # 재시작해도 한 번만 (시작 전이면 stop은 아무것도 안 함)
+
+        # 통계
+        self.enqueued = 0
+        self.dropped = 0
+        self.rows_written = 0
+        self.rows_closed = 0
+        self.batches = 0
+        self.errors = 0
+        self.last_commit_ms = 0.0
+
+    # ---- 기록 API (봇 루프에서 호출, 블로킹 없음) ----
+
+    def record_signal(self, user_id: int, symbol: str, analysis: Dict, strategy: str = None):
+        """전략 신호 기록"""
+        self._put(_INSERT, {
+            "user_id": user_id or 0,
+            "event_type": "signal",
+            "symbol": symbol,
+            "action": analysis.get("action", "HOLD"),
+            "quantity": 0.0,
+            "entry_price": analysis.get("entry_price") or 0.0,
+            "stop_loss": analysis.get("stop_loss"),
+            "take_profit": analysis.get("take_profit"),
+            "opened_at": _now(),
+            "is_open": False,
+            "ai_confidence": analysis.get("confidence"),
+            "ai_reason": analysis.get("reason"),
+            "strategy_used": strategy or analysis.get("strategy")
+        })
+
+    def record_order(self, user_id: int, symbol: str, side: str, quantity: float, entry_price: float,
+                     order_id, analysis: Dict = None, strategy: str = None):
+        """체결 주문 기록 (포지션 오픈)"""
+        analysis = analysis or {}
+        self._put(_INSERT, {
+            "user_id": user_id or 0,
+            "event_type": "order",
+            "order_id": str(order_id) if order_id is not None else None,
+            "symbol": symbol,
+            "action": side,
+            "quantity": quantity,
+            "entry_price": entry_price or 0.0,
+            "stop_loss": analysis.get("stop_loss"),
+            "take_profit": analysis.get("take_profit"),
+            "opened_at": _now(),
+            "is_open": True,
+            "ai_confidence": analysis.get("confidence"),
+            "ai_reason": analysis.get("reason"),
+            "strategy_used": strategy or analysis.get("strategy")
+        })
+
+    def record_close(self, order_id, exit_price: float, exit_reason: str, pnl: float = None,
+                     pnl_percentage: float = None, notes: str = None):
+        """포지션 청산 기록 - order_id의 주문 행 갱신"""
+        self._put(_CLOSE, {
+            "order_id": str(order_id),
+            "exit_price": exit_price,
+            "exit_reason": exit_reason,
+            "pnl": pnl,
+            "pnl_percentage": pnl_percentage,
+            "notes": notes,
+            "closed_at": _now(),
+            "is_open": False
+        })
+
+    def _put(self, kind: str, row: Dict):
+        self._ensure_started()
+        try:
+            self._queue.put_nowait((kind, row))
+            self.enqueued += 1
+        except queue.Full:
+            self.dropped += 1
+
+    # ---- 수명 관리 ----
+
+    def _ensure_started(self):
+        if self._thread is not None and self._thread.is_alive():
+            return
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._thread = threading.Thread(target=self._run, daemon=True, name="journal-writer")
+            self._thread.start()
+
+    def flush(self, timeout: float = 10.0) -> bool:
+        """지금까지 넣은 이벤트가 커밋될 때까지 대기"""
+        if self._thread is None or not self._thread.is_alive():
+            return self._queue.empty()
+        done = threading.Event()
+        self._queue.put((_FLUSH, done))
+        return done.wait(timeout)
+
+    def stop(self, timeout: float = 10.0):
+        """남은 이벤트를 모두 커밋하고 스레드 종료"""
+        thread = self._thread
+        if thread is None or not thread.is_alive():
+            return
+        self._queue.put((_STOP, None))
+        thread.join(timeout)
+        self._thread = None
+
+    # ---- 기록 스레드 ----
+
+    def _session(self):
+        if self._session_factory is None:
+            from database.database import SessionLocal
+            self._session_factory = SessionLocal
+        return self._session_factory()
+
+    def _drain(self, items: List, limit: Optional[int] = None) -> List:
+        """대기 중인 항목을 limit개까지 모음 (None이면 전부)"""
+        while limit is None or len(items) < limit:
+            try:
+                items.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return items
+
+    def _collect(self, first) -> List:
+        """첫 항목부터 flush_interval 동안 batch_size개까지 모음 (flush/stop 요청이 오면 바로)"""
+        items = [first]
+        deadline = time.monotonic() + self.flush_interval
+        while len(items) < self.batch_size and items[-1][0] not in (_FLUSH, _STOP):
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                items.append(self._queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return items
+
+    def _run(self):
+        stopping = False
+        while not stopping:
+            try:
+                first = self._queue.get(timeout=self.flush_interval)
+            except queue.Empty:
+                continue
+
+            items = self._collect(first)
+            if any(kind == _STOP for kind, _ in items):
+                # 종료 전 남은 항목까지 모두 커밋
+                stopping = True
+                self._drain(items)
+
+            inserts = [payload for kind, payload in items if kind == _INSERT]
+            closes = [payload for kind, payload in items if kind == _CLOSE]
+            if inserts or closes:
+                self._write(inserts, closes)
+            for kind, payload in items:
+                if kind == _FLUSH:
+                    payload.set()
+
+    def _write(self, inserts: List[Dict], closes: List[Dict]):
+        """한 트랜잭션으로 일괄 기록 (실패 시 재시도 후 폐기)"""
+        from sqlalchemy import insert, update
+        from models.trading_journal import TradingJournal
+
+        for attempt in range(1, self.max_retries + 1):
+            started = time.perf_counter()
+            session = self._session()
+            try:
+                if inserts:
+                    session.execute(insert(TradingJournal), inserts)
+                for row in closes:
+                    values = {k: v for k, v in row.items() if k != "order_id" and v is not None}
+                    session.execute(
+                        update(TradingJournal)
+                        .where(TradingJournal.order_id == row["order_id"],
+                               TradingJournal.event_type == "order",
+                               TradingJournal.is_open == True)
+                        .values(**values)
+                    )
+                session.commit()
+                self.rows_written += len(inserts)
+                self.rows_closed += len(closes)
+                self.batches += 1
+                self.last_commit_ms = (time.perf_counter() - started) * 1000
+                return
+            except Exception as e:
+                session.rollback()
+                self.errors += 1
+                print(f"❌ 매매일지 기록 실패 ({attempt}/{self.max_retries}): {e}")
+                time.sleep(min(1.0, 0.1 * attempt))
+            finally:
+                session.close()
+        self.dropped += len(inserts) + len(closes)
+
+    def stats(self) -> Dict:
+        """기록기 통계"""
+        return {
+            "running": self._thread is not None and self._thread.is_alive(),
+            "queued": self._queue.qsize(),
+            "enqueued": self.enqueued,
+            "rows_written": self.rows_written,
+            "rows_closed": self.rows_closed,
+            "batches": self.batches,
+            "errors": self.errors,
+            "dropped": self.dropped,
+            "last_commit_ms": round(self.last_commit_ms, 3)
+        }
+
+# 프로세스 전역 기록기
+journal_writer = JournalWriter()
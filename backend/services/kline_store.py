@@ -0,0 +1,142 @@
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+# 인터벌 길이 (ms)
+INTERVAL_MS = {
+    "1m": 60_000, "3m": 180_000, "5m": 300_000, "15m": 900_000, "30m": 1_800_000,
+    "1h": 3_600_000, "2h": 7_200_000, "4h": 14_400_000, "6h": 21_600_000,
+    "8h": 28_800_000, "12h": 43_200_000, "1d": 86_400_000, "3d": 259_200_000, "1w": 604_800_000
+}
+
+# fetch(symbol, interval, limit) -> 바이낸스 kline 원본 행 목록
+KlineFetcher = Callable[[str, str, int], List[list]]
+
+class KlineBuffer:
+    """심볼/인터벌별 kline 링 버퍼 (NumPy 배열)
+
+    open_time은 int64, OHLCV는 (capacity, 5) float64 배열에 보관한다.
+    마지막 캔들과 open_time이 같으면 갱신, 더 크면 추가한다.
+    """
+
+    def __init__(self, capacity: int = 500):
+        self.capacity = capacity
+        self.open_time = np.zeros(capacity, dtype=np.int64)
+        self.ohlcv = np.zeros((capacity, 5), dtype=np.float64)
+        self.start = 0
+        self.size = 0
+        self.exhausted = False  # 백필 때 거래소 이력이 capacity보다 짧았음 (더 받아도 늘지 않음)
+
+    @property
+    def last_open_time(self) -> Optional[int]:
+        if self.size == 0:
+            return None
+        return int(self.open_time[(self.start + self.size - 1) % self.capacity])
+
+    def upsert(self, open_time: int, o: float, h: float, l: float, c: float, v: float):
+        """캔들 추가 또는 마지막 캔들 갱신 (과거 캔들은 무시)"""
+        last = self.last_open_time
+        if last is not None and open_time < last:
+            return
+        if last is not None and open_time == last:
+            pos = (self.start + self.size - 1) % self.capacity
+        elif self.size < self.capacity:
+            pos = (self.start + self.size) % self.capacity
+            self.size += 1
+        else:
+            pos = self.start
+            self.start = (self.start + 1) % self.capacity
+        self.open_time[pos] = open_time
+        self.ohlcv[pos] = (o, h, l, c, v)
+
+    def load_rows(self, rows: List[list]):
+        """바이낸스 kline 원본 행 반영"""
+        for row in rows:
+            self.upsert(int(row[0]), float(row[1]), float(row[2]), float(row[3]), float(row[4]), float(row[5]))
+
+    def window(self, limit: int) -> Tuple[np.ndarray, np.ndarray]:
+        """최근 limit개 (시간순) - (open_time, ohlcv) 복사본"""
+        n = min(limit, self.size)
+        idx = (self.start + np.arange(self.size - n, self.size)) % self.capacity
+        return self.open_time[idx], self.ohlcv[idx]
+
+class KlineStore:
+    """kline 저장소 - 최초 1회 백필 후 최신 캔들만 증분 갱신"""
+
+    def __init__(self, capacity: int = 500):
+        self.capacity = capacity
+        self._buffers: Dict[Tuple[str, str], KlineBuffer] = {}
+        self._locks: Dict[Tuple[str, str], threading.Lock] = {}
+        self._guard = threading.Lock()
+
+        # 통계
+        self.backfills = 0
+        self.incremental_updates = 0
+        self.rows_fetched = 0
+
+    def _lock_for(self, key: Tuple[str, str]) -> threading.Lock:
+        with self._guard:
+            lock = self._locks.get(key)
+            if lock is None:
+                lock = self._locks[key] = threading.Lock()
+            return lock
+
+    def _refresh(self, key: Tuple[str, str], limit: int, fetch: KlineFetcher) -> KlineBuffer:
+        symbol, interval = key
+        buffer = self._buffers.get(key)
+        if buffer is None or (buffer.size < limit and not (buffer.exhausted and buffer.capacity >= limit)):
+            # 백필
+            buffer = KlineBuffer(max(self.capacity, limit))
+            rows = fetch(symbol, interval, buffer.capacity)
+            buffer.load_rows(rows)
+            buffer.exhausted = len(rows) < buffer.capacity
+            self._buffers[key] = buffer
+            self.backfills += 1
+        else:
+            # 증분 - 마지막 캔들 이후 경과한 캔들 수 + 현재 캔들만 조회
+            interval_ms = INTERVAL_MS.get(interval, 60_000)
+            elapsed = int(time.time() * 1000) - buffer.last_open_time
+            count = min(buffer.capacity, max(2, elapsed // interval_ms + 2))
+            rows = fetch(symbol, interval, count)
+            buffer.load_rows(rows)
+            self.incremental_updates += 1
+        self.rows_fetched += len(rows)
+        return buffer
+
+    def get_arrays(self, symbol: str, interval: str, limit: int, fetch: KlineFetcher) -> Tuple[np.ndarray, np.ndarray]:
+        """최근 limit개 캔들 배열 (open_time, ohlcv)"""
+        key = (symbol.upper(), interval)
+        with self._lock_for(key):
+            buffer = self._refresh(key, limit, fetch)
+            return buffer.window(limit)
+
+    def get_window(self, symbol: str, interval: str, limit: int, fetch: KlineFetcher) -> List[Dict]:
+        """최근 limit개 캔들 - AdvancedAITrading.analyze_with_strategy 입력 형식"""
+        open_time, ohlcv = self.get_arrays(symbol, interval, limit, fetch)
+        return [
+            {"timestamp": int(t), "open": o, "high": h, "low": l, "close": c, "volume": v}
+            for t, (o, h, l, c, v) in zip(open_time.tolist(), ohlcv.tolist())
+        ]
+
+    def apply_stream_kline(self, symbol: str, interval: str, kline: Dict):
+        """웹소켓 kline 이벤트(k) 반영 - 백필된 버퍼만 갱신"""
+        key = (symbol.upper(), interval)
+        with self._lock_for(key):
+            buffer = self._buffers.get(key)
+            if buffer is not None:
+                buffer.upsert(int(kline["t"]), float(kline["o"]), float(kline["h"]),
+                              float(kline["l"]), float(kline["c"]), float(kline["v"]))
+
+    def stats(self) -> Dict:
+        """저장소 통계"""
+        return {
+            "series": len(self._buffers),
+            "backfills": self.backfills,
+            "incremental_updates": self.incremental_updates,
+            "rows_fetched": self.rows_fetched
+        }
+
+# 선물 kline 공유 저장소 (공개 데이터이므로 사용자 간 공유)
+futures_kline_store = KlineStore()
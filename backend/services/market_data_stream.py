@@ -0,0 +1,239 @@
+import asyncio
+import json
+import os
+import random
+import time
+from typing import Callable, Dict, List, Optional, Union
+
+import websockets
+
+STREAM_BASE_URL = "wss://stream.binance.com:9443"
+
+class MarketDataStream:
+    """바이낸스 combined stream 수신기
+
+    하나의 웹소켓으로 전체 miniTicker(!miniTicker@arr)와 구독 심볼의
+    ticker/bookTicker/kline을 받아 심볼별 최신 상태 테이블을 유지한다.
+    끊기면 지수 백오프(지터 포함)로 재연결한다.
+    """
+
+    def __init__(self, symbols: List[str] = None, kline_interval: str = "1m",
+                 base_url: str = STREAM_BASE_URL, all_market: bool = True,
+                 stale_after: float = 30, min_backoff: float = 1.0, max_backoff: float = 60):
+        self.symbols = [s.lower() for s in (symbols or [])]
+        self.kline_interval = kline_interval
+        self.base_url = base_url
+        self.all_market = all_market
+        self.stale_after = stale_after
+        self.min_backoff = min_backoff
+        self.max_backoff = max_backoff
+        self.backoff = min_backoff  # 다음 재연결 대기 기준값 (연결 성공 시 초기화)
+        self.state: Dict[str, Dict] = {}
+        self.listeners: List[Callable[[str, float], None]] = []
+        self._task: Optional[asyncio.Task] = None
+
+        # 통계
+        self.connected = False
+        self.messages = 0
+        self.reconnects = 0
+        self.last_message_at = 0.0
+
+    @property
+    def stream_url(self) -> str:
+        streams = ["!miniTicker@arr"] if self.all_market else []
+        for s in self.symbols:
+            streams += [f"{s}@ticker", f"{s}@bookTicker", f"{s}@kline_{self.kline_interval}"]
+        return f"{self.base_url}/stream?streams={'/'.join(streams)}"
+
+    def _entry(self, symbol: str) -> Dict:
+        entry = self.state.get(symbol)
+        if entry is None:
+            entry = self.state[symbol] = {}
+        return entry
+
+    def _apply_mini_ticker(self, data: Dict, now: float):
+        """miniTicker/24hrTicker 공통 처리 - 전체 티커는 별도로 보관"""
+        entry = self._entry(data["s"])
+        entry["ticker" if data.get("e") == "24hrTicker" else "mini_ticker"] = data
+        entry["price"] = data["c"]
+        entry["updated_at"] = now
+        if self.listeners:
+            price = float(data["c"])
+            for listener in self.listeners:
+                listener(data["s"], price)
+
+    def handle_message(self, raw: Union[str, bytes]):
+        """combined stream 프레임 처리"""
+        message = json.loads(raw)
+        data = message.get("data", message)
+        now = time.time()
+        self.messages += 1
+        self.last_message_at = now
+
+        if isinstance(data, list):  # !miniTicker@arr
+            for item in data:
+                self._apply_mini_ticker(item, now)
+            return
+
+        event = data.get("e")
+        if event in ("24hrMiniTicker", "24hrTicker"):
+            self._apply_mini_ticker(data, now)
+        elif event == "kline":
+            entry = self._entry(data["s"])
+            entry["kline"] = data["k"]
+        elif "b" in data and "a" in data and "s" in data:  # bookTicker (이벤트 타입 없음)
+            entry = self._entry(data["s"])
+            entry["book"] = data
+
+    async def run(self):
+        """수신 루프 - 재연결 포함"""
+        self.backoff = self.min_backoff
+        while True:
+            try:
+                async with websockets.connect(self.stream_url, ping_interval=20, max_size=2 ** 22) as ws:
+                    self.connected = True
+                    self.backoff = self.min_backoff
+                    print(f"✅ Market data stream connected ({len(self.symbols)} symbols)")
+                    async for raw in ws:
+                        try:
+                            self.handle_message(raw)
+                        except (ValueError, KeyError) as e:
+                            print(f"⚠️ Bad market data frame: {e}")
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f"⚠️ Market data stream error: {e}")
+            self.connected = False
+            self.reconnects += 1
+            delay = self.backoff + random.uniform(0, self.backoff / 2)
+            await asyncio.sleep(delay)
+            self.backoff = min(self.backoff * 2, self.max_backoff)
+
+    def add_listener(self, listener: Callable[[str, float], None]):
+        """가격 이벤트 리스너 등록 - listener(symbol, price), 수신 루프에서 바로 호출되므로 가볍게"""
+        self.listeners.append(listener)
+
+    def start(self):
+        """현재 이벤트 루프에서 수신 시작"""
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self.run())
+
+    async def stop(self):
+        """수신 중지"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        self.connected = False
+
+    def _fresh(self, entry: Optional[Dict]) -> bool:
+        return bool(entry) and "price" in entry and time.time() - entry["updated_at"] < self.stale_after
+
+    def _live(self) -> bool:
+        """스트림 자체가 살아 있는지 (마지막 프레임 기준)"""
+        return self.connected and time.time() - self.last_message_at < self.stale_after
+
+    def get_ticker_price(self, symbol: str = None) -> Union[Dict, List, None]:
+        """가격 조회 - 최신 상태가 없거나 오래되면 None
+
+        전체 조회는 심볼별이 아니라 스트림 생존 여부로 판단한다.
+        !miniTicker@arr는 바뀐 심볼만 보내므로 조용한 심볼도 마지막 가격이 현재가다.
+        """
+        if symbol is None:
+            if not self._live():
+                return None
+            prices = [{"symbol": s, "price": e["price"]} for s, e in self.state.items() if "price" in e]
+            return prices or None
+        symbol = symbol.upper()
+        entry = self.state.get(symbol)
+        if not self._fresh(entry):
+            return None
+        return {"symbol": symbol, "price": entry["price"]}
+
+    def get_24hr_ticker(self, symbol: str) -> Optional[Dict]:
+        """24시간 티커 - 구독 심볼은 ticker 스트림으로 REST와 같은 필드를 채운다
+
+        구독 밖 심볼은 miniTicker만 있으므로 weightedAvgPrice는 거래대금/거래량으로 계산하고
+        prevClosePrice, count, lastQty, firstId/lastId는 없다.
+        """
+        symbol = symbol.upper()
+        entry = self.state.get(symbol)
+        if not self._fresh(entry):
+            return None
+        full = entry.get("ticker")
+        if full is not None:
+            ticker = {
+                "symbol": symbol,
+                "priceChange": full["p"],
+                "priceChangePercent": full["P"],
+                "weightedAvgPrice": full["w"],
+                "prevClosePrice": full["x"],
+                "lastPrice": full["c"],
+                "lastQty": full["Q"],
+                "bidPrice": full["b"], "bidQty": full["B"],
+                "askPrice": full["a"], "askQty": full["A"],
+                "openPrice": full["o"],
+                "highPrice": full["h"],
+                "lowPrice": full["l"],
+                "volume": full["v"],
+                "quoteVolume": full["q"],
+                "openTime": full["O"],
+                "closeTime": full["C"],
+                "firstId": full["F"],
+                "lastId": full["L"],
+                "count": full["n"]
+            }
+        else:
+            mini = entry["mini_ticker"]
+            last_price, open_price = float(mini["c"]), float(mini["o"])
+            volume, quote_volume = float(mini["v"]), float(mini["q"])
+            change = last_price - open_price
+            ticker = {
+                "symbol": symbol,
+                "priceChange": f"{change:.8f}",
+                "priceChangePercent": f"{(change / open_price * 100) if open_price else 0:.3f}",
+                "weightedAvgPrice": f"{(quote_volume / volume) if volume else 0:.8f}",
+                "lastPrice": mini["c"],
+                "openPrice": mini["o"],
+                "highPrice": mini["h"],
+                "lowPrice": mini["l"],
+                "volume": mini["v"],
+                "quoteVolume": mini["q"],
+                "openTime": mini["E"] - 86400000,
+                "closeTime": mini["E"]
+            }
+        book = entry.get("book")
+        if book:
+            ticker.update({
+                "bidPrice": book["b"], "bidQty": book["B"],
+                "askPrice": book["a"], "askQty": book["A"]
+            })
+        return ticker
+
+    def get_kline(self, symbol: str) -> Optional[Dict]:
+        """최근 kline (구독 심볼만)"""
+        entry = self.state.get(symbol.upper())
+        return entry.get("kline") if entry else None
+
+    def stats(self) -> Dict:
+        """수신 통계"""
+        return {
+            "connected": self.connected,
+            "symbols": len(self.state),
+            "messages": self.messages,
+            "reconnects": self.reconnects,
+            "backoff": self.backoff,
+            "last_message_age": round(time.time() - self.last_message_at, 3) if self.last_message_at else None
+        }
+
+def create_default_stream() -> MarketDataStream:
+    """환경변수 기반 기본 스트림 구성"""
+    symbols = os.getenv("MARKET_STREAM_SYMBOLS", "BTCUSDT,ETHUSDT,BNBUSDT,ADAUSDT,DOTUSDT")
+    return MarketDataStream(
+        symbols=[s.strip() for s in symbols.split(",") if s.strip()],
+        kline_interval=os.getenv("MARKET_STREAM_KLINE_INTERVAL", "1m"),
+        base_url=os.getenv("MARKET_STREAM_URL", STREAM_BASE_URL)
+    )
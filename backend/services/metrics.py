@@ -0,0 +1,323 @@
+import bisect
+import threading
+from abc import ABC, abstractmethod
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+# 응답/업스트림 지연 기본 버킷 (초)
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+def _label_text(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    pairs = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+def _number(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+class _Metric(ABC):
+    """라벨별 자식을 가진 지표 - 하위 클래스가 자식 생성과 출력 형식을 정한다"""
+
+    kind = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._children: Dict[Tuple[str, ...], object] = {}
+        self._lock = threading.Lock()
+
+    def labels(self, *values: str):
+        """라벨 값별 자식 (처음 한 번만 락)"""
+        child = self._children.get(values)
+        if child is None:
+            with self._lock:
+                child = self._children.get(values)
+                if child is None:
+                    child = self._children[values] = self._new_child()
+        return child
+
+    @abstractmethod
+    def _new_child(self):
+        """라벨 값 조합 하나의 자식 (값/락 보관)"""
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+        for values, child in sorted(self._children.items()):
+            lines.extend(self._render_child(values, child))
+        return lines
+
+    @abstractmethod
+    def _render_child(self, values, child) -> List[str]:
+        """자식 하나의 노출 형식 행들"""
+
+class _CounterChild:
+    __slots__ = ("value", "_lock")
+
+    def __init__(self):
+        self.value = 0.0
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1.0):
+        with self._lock:
+            self.value += amount
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def _new_child(self):
+        return _CounterChild()
+
+    def inc(self, amount: float = 1.0):
+        self.labels().inc(amount)
+
+    def _render_child(self, values, child) -> List[str]:
+        return [f"{self.name}{_label_text(self.labelnames, values)} {_number(child.value)}"]
+
+class _HistogramChild:
+    __slots__ = ("bounds", "counts", "sum", "_lock")
+
+    def __init__(self, bounds: Tuple[float, ...]):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)  # 마지막 칸은 +Inf
+        self.sum = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float):
+        index = bisect.bisect_left(self.bounds, value)
+        with self._lock:
+            self.counts[index] += 1
+            self.sum += value
+
+    @contextmanager
+    def time(self):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started)
+
+class Histogram(_Metric):
+    """누적 버킷 히스토그램 (관측 시에는 해당 칸만 증가, 누적은 렌더링 때 계산)"""
+
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = LATENCY_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def _new_child(self):
+        return _HistogramChild(self.buckets)
+
+    def observe(self, value: float):
+        self.labels().observe(value)
+
+    def _render_child(self, values, child) -> List[str]:
+        with child._lock:
+            counts, total_sum = list(child.counts), child.sum
+        lines = []
+        cumulative = 0
+        for bound, count in zip(self.buckets + (float("inf"),), counts):
+            cumulative += count
+            le = 'le="' + _number(bound) + '"'
+            lines.append(f"{self.name}_bucket{_label_text(self.labelnames, values, le)} {cumulative}")
+        labels = _label_text(self.labelnames, values)
+        lines.append(f"{self.name}_sum{labels} {_number(total_sum)}")
+        lines.append(f"{self.name}_count{labels} {cumulative}")
+        return lines
+
+# 수집 시점 콜백: [(메트릭 이름, 타입, 설명, [(라벨 dict, 값), ...]), ...]
+Collector = Callable[[], Iterable[Tuple[str, str, str, List[Tuple[Dict[str, str], float]]]]]
+
+class MetricsRegistry:
+    """프로세스 메트릭 저장소
+
+    핫패스에서는 카운터/히스토그램 칸만 올리고, 캐시 통계처럼 이미 stats()로
+    집계되는 값은 스크레이프 시점에 콜렉터로 읽는다.
+    """
+
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+        self._collectors: Dict[str, Collector] = {}
+        self._lock = threading.Lock()
+
+    def _register(self, metric: _Metric) -> _Metric:
+        with self._lock:
+            existing = self._metrics.get(metric.name)
+            if existing is not None:
+                return existing
+            self._metrics[metric.name] = metric
+            return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self._register(Counter(name, documentation, labelnames))
+
+    def histogram(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                  buckets: Sequence[float] = LATENCY_BUCKETS) -> Histogram:
+        return self._register(Histogram(name, documentation, labelnames, buckets))
+
+    def register_collector(self, key: str, collector: Collector):
+        """스크레이프 시점 콜렉터 등록 (같은 key는 덮어씀)"""
+        with self._lock:
+            self._collectors[key] = collector
+
+    def render(self) -> str:
+        """Prometheus 텍스트 형식"""
+        lines: List[str] = []
+        for metric in list(self._metrics.values()):
+            lines.extend(metric.render())
+        families: Dict[str, Tuple[str, str, List]] = {}
+        for key, collector in list(self._collectors.items()):
+            try:
+                for name, kind, documentation, samples in collector():
+                    families.setdefault(name, (kind, documentation, []))[2].extend(samples)
+            except Exception as e:
+                print(f"⚠️ Metrics collector '{key}' failed: {e}")
+        for name, (kind, documentation, samples) in families.items():
+            lines.append(f"# HELP {name} {documentation}")
+            lines.append(f"# TYPE {name} {kind}")
+            for labels, value in samples:
+                if value is None:
+                    continue
+                label_text = _label_text(list(labels), list(labels.values()))
+                lines.append(f"{name}{label_text} {_number(value)}")
+        return "\n".join(lines) + "\n"
+
+# 프로세스 전역 저장소와 공용 메트릭
+registry = MetricsRegistry()
+
+http_request_seconds = registry.histogram(
+    "http_request_duration_seconds", "HTTP request latency by route template", ("method", "route", "status"))
+binance_request_seconds = registry.histogram(
+    "binance_request_duration_seconds", "Upstream Binance REST latency", ("endpoint", "outcome"))
+binance_request_weight = registry.counter(
+    "binance_request_weight_total", "Request weight spent per Binance endpoint", ("endpoint",))
+db_query_seconds = registry.histogram(
+    "db_query_duration_seconds", "Database statement execution time", ("operation",))
+bot_iteration_seconds = registry.histogram(
+    "bot_iteration_duration_seconds", "Auto trading bot evaluation time per closed candle", ("strategy", "outcome"))
+
+@contextmanager
+def track_binance(endpoint: str, weight: int = 0):
+    """SDK 클라이언트(python-binance) 호출처럼 서비스 계층을 거치지 않는 업스트림 호출 기록"""
+    if weight:
+        binance_request_weight.labels(endpoint).inc(weight)
+    started = time.perf_counter()
+    outcome = "error"
+    try:
+        yield
+        outcome = "ok"
+    finally:
+        binance_request_seconds.labels(endpoint, outcome).observe(time.perf_counter() - started)
+
+def cache_collector(name: str, stats: Callable[[], Dict]) -> Collector:
+    """stats()의 hits/misses(+size)를 cache 라벨 메트릭으로 노출"""
+    def collect():
+        s = stats()
+        labels = {"cache": name}
+        families = []
+        if "hits" in s:
+            families.append(("cache_hits_total", "counter", "Cache hits", [(labels, s["hits"])]))
+        if "misses" in s:
+            families.append(("cache_misses_total", "counter", "Cache misses", [(labels, s["misses"])]))
+        if "size" in s:
+            families.append(("cache_entries", "gauge", "Cache entries", [(labels, s["size"])]))
+        return families
+    return collect
+
+def register_cache(name: str, stats: Callable[[], Dict]):
+    registry.register_collector(f"cache:{name}", cache_collector(name, stats))
+
+def instrument_engine(engine, label: str = None):
+    """SQLAlchemy 엔진 문장 실행 시간 기록 (async 엔진은 .sync_engine 전달)"""
+    from sqlalchemy import event
+
+    if getattr(engine, "_metrics_instrumented", False):
+        return
+    engine._metrics_instrumented = True
+
+    def before(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("_metrics_started", []).append(time.perf_counter())
+
+    def after(conn, cursor, statement, parameters, context, executemany):
+        started = conn.info["_metrics_started"].pop()
+        operation = statement.lstrip().split(None, 1)[0].upper() if statement.strip() else "OTHER"
+        db_query_seconds.labels(operation).observe(time.perf_counter() - started)
+
+    def on_error(exception_context):
+        stack = exception_context.connection.info.get("_metrics_started") if exception_context.connection else None
+        if stack:
+            stack.pop()
+
+    event.listen(engine, "before_cursor_execute", before)
+    event.listen(engine, "after_cursor_execute", after)
+    event.listen(engine, "handle_error", on_error)
+
+class MetricsMiddleware:
+    """라우트 템플릿별 지연 기록 ASGI 미들웨어 (BaseHTTPMiddleware보다 가벼움)
+
+    경로 파라미터가 라벨로 퍼지지 않도록 매칭된 라우트 경로(/api/crypto/prices/{symbol})를
+    쓰고, 매칭 실패는 "unmatched"로 묶는다.
+    """
+
+    def __init__(self, app, histogram: Histogram = None, exclude: Sequence[str] = ("/metrics",)):
+        self.app = app
+        self.histogram = histogram or http_request_seconds
+        self.exclude = set(exclude)
+        self._endpoint_paths: Optional[Dict] = None
+
+    def _route_path(self, scope) -> str:
+        route = scope.get("route")
+        if route is not None and hasattr(route, "path"):
+            return route.path
+        endpoint = scope.get("endpoint")
+        if endpoint is None:
+            return "unmatched"
+        if self._endpoint_paths is None:
+            # 구버전 Starlette는 scope에 route가 없어 endpoint로 역조회
+            router = scope.get("router") or getattr(scope.get("app"), "router", None)
+            routes = getattr(router, "routes", ())
+            self._endpoint_paths = {getattr(r, "endpoint", None): r.path for r in routes if hasattr(r, "path")}
+        return self._endpoint_paths.get(endpoint, "unmatched")
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["path"] in self.exclude:
+            await self.app(scope, receive, send)
+            return
+        started = time.perf_counter()
+        status_holder = [500]
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                status_holder[0] = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            self.histogram.labels(scope["method"], self._route_path(scope), str(status_holder[0])).observe(
+                time.perf_counter() - started)
+
+# 모듈 테스트: 관측 1회 비용
+if __name__ == "__main__":
+    hist = registry.histogram("bench_seconds", "bench", ("route",))
+    child = hist.labels("/api/x")
+    rounds = 1_000_000
+    started = time.perf_counter()
+    for i in range(rounds):
+        child.observe(0.003)
+    print(f"observe (bound child): {(time.perf_counter() - started) / rounds * 1e9:.0f}ns")
+    started = time.perf_counter()
+    for i in range(rounds):
+        hist.labels("/api/x").observe(0.003)
+    print(f"labels().observe:      {(time.perf_counter() - started) / rounds * 1e9:.0f}ns")
+    print(registry.render()[:600])
@@ -0,0 +1,392 @@
+import asyncio
+import hashlib
+import hmac
+import os
+import queue
+import random
+import threading
+import time
+import uuid
+from collections import deque
+from concurrent.futures import Future
+from typing import Dict, List, Optional
+from urllib.parse import urlencode
+
+import requests
+
+from services.binance_service import http_session
+from services.metrics import registry, track_binance
+
+# 결과를 알 수 없거나 일시적인 오류 (재시도 대상)
+TRANSIENT_HTTP_STATUS = {408, 418, 429, 500, 502, 503, 504}
+TRANSIENT_ERROR_CODES = {-1001, -1003, -1006, -1007, -1008}
+DUPLICATE_ORDER_CODE = -4116   # ClientOrderId is duplicated
+UNKNOWN_ORDER_CODE = -2013     # Order does not exist
+CLIENT_ORDER_ID_PREFIX = "ds"
+MAX_CLIENT_ORDER_ID = 36       # 바이낸스 newClientOrderId 최대 길이
+MAX_RECV_WINDOW_MS = 60_000    # 바이낸스 recvWindow 상한
+
+order_ack_seconds = registry.histogram(
+    "order_ack_duration_seconds", "Time from order submit to exchange acknowledgement", ("outcome",))
+order_attempts = registry.counter(
+    "order_attempts_total", "Order send attempts by result", ("result",))
+
+def make_client_order_id(*parts) -> str:
+    """주문 의도 -> 결정적 newClientOrderId
+
+    같은 의도(사용자, 심볼, 방향, 전략, 봉 시각 등)는 항상 같은 ID가 되므로
+    재시도나 같은 봉의 재평가가 두 번 체결되지 않는다.
+    """
+    digest = hashlib.blake2b("|".join(str(p) for p in parts).encode(), digest_size=15).hexdigest()
+    return f"{CLIENT_ORDER_ID_PREFIX}-{digest}"[:MAX_CLIENT_ORDER_ID]
+
+class OrderError(Exception):
+    """주문 전송 오류 (transient=True면 재시도 가능, duplicate=True면 같은 ID 주문이 이미 있음)"""
+
+    def __init__(self, message: str, code: Optional[int] = None, status: Optional[int] = None,
+                 transient: bool = False, retry_after: Optional[float] = None):
+        super().__init__(message)
+        self.code = code
+        self.status = status
+        self.transient = transient
+        self.retry_after = retry_after
+
+    @property
+    def duplicate(self) -> bool:
+        return self.code == DUPLICATE_ORDER_CODE
+
+def classify_error(message: str, code: Optional[int], status: Optional[int],
+                   retry_after: Optional[str] = None) -> OrderError:
+    transient = (status in TRANSIENT_HTTP_STATUS or code in TRANSIENT_ERROR_CODES)
+    try:
+        retry_seconds = float(retry_after) if retry_after else None
+    except ValueError:
+        retry_seconds = None
+    return OrderError(message, code, status, transient, retry_seconds)
+
+class BinanceClientGateway:
+    """python-binance Client 기반 선물 주문 게이트웨이"""
+
+    def __init__(self, client):
+        self.client = client
+
+    def _call(self, endpoint: str, method, **params):
+        from binance.exceptions import BinanceAPIException, BinanceRequestException
+
+        try:
+            with track_binance(endpoint, weight=1):
+                return method(**params)
+        except BinanceAPIException as e:
+            raise classify_error(e.message, e.code, e.status_code,
+                                 getattr(e.response, "headers", {}).get("Retry-After")) from e
+        except BinanceRequestException as e:
+            raise OrderError(str(e), transient=True) from e
+        except (requests.exceptions.Timeout, requests.exceptions.ConnectionError) as e:
+            raise OrderError(str(e), transient=True) from e
+
+    def create_order(self, params: Dict) -> Dict:
+        return self._call("fapi/order", self.client.futures_create_order, **params)
+
+    def get_order(self, symbol: str, client_order_id: str) -> Optional[Dict]:
+        try:
+            return self._call("fapi/order:get", self.client.futures_get_order,
+                              symbol=symbol, origClientOrderId=client_order_id)
+        except OrderError as e:
+            if e.code == UNKNOWN_ORDER_CODE:
+                return None
+            raise
+
+class FuturesRestGateway:
+    """서명 REST 직접 호출 게이트웨이 (요청별 타임아웃, 로컬 대역 서버 지정 가능)"""
+
+    def __init__(self, api_key: str, secret_key: str, base_url: str = "https://fapi.binance.com/fapi",
+                 timeout: float = 5.0, session: requests.Session = None):
+        self.api_key = api_key
+        self.secret_key = secret_key
+        self.base_url = base_url.rstrip("/")
+        self.timeout = timeout
+        self.session = session or http_session
+
+    def _request(self, method: str, path: str, params: Dict) -> Dict:
+        params = dict(params, timestamp=int(time.time() * 1000))
+        query = urlencode(params)
+        signature = hmac.new(self.secret_key.encode(), query.encode(), hashlib.sha256).hexdigest()
+        body = f"{query}&signature={signature}"
+        headers = {"X-MBX-APIKEY": self.api_key}
+        url = f"{self.base_url}/{path}"
+        try:
+            with track_binance(f"fapi/{path}:{method.lower()}", weight=1):
+                if method == "GET":
+                    response = self.session.get(f"{url}?{body}", headers=headers, timeout=self.timeout)
+                else:
+                    headers["Content-Type"] = "application/x-www-form-urlencoded"
+                    response = self.session.request(method, url, data=body, headers=headers, timeout=self.timeout)
+        except (requests.exceptions.Timeout, requests.exceptions.ConnectionError) as e:
+            raise OrderError(str(e), transient=True) from e
+        if response.status_code == 200:
+            return response.json()
+        try:
+            payload = response.json()
+        except ValueError:
+            payload = {}
+        raise classify_error(payload.get("msg") or response.text, payload.get("code"), response.status_code,
+                             response.headers.get("Retry-After"))
+
+    def create_order(self, params: Dict) -> Dict:
+        return self._request("POST", "v1/order", params)
+
+    def get_order(self, symbol: str, client_order_id: str) -> Optional[Dict]:
+        try:
+            return self._request("GET", "v1/order", {"symbol": symbol, "origClientOrderId": client_order_id})
+        except OrderError as e:
+            if e.code == UNKNOWN_ORDER_CODE:
+                return None
+            raise
+
+class OrderExecutor:
+    """주문 실행 큐 + 제한된 동시 전송 스레드
+
+    주문은 큐에 들어가고 max_senders개의 전송 스레드가 꺼내 보낸다. 모든 주문에
+    newClientOrderId를 붙여 재시도해도 같은 주문으로 취급되게 하고, 일시적 오류
+    (타임아웃, 연결 끊김, 5xx, 429/418, -1007 등)에서만 지수 백오프로 재시도한다.
+    결과를 모르는 실패 뒤에는 재전송 전에 같은 ID로 주문을 조회해 이미 체결된
+    주문이면 그대로 성공 처리한다.
+
+    ack_timeout은 접수부터의 확인 시한이다. 매 전송의 recvWindow를 남은 시간으로
+    잡아 시한 뒤에 도착한 요청은 거래소가 거절하게 하고, 시한이 되면 재시도하지 않고
+    같은 ID로 조회해 결과를 확정한다. 그래서 execute/aexecute는 항상 최종 결과 dict를
+    받는다 (전송 중인 요청 하나의 타임아웃만큼 시한을 넘길 수 있다) - 호출자가 포기한
+    뒤에 주문이 체결되는 일은 없다.
+    """
+
+    def __init__(self, max_senders: int = 8, max_queue: int = 1000, max_attempts: int = 4,
+                 backoff: float = 0.2, max_backoff: float = 3.0, ack_timeout: float = 30.0,
+                 samples: int = 2048):
+        self.max_senders = max_senders
+        self.max_attempts = max_attempts
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.ack_timeout = ack_timeout
+        self._queue: "queue.Queue" = queue.Queue(maxsize=max_queue)
+        self._lock = threading.Lock()
+        self._senders: List[threading.Thread] = []
+        self._closed = False
+        self._latencies = deque(maxlen=samples)
+
+        # 통계
+        self.submitted = 0
+        self.acked = 0
+        self.failed = 0
+        self.rejected = 0
+        self.retries = 0
+        self.recovered = 0
+        self.in_flight = 0
+
+    def _ensure_senders(self):
+        if len(self._senders) >= self.max_senders:
+            return
+        with self._lock:
+            while len(self._senders) < self.max_senders:
+                thread = threading.Thread(target=self._sender, name=f"order-sender-{len(self._senders)}",
+                                          daemon=True)
+                thread.start()
+                self._senders.append(thread)
+
+    def submit(self, gateway, symbol: str, side: str, quantity: float, order_type: str = "MARKET",
+               reduce_only: bool = False, client_order_id: Optional[str] = None, **extra) -> Future:
+        """주문 접수 -> Future[결과 dict] (큐가 가득 차면 즉시 오류 결과)"""
+        future: Future = Future()
+        if self._closed:
+            future.set_result({"status": "error", "message": "order executor is shut down"})
+            return future
+        params = {"symbol": symbol, "side": side, "type": order_type, "quantity": quantity,
+                  "newClientOrderId": client_order_id or make_client_order_id(uuid.uuid4().hex)}
+        if reduce_only:
+            params["reduceOnly"] = "true"
+        params.update(extra)
+        self._ensure_senders()
+        try:
+            self._queue.put_nowait((gateway, params, future, time.perf_counter()))
+        except queue.Full:
+            with self._lock:
+                self.rejected += 1
+            future.set_result({"status": "error", "message": "order queue is full",
+                               "client_order_id": params["newClientOrderId"]})
+            return future
+        with self._lock:
+            self.submitted += 1
+        return future
+
+    def execute(self, gateway, symbol: str, side: str, quantity: float, **kwargs) -> Dict:
+        """동기 실행 - 최종 결과(체결 또는 확정된 실패)까지 대기, 시한은 전송 스레드가 지킨다"""
+        return self.submit(gateway, symbol, side, quantity, **kwargs).result()
+
+    async def aexecute(self, gateway, symbol: str, side: str, quantity: float, **kwargs) -> Dict:
+        """비동기 실행 - execute와 같은 결과 계약, 이벤트 루프를 막지 않고 대기"""
+        future = self.submit(gateway, symbol, side, quantity, **kwargs)
+        return await asyncio.wrap_future(future)
+
+    def _sender(self):
+        while True:
+            task = self._queue.get()
+            if task is None:
+                return
+            gateway, params, future, enqueued = task
+            with self._lock:
+                self.in_flight += 1
+            try:
+                if time.perf_counter() >= enqueued + self.ack_timeout:
+                    # 큐에서 시한을 넘김 - 보낸 적 없으니 실패로 확정
+                    result = {"status": "error", "message": "order expired in queue before sending", "attempts": 0}
+                else:
+                    result = self._send(gateway, params, enqueued + self.ack_timeout)
+            except Exception as e:  # 게이트웨이 버그 등 예상 밖 오류도 결과로 돌려준다
+                result = {"status": "error", "message": str(e)}
+            elapsed = time.perf_counter() - enqueued
+            outcome = "ok" if result["status"] == "success" else "error"
+            order_ack_seconds.labels(outcome).observe(elapsed)
+            with self._lock:
+                self.in_flight -= 1
+                if outcome == "ok":
+                    self.acked += 1
+                    self._latencies.append(elapsed)
+                else:
+                    self.failed += 1
+            result["client_order_id"] = params["newClientOrderId"]
+            result["latency_ms"] = round(elapsed * 1000, 3)
+            future.set_result(result)
+
+    def _delay(self, attempt: int, error: OrderError) -> float:
+        if error.retry_after:
+            return min(error.retry_after, self.max_backoff)
+        delay = min(self.backoff * 2 ** (attempt - 1), self.max_backoff)
+        return delay * random.uniform(0.5, 1.0)  # 지터
+
+    def _lookup(self, gateway, params: Dict) -> Optional[Dict]:
+        try:
+            return gateway.get_order(params["symbol"], params["newClientOrderId"])
+        except OrderError:
+            return None
+
+    def _send(self, gateway, params: Dict, deadline: float) -> Dict:
+        attempt = 0
+        while True:
+            attempt += 1
+            # 시한 뒤에 거래소에 닿은 요청은 체결되지 않도록
+            remaining_ms = int((deadline - time.perf_counter()) * 1000)
+            params["recvWindow"] = min(MAX_RECV_WINDOW_MS, max(1, remaining_ms))
+            try:
+                order = gateway.create_order(params)
+                order_attempts.labels("ok").inc()
+                return {"status": "success", "order": order, "attempts": attempt}
+            except OrderError as error:
+                if error.duplicate:
+                    # 이전 시도가 이미 접수됨 - 그 주문을 결과로 쓴다
+                    order_attempts.labels("duplicate").inc()
+                    existing = self._lookup(gateway, params)
+                    if existing is not None:
+                        with self._lock:
+                            self.recovered += 1
+                        return {"status": "success", "order": existing, "attempts": attempt, "recovered": True}
+                    return {"status": "error", "message": str(error), "code": error.code, "attempts": attempt}
+                if not error.transient or attempt >= self.max_attempts:
+                    order_attempts.labels("rejected" if not error.transient else "exhausted").inc()
+                    return {"status": "error", "message": str(error), "code": error.code, "attempts": attempt}
+                delay = self._delay(attempt, error)
+                if time.perf_counter() + delay >= deadline:
+                    # 확인 시한 - 재전송하지 않는다. 시한 뒤 도착분은 recvWindow로 거절되므로
+                    # 시한까지 기다린 뒤의 조회 결과가 최종
+                    order_attempts.labels("deadline").inc()
+                    time.sleep(max(0.0, deadline - time.perf_counter()))
+                    existing = self._lookup(gateway, params)
+                    if existing is not None:
+                        with self._lock:
+                            self.recovered += 1
+                        return {"status": "success", "order": existing, "attempts": attempt, "recovered": True}
+                    return {"status": "error", "message": f"order not acknowledged within {self.ack_timeout}s: {error}",
+                            "code": error.code, "attempts": attempt}
+                order_attempts.labels("retry").inc()
+                with self._lock:
+                    self.retries += 1
+                time.sleep(delay)
+                # 결과 불명 - 재전송 전에 이미 접수됐는지 확인
+                existing = self._lookup(gateway, params)
+                if existing is not None:
+                    with self._lock:
+                        self.recovered += 1
+                    return {"status": "success", "order": existing, "attempts": attempt, "recovered": True}
+
+    def shutdown(self, wait: bool = True):
+        self._closed = True
+        for _ in self._senders:
+            self._queue.put(None)
+        if wait:
+            for thread in self._senders:
+                thread.join(timeout=self.ack_timeout)
+        self._senders = []
+
+    def latency_percentiles(self) -> Dict[str, float]:
+        with self._lock:
+            samples = sorted(self._latencies)
+        if not samples:
+            return {"p50_ms": 0.0, "p90_ms": 0.0, "p99_ms": 0.0, "max_ms": 0.0}
+
+        def pick(q: float) -> float:
+            return round(samples[min(len(samples) - 1, int(q * len(samples)))] * 1000, 3)
+        return {"p50_ms": pick(0.50), "p90_ms": pick(0.90), "p99_ms": pick(0.99),
+                "max_ms": round(samples[-1] * 1000, 3)}
+
+    def stats(self) -> Dict:
+        with self._lock:
+            counters = {
+                "submitted": self.submitted,
+                "acked": self.acked,
+                "failed": self.failed,
+                "rejected": self.rejected,
+                "retries": self.retries,
+                "recovered": self.recovered,
+                "in_flight": self.in_flight,
+                "queued": self._queue.qsize(),
+                "senders": len(self._senders)
+            }
+        counters.update(self.latency_percentiles())
+        return counters
+
+# 프로세스 전역 주문 실행기
+order_executor = OrderExecutor(
+    max_senders=int(os.getenv("ORDER_MAX_SENDERS", "8")),
+    max_attempts=int(os.getenv("ORDER_MAX_ATTEMPTS", "4")),
+    ack_timeout=float(os.getenv("ORDER_ACK_TIMEOUT", "30"))
+)
+
+# 모듈 테스트: 로컬 선물 대역 서버에 장애를 섞어 주문 - 중복 체결 없음 확인
+if __name__ == "__main__":
+    from services.binance_stub import BinanceStubServer, FakeFuturesExchange
+
+    exchange = FakeFuturesExchange()
+    with BinanceStubServer(routes=exchange.routes()) as server:
+        gateway = FuturesRestGateway("key", "secret", server.futures_url, timeout=0.5)
+        executor = OrderExecutor(max_senders=8, backoff=0.05)
+
+        # 장애 시나리오: 5xx, 429, 처리 후 -1007, 처리 후 연결 끊김, 타임아웃보다 긴 지연
+        exchange.fail_next("5xx", "429", "-1007", "drop", 0.8)
+        results = [executor.execute(gateway, "BTCUSDT", "BUY", 0.001, client_order_id=make_client_order_id(i))
+                   for i in range(5)]
+        for result in results:
+            print(f"{result['status']:<8} attempts={result.get('attempts')} recovered={result.get('recovered', False)}")
+        print(f"faulty: 5 orders -> {exchange.fills} fills, {exchange.requests} requests")
+
+        # 같은 의도 재제출 -> 기존 주문 반환
+        again = executor.execute(gateway, "BTCUSDT", "BUY", 0.001, client_order_id=make_client_order_id(0))
+        print(f"resubmit: {again['status']} recovered={again.get('recovered')} fills={exchange.fills}")
+
+        executor.shutdown()
+        count = 2000
+        executor = OrderExecutor(max_senders=8, max_queue=count)
+        started = time.perf_counter()
+        futures = [executor.submit(gateway, "ETHUSDT", "SELL", 0.01) for _ in range(count)]
+        acked = sum(f.result()["status"] == "success" for f in futures)
+        elapsed = time.perf_counter() - started
+        print(f"throughput: {acked}/{count} acked in {elapsed:.2f}s ({count / elapsed:.0f} orders/s)")
+        print(executor.stats())
+        executor.shutdown()
@@ -0,0 +1,152 @@
+import argparse
+import itertools
+import math
+import os
+import time
+from collections import OrderedDict
+from multiprocessing import Pool
+from typing import Dict, List, Optional, Tuple
+
+from services.advanced_ai_trading import DEFAULT_PARAMS, required_indicators, resolve_params
+from services.backtest_engine import BacktestEngine, OHLCV, load_ohlcv
+
+# 전략별 기본 탐색 그리드
+DEFAULT_GRIDS = {
+    'trend_following': {"fast_window": [10, 20, 30], "slow_window": [50, 100, 200],
+                        "stop_loss_pct": [0.01, 0.02], "take_profit_pct": [0.02, 0.04]},
+    'mean_reversion': {"rsi_window": [7, 14, 21], "oversold": [20, 25, 30], "overbought": [70, 75, 80],
+                       "stop_loss_pct": [0.02, 0.03], "take_profit_pct": [0.02, 0.03]},
+    'breakout': {"window": [10, 20, 50, 100], "stop_loss_pct": [0.01, 0.02], "take_profit_pct": [0.03, 0.05]},
+    'rsi_momentum': {"rsi_window": [7, 14, 21], "signal_window": [3, 5, 9], "upper": [55, 60, 65],
+                     "lower": [35, 40, 45]}
+}
+
+# 값이 작을수록 좋은 지표
+ASCENDING_METRICS = {"max_drawdown_pct"}
+
+def expand_grid(strategy_name: str, grid: Dict[str, List]) -> List[Dict]:
+    """그리드 -> 파라미터 조합 목록 (기본값으로 채우고 모순된 조합은 제외)"""
+    keys = list(grid)
+    combos = []
+    for values in itertools.product(*(grid[k] for k in keys)):
+        params = resolve_params(strategy_name, dict(zip(keys, values)))
+        if params.get("fast_window", 0) >= params.get("slow_window", math.inf):
+            continue
+        if params.get("oversold", 0) >= params.get("overbought", math.inf):
+            continue
+        if params.get("lower", 0) >= params.get("upper", math.inf):
+            continue
+        combos.append(params)
+    return combos
+
+def _plan_tasks(paths: Dict[str, str], strategy_name: str, combos: List[Dict],
+                engine_kwargs: Dict) -> List[Tuple]:
+    """작업 분할 - 같은 지표 집합을 쓰는 조합을 한 작업으로 묶는다
+
+    심볼 순으로 정렬해 두어 워커가 같은 심볼 데이터/지표 캐시를 이어서 쓰게 한다.
+    """
+    groups: Dict[tuple, List[Tuple[int, Dict]]] = {}
+    for index, params in enumerate(combos):
+        key = tuple(required_indicators(strategy_name, params))
+        groups.setdefault(key, []).append((index, params))
+    return [(symbol, path, strategy_name, members, engine_kwargs)
+            for symbol, path in sorted(paths.items()) for members in groups.values()]
+
+# 워커 프로세스별 (데이터, 지표 캐시) - 최근 사용 파일 몇 개만 유지
+_WORKER_CACHE_SIZE = 2
+_worker_datasets: "OrderedDict[str, Tuple[OHLCV, Dict]]" = OrderedDict()
+
+def _dataset(path: str) -> Tuple[OHLCV, Dict]:
+    entry = _worker_datasets.get(path)
+    if entry is None:
+        entry = _worker_datasets[path] = (load_ohlcv(path), {})
+        while len(_worker_datasets) > _WORKER_CACHE_SIZE:
+            _worker_datasets.popitem(last=False)
+    else:
+        _worker_datasets.move_to_end(path)
+    return entry
+
+def _sweep_task(task: Tuple) -> Tuple[str, List[Tuple[int, Dict]]]:
+    """프로세스 풀 작업 단위 - 심볼 하나 x 지표 집합이 같은 조합들"""
+    symbol, path, strategy_name, members, engine_kwargs = task
+    data, cache = _dataset(path)
+    engine = BacktestEngine(**engine_kwargs)
+    return symbol, [(index, engine.run(data, strategy_name, cache, params=params)) for index, params in members]
+
+def rank_results(combos: List[Dict], reports: Dict[int, Dict[str, Dict]], metric: str = "return_pct") -> List[Dict]:
+    """조합별 심볼 평균으로 집계 후 순위 매김"""
+    rows = []
+    for index, params in enumerate(combos):
+        by_symbol = reports.get(index, {})
+        if not by_symbol:
+            continue
+        results = list(by_symbol.values())
+        count = len(results)
+        finite_pf = [r["profit_factor"] for r in results if math.isfinite(r["profit_factor"])]
+        rows.append({
+            "params": params,
+            "symbols": count,
+            "trades": sum(r["trades"] for r in results),
+            "return_pct": round(sum(r["return_pct"] for r in results) / count, 4),
+            "win_rate": round(sum(r["win_rate"] for r in results) / count, 4),
+            "max_drawdown_pct": max(r["max_drawdown_pct"] for r in results),
+            "profit_factor": round(sum(finite_pf) / len(finite_pf), 4) if finite_pf else 0.0,
+            "by_symbol": {symbol: r["return_pct"] for symbol, r in sorted(by_symbol.items())}
+        })
+    reverse = metric not in ASCENDING_METRICS
+    rows.sort(key=lambda row: row[metric], reverse=reverse)
+    for rank, row in enumerate(rows, 1):
+        row["rank"] = rank
+    return rows
+
+def run_sweep(paths: Dict[str, str], strategy_name: str, grid: Dict[str, List] = None,
+              processes: int = None, metric: str = "return_pct", **engine_kwargs) -> List[Dict]:
+    """파라미터 그리드를 심볼별 히스토리에 대해 병렬 백테스트 - 순위표 행 목록"""
+    if strategy_name not in DEFAULT_PARAMS:
+        raise ValueError(f"지원하지 않는 전략: {strategy_name}")
+    combos = expand_grid(strategy_name, grid or DEFAULT_GRIDS[strategy_name])
+    tasks = _plan_tasks(paths, strategy_name, combos, engine_kwargs)
+
+    reports: Dict[int, Dict[str, Dict]] = {}
+    if len(tasks) == 1 or processes == 1:
+        results = map(_sweep_task, tasks)
+        pool = None
+    else:
+        pool = Pool(processes=processes or os.cpu_count())
+        results = pool.imap_unordered(_sweep_task, tasks)
+    try:
+        for symbol, items in results:
+            for index, report in items:
+                reports.setdefault(index, {})[symbol] = report
+    finally:
+        if pool is not None:
+            pool.close()
+            pool.join()
+    return rank_results(combos, reports, metric)
+
+def format_table(rows: List[Dict], top: Optional[int] = 20) -> str:
+    """순위표"""
+    rows = rows[:top] if top else rows
+    lines = [f"{'rank':>4}  {'return%':>9}{'win%':>7}{'maxDD%':>8}{'PF':>7}{'trades':>8}  params"]
+    for row in rows:
+        params = ", ".join(f"{k}={v}" for k, v in row["params"].items())
+        lines.append(f"{row['rank']:>4}  {row['return_pct']:>9.2f}{row['win_rate'] * 100:>7.1f}"
+                     f"{row['max_drawdown_pct']:>8.2f}{row['profit_factor']:>7.2f}{row['trades']:>8}  {params}")
+    return "\n".join(lines)
+
+# 모듈 테스트: python -m services.parameter_sweep -s breakout BTCUSDT_1m.csv ETHUSDT_1m.parquet ...
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="전략 파라미터 그리드 탐색")
+    parser.add_argument("files", nargs="+")
+    parser.add_argument("-s", "--strategy", default="trend_following", choices=sorted(DEFAULT_PARAMS))
+    parser.add_argument("-m", "--metric", default="return_pct",
+                        choices=["return_pct", "win_rate", "max_drawdown_pct", "profit_factor"])
+    parser.add_argument("-p", "--processes", type=int, default=None)
+    parser.add_argument("-n", "--top", type=int, default=20)
+    args = parser.parse_args()
+
+    paths = {os.path.basename(f).split("_")[0].split(".")[0].upper(): f for f in args.files}
+    started = time.perf_counter()
+    rows = run_sweep(paths, args.strategy, processes=args.processes, metric=args.metric)
+    print(format_table(rows, args.top))
+    print(f"\n{len(rows)} combos x {len(paths)} symbols in {time.perf_counter() - started:.1f}s")
@@ -0,0 +1,267 @@
+import math
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+from services.journal_writer import JournalWriter, journal_writer
+
+ENTRY_PRICE_TOLERANCE = 1e-6  # 거래소 entryPrice와 장부 평균 단가 비교 (상대 오차)
+
+def _sign(side: str) -> int:
+    return 1 if side == "BUY" else -1
+
+class Position:
+    """열린 포지션 (같은 방향 추가 체결은 평균 단가로 합친다)"""
+
+    def __init__(self, user_id: int, symbol: str, side: str, quantity: float, entry_price: float,
+                 order_id=None, stop_loss: float = None, take_profit: float = None, strategy: str = None):
+        self.user_id = user_id
+        self.symbol = symbol
+        self.side = side  # BUY(롱), SELL(숏)
+        self.quantity = quantity
+        self.entry_price = entry_price
+        self.stop_loss = stop_loss
+        self.take_profit = take_profit
+        self.strategy = strategy
+        self.opened_at = time.time()
+        self.mark_price = entry_price
+        self.realized_pnl = 0.0
+        # 저널 행과 연결된 주문별 수량
+        self.orders: List[Tuple[str, float]] = [(str(order_id), quantity)] if order_id is not None else []
+
+    @property
+    def unrealized_pnl(self) -> float:
+        return _sign(self.side) * (self.mark_price - self.entry_price) * self.quantity
+
+    @property
+    def unrealized_pnl_pct(self) -> float:
+        if not self.entry_price:
+            return 0.0
+        return _sign(self.side) * (self.mark_price / self.entry_price - 1) * 100
+
+    def to_dict(self) -> Dict:
+        return {
+            "user_id": self.user_id,
+            "symbol": self.symbol,
+            "side": self.side,
+            "quantity": self.quantity,
+            "entry_price": self.entry_price,
+            "mark_price": self.mark_price,
+            "unrealized_pnl": round(self.unrealized_pnl, 8),
+            "unrealized_pnl_pct": round(self.unrealized_pnl_pct, 4),
+            "realized_pnl": round(self.realized_pnl, 8),
+            "stop_loss": self.stop_loss,
+            "take_profit": self.take_profit,
+            "strategy": self.strategy,
+            "entry_time": self.opened_at,
+            "order_id": self.orders[0][0] if self.orders else None
+        }
+
+class PositionBook:
+    """(사용자, 심볼) 키 포지션 장부
+
+    열린 포지션만 메모리에 두고 (조회 O(1)), 청산된 포지션은 매매일지로 넘긴다.
+    심볼별 색인으로 시세 갱신 시 해당 심볼 포지션만 평가한다.
+    """
+
+    def __init__(self, journal: JournalWriter = None, max_known_orders: int = 10_000):
+        self.journal = journal or journal_writer
+        self.max_known_orders = max_known_orders
+        # 반영한 체결 주문 (심볼, 주문 ID) - 바이낸스 주문 ID는 심볼별이다 (최근 것만)
+        self._known_orders: "OrderedDict[Tuple[str, str], None]" = OrderedDict()
+        self._changed_at: Dict[Tuple[int, str], float] = {}  # 마지막 체결/청산 시각 (동기화 경합 판정)
+        self._open: Dict[Tuple[int, str], Position] = {}
+        self._by_symbol: Dict[str, Dict[int, Position]] = {}
+        self._marks: Dict[str, float] = {}
+        self._lock = threading.RLock()
+
+        # 통계
+        self.opened = 0
+        self.closed = 0
+        self.reconciliations = 0
+        self.reconcile_adjustments = 0
+
+    # ---- 조회 ----
+
+    def get(self, user_id: int, symbol: str) -> Optional[Position]:
+        return self._open.get((user_id, symbol.upper()))
+
+    def has_open(self, user_id: int, symbol: str) -> bool:
+        return (user_id, symbol.upper()) in self._open
+
+    def knows_order(self, symbol: str, order_id) -> bool:
+        """이미 반영한 체결인지 (청산된 포지션의 주문 포함)"""
+        return order_id is not None and (symbol.upper(), str(order_id)) in self._known_orders
+
+    def user_positions(self, user_id: int) -> List[Position]:
+        with self._lock:
+            return [p for (uid, _), p in self._open.items() if uid == user_id]
+
+    def symbol_positions(self, symbol: str) -> List[Position]:
+        with self._lock:
+            return list(self._by_symbol.get(symbol.upper(), {}).values())
+
+    # ---- 체결 반영 ----
+
+    def _add(self, position: Position):
+        self._open[(position.user_id, position.symbol)] = position
+        self._by_symbol.setdefault(position.symbol, {})[position.user_id] = position
+        mark = self._marks.get(position.symbol)
+        if mark is not None:
+            position.mark_price = mark
+        self.opened += 1
+
+    def _remove(self, position: Position):
+        self._open.pop((position.user_id, position.symbol), None)
+        members = self._by_symbol.get(position.symbol)
+        if members is not None:
+            members.pop(position.user_id, None)
+            if not members:
+                del self._by_symbol[position.symbol]
+
+    def on_fill(self, user_id: int, symbol: str, side: str, quantity: float, price: float, order_id=None,
+                stop_loss: float = None, take_profit: float = None, strategy: str = None,
+                reason: str = "signal") -> Optional[Position]:
+        """주문 체결 반영 - 신규/추가는 평균 단가, 반대 방향은 축소/청산/반전"""
+        symbol = symbol.upper()
+        with self._lock:
+            self._changed_at[(user_id, symbol)] = time.time()
+            if order_id is not None:
+                self._known_orders[(symbol, str(order_id))] = None
+                while len(self._known_orders) > self.max_known_orders:
+                    self._known_orders.popitem(last=False)
+            position = self._open.get((user_id, symbol))
+            if position is None:
+                position = Position(user_id, symbol, side, quantity, price, order_id, stop_loss, take_profit, strategy)
+                self._add(position)
+                return position
+
+            if position.side == side:
+                total = position.quantity + quantity
+                position.entry_price = (position.entry_price * position.quantity + price * quantity) / total
+                position.quantity = total
+                if order_id is not None:
+                    position.orders.append((str(order_id), quantity))
+                if stop_loss is not None:
+                    position.stop_loss, position.take_profit = stop_loss, take_profit
+                return position
+
+            # 반대 방향 체결
+            if quantity < position.quantity:
+                position.realized_pnl += _sign(position.side) * (price - position.entry_price) * quantity
+                position.quantity -= quantity
+                return position
+            remainder = quantity - position.quantity
+            self._close(position, price, reason)
+            if remainder > 0:
+                flipped = Position(user_id, symbol, side, remainder, price, order_id, stop_loss, take_profit, strategy)
+                self._add(flipped)
+                return flipped
+            return None
+
+    def close(self, user_id: int, symbol: str, exit_price: float, reason: str = "manual") -> Optional[Position]:
+        """포지션 전량 청산"""
+        with self._lock:
+            position = self._open.get((user_id, symbol.upper()))
+            if position is not None:
+                self._close(position, exit_price, reason)
+            return position
+
+    def _close(self, position: Position, exit_price: float, reason: str):
+        """장부에서 제거하고 매매일지에 청산 기록 (주문별 수량 비율로 손익 배분)"""
+        self._remove(position)
+        self._changed_at[(position.user_id, position.symbol)] = time.time()
+        position.mark_price = exit_price
+        pnl_pct = position.unrealized_pnl_pct
+        pnl = position.unrealized_pnl + position.realized_pnl
+        total = sum(qty for _, qty in position.orders) or 1.0
+        for order_id, qty in position.orders:
+            self.journal.record_close(order_id, exit_price, reason, pnl * qty / total, pnl_pct)
+        self.closed += 1
+
+    # ---- 시세/거래소 동기화 ----
+
+    def update_mark(self, symbol: str, price: float):
+        """현재가 반영 (미실현 손익 계산용)"""
+        symbol = symbol.upper()
+        with self._lock:
+            self._marks[symbol] = price
+            for position in self._by_symbol.get(symbol, {}).values():
+                position.mark_price = price
+
+    def reconcile(self, user_id: int, account_positions: List[Dict], snapshot_time: float = None) -> int:
+        """futures_account()["positions"] 기준으로 장부 보정 - 보정 건수
+
+        거래소에만 있는 포지션은 장부에 들이고, 장부에만 있는 포지션은 청산 처리,
+        수량/단가가 다르면 거래소 값으로 맞춘다. snapshot_time(조회 시작 시각) 이후에
+        체결/청산된 심볼은 스냅샷에 아직 반영되지 않았을 수 있으므로 건너뛴다.
+        """
+        exchange = {}
+        for item in account_positions:
+            amount = float(item.get("positionAmt") or 0)
+            if amount:
+                exchange[item["symbol"]] = (amount, float(item.get("entryPrice") or 0))
+
+        adjustments = 0
+        with self._lock:
+            def settled(symbol: str) -> bool:
+                changed = self._changed_at.get((user_id, symbol))
+                return snapshot_time is None or changed is None or changed < snapshot_time
+
+            for position in self.user_positions(user_id):
+                if position.symbol not in exchange and settled(position.symbol):
+                    self._close(position, self._marks.get(position.symbol, position.mark_price), "reconciled")
+                    adjustments += 1
+
+            for symbol, (amount, entry_price) in exchange.items():
+                if not settled(symbol):
+                    continue
+                side = "BUY" if amount > 0 else "SELL"
+                quantity = abs(amount)
+                position = self._open.get((user_id, symbol))
+                if position is not None and position.side == side:
+                    price_moved = entry_price and not math.isclose(position.entry_price, entry_price,
+                                                                    rel_tol=ENTRY_PRICE_TOLERANCE)
+                    if abs(position.quantity - quantity) > 1e-12 or price_moved:
+                        position.quantity = quantity
+                        position.entry_price = entry_price or position.entry_price
+                        adjustments += 1
+                    continue
+                if position is not None:
+                    self._close(position, self._marks.get(symbol, position.mark_price), "reconciled")
+                # 봇 밖에서 열린 포지션 - 저널 행을 만들어 두고 장부에 등록
+                order_id = f"reconciled-{user_id}-{symbol}-{int(time.time() * 1000)}"
+                self.journal.record_order(user_id, symbol, side, quantity, entry_price, order_id,
+                                          {"reason": "거래소 포지션 동기화"})
+                self._add(Position(user_id, symbol, side, quantity, entry_price, order_id))
+                adjustments += 1
+
+        self.reconciliations += 1
+        self.reconcile_adjustments += adjustments
+        return adjustments
+
+    def reconcile_account(self, user_id: int, binance_service) -> int:
+        """RealBinanceService 계좌 조회 후 보정 (조회 중 들어온 체결은 다음 동기화로)"""
+        snapshot_time = time.time()
+        result = binance_service.get_real_account_info()
+        if result.get("status") != "success":
+            print(f"⚠️ 포지션 동기화 실패 (user {user_id}): {result.get('message')}")
+            return 0
+        return self.reconcile(user_id, result["account"].get("positions", []), snapshot_time)
+
+    def stats(self) -> Dict:
+        """장부 통계"""
+        with self._lock:
+            return {
+                "open_positions": len(self._open),
+                "symbols": len(self._by_symbol),
+                "opened": self.opened,
+                "closed": self.closed,
+                "reconciliations": self.reconciliations,
+                "reconcile_adjustments": self.reconcile_adjustments,
+                "unrealized_pnl": round(sum(p.unrealized_pnl for p in self._open.values()), 8)
+            }
+
+# 프로세스 전역 포지션 장부
+position_book = PositionBook()
@@ -0,0 +1,183 @@
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple, Union
+
+# msgpack 선택 의존성 - 없으면 JSON만 제공
+try:
+    import msgpack
+    MSGPACK_AVAILABLE = True
+except ImportError:
+    msgpack = None
+    MSGPACK_AVAILABLE = False
+
+MSGPACK_MEDIA_TYPE = "application/x-msgpack"
+JSON_MEDIA_TYPE = "application/json"
+LAYOUTS = ("rows", "columnar")
+MAX_SYMBOLS = 500
+
+def parse_symbols(raw: Union[str, List[str], None], limit: int = MAX_SYMBOLS) -> Optional[List[str]]:
+    """"BTCUSDT,ethusdt" 또는 ["BTCUSDT", "ethusdt"] -> ["BTCUSDT", "ETHUSDT"]
+
+    대문자, 중복 제거, 순서 유지. 비어 있으면 None = 전체. 형식이 틀리면 ValueError.
+    """
+    if not raw:
+        return None
+    if isinstance(raw, str):
+        raw = raw.split(",")
+    elif not isinstance(raw, (list, tuple)) or not all(isinstance(s, str) for s in raw):
+        raise ValueError("symbols는 심볼 목록 또는 쉼표로 구분한 문자열이어야 합니다")
+    symbols = list(dict.fromkeys(s.strip().upper() for s in raw if s.strip()))
+    if len(symbols) > limit:
+        raise ValueError(f"심볼은 최대 {limit}개까지 조회할 수 있습니다")
+    return symbols or None
+
+class PriceBatchEncoder:
+    """가격 스냅샷 -> 심볼 집합 응답 인코더
+
+    요청마다 전체 스냅샷 하나에서 심볼 집합을 골라내고, 내용 해시를 ETag로
+    쓴다. ETag는 layout과 media type까지 포함하며, 인코딩 결과(bytes)는 ETag별로 보관해 폴링이
+    반복돼도 직렬화는 가격이 바뀔 때만 일어난다.
+    """
+
+    def __init__(self, max_entries: int = 256):
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._encoded: "OrderedDict[str, bytes]" = OrderedDict()  # ETag -> 인코딩된 본문
+        self._indexed_snapshot = None
+        self._index: Dict[str, str] = {}
+
+        # 통계
+        self.requests = 0
+        self.not_modified = 0
+        self.encode_hits = 0
+        self.encodes = 0
+        self.index_builds = 0
+
+    def _symbol_index(self, snapshot: List[Dict]) -> Dict[str, str]:
+        """스냅샷 {symbol: price} 색인 - 같은 스냅샷 객체(REST 캐시)면 재사용"""
+        if snapshot is self._indexed_snapshot:
+            return self._index
+        index = {item["symbol"]: item["price"] for item in snapshot}
+        self._indexed_snapshot, self._index = snapshot, index
+        self.index_builds += 1
+        return index
+
+    def select(self, snapshot: List[Dict], symbols: Optional[List[str]]) -> Tuple[List[str], List[str], List[str]]:
+        """(찾은 심볼, 가격 문자열, 없는 심볼) - symbols가 None이면 스냅샷 전체"""
+        with self._lock:
+            index = self._symbol_index(snapshot)
+        if symbols is None:
+            found = list(index)
+            return found, [index[s] for s in found], []
+        found, prices, missing = [], [], []
+        for symbol in symbols:
+            price = index.get(symbol)
+            if price is None:
+                missing.append(symbol)
+            else:
+                found.append(symbol)
+                prices.append(price)
+        return found, prices, missing
+
+    @staticmethod
+    def etag(source: str, symbols: List[str], prices: List[str], missing: List[str],
+             layout: str, media_type: str) -> str:
+        """표현마다 다른 ETag - 같은 가격이라도 layout/media type이 다르면 본문이 다르다"""
+        digest = hashlib.blake2b(digest_size=12)
+        digest.update(f"{layout}\x1f{media_type}\x1f{source}".encode())
+        digest.update("\x1f".join(symbols).encode())
+        digest.update("\x1f".join(prices).encode())
+        digest.update("\x1f".join(missing).encode())
+        return f'"{digest.hexdigest()}"'
+
+    @staticmethod
+    def _body(layout: str, source: str, symbols: List[str], prices: List[str], missing: List[str]) -> Dict:
+        if layout == "columnar":
+            data = {"symbols": symbols, "prices": [float(p) for p in prices]}
+        else:
+            data = [{"symbol": s, "price": p} for s, p in zip(symbols, prices)]
+        return {"success": True, "data": data, "missing": missing, "source": source}
+
+    def encode(self, snapshot: List[Dict], symbols: Optional[List[str]], source: str,
+               layout: str = "columnar", use_msgpack: bool = False,
+               if_none_match: Optional[str] = None) -> Tuple[str, Optional[bytes], str]:
+        """(ETag, 본문 bytes, media type) - If-None-Match가 일치하면 본문은 None (304)"""
+        if layout not in LAYOUTS:
+            raise ValueError(f"layout은 {LAYOUTS} 중 하나여야 합니다")
+        if use_msgpack and not MSGPACK_AVAILABLE:
+            raise ValueError("msgpack이 설치되지 않았습니다")
+        media_type = MSGPACK_MEDIA_TYPE if use_msgpack else JSON_MEDIA_TYPE
+        found, prices, missing = self.select(snapshot, symbols)
+        tag = self.etag(source, found, prices, missing, layout, media_type)
+        self.requests += 1
+        if if_none_match and tag in (t.strip() for t in if_none_match.split(",")):
+            self.not_modified += 1
+            return tag, None, media_type
+
+        with self._lock:
+            body = self._encoded.get(tag)
+            if body is not None:
+                self._encoded.move_to_end(tag)
+                self.encode_hits += 1
+                return tag, body, media_type
+
+        payload = self._body(layout, source, found, prices, missing)
+        if use_msgpack:
+            body = msgpack.packb(payload, use_bin_type=True)
+        else:
+            body = json.dumps(payload, separators=(",", ":")).encode()
+        with self._lock:
+            self.encodes += 1
+            self._encoded[tag] = body
+            if len(self._encoded) > self.max_entries:
+                self._encoded.popitem(last=False)
+        return tag, body, media_type
+
+    def stats(self) -> Dict:
+        return {
+            "requests": self.requests,
+            "not_modified": self.not_modified,
+            "encode_hits": self.encode_hits,
+            "encodes": self.encodes,
+            "index_builds": self.index_builds,
+            "cached_bodies": len(self._encoded),
+            "msgpack": MSGPACK_AVAILABLE
+        }
+
+# 프로세스 전역 인코더
+price_batch_encoder = PriceBatchEncoder()
+
+# 모듈 테스트: 기존 행 형식 JSON 대비 크기/직렬화 시간
+if __name__ == "__main__":
+    import random
+    import time
+
+    snapshot = [{"symbol": f"SYM{i}USDT", "price": f"{random.uniform(0.01, 50000):.8f}"} for i in range(2000)]
+    wanted = [f"SYM{i}USDT" for i in range(0, 2000, 10)]
+    rounds = 2000
+
+    wanted_set = set(wanted)
+    started = time.perf_counter()
+    for _ in range(rounds):
+        rows = [item for item in snapshot if item["symbol"] in wanted_set]
+        baseline = json.dumps({"success": True, "data": rows, "source": "binance"}).encode()
+    baseline_us = (time.perf_counter() - started) / rounds * 1e6
+    print(f"rows json (filter+dumps): {len(baseline)} bytes, {baseline_us:.0f}µs/req")
+
+    for layout, packed in (("rows", False), ("columnar", False), ("columnar", True)):
+        if packed and not MSGPACK_AVAILABLE:
+            continue
+        encoder = PriceBatchEncoder()
+        tag, body, _ = encoder.encode(snapshot, wanted, "binance", layout, packed)
+        started = time.perf_counter()
+        for _ in range(rounds):
+            encoder.encode(snapshot, wanted, "binance", layout, packed)
+        warm_us = (time.perf_counter() - started) / rounds * 1e6
+        started = time.perf_counter()
+        for _ in range(rounds):
+            encoder.encode(snapshot, wanted, "binance", layout, packed, if_none_match=tag)
+        etag_us = (time.perf_counter() - started) / rounds * 1e6
+        name = f"{layout}{'+msgpack' if packed else ''}"
+        print(f"{name:<18} {len(body):>6} bytes, cached {warm_us:.0f}µs/req, 304 {etag_us:.0f}µs/req")
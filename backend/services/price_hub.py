@@ -0,0 +1,414 @@
+import asyncio
+import json
+import os
+import time
+from collections import deque
+from typing import Awaitable, Callable, Dict, FrozenSet, Iterable, Optional, Set, Tuple
+
+ALL_SYMBOLS = "*"
+
+class _TopicGroup:
+    """같은 심볼 집합을 구독하는 구독자 묶음 - 델타와 인코딩을 그룹 단위로 공유한다
+
+    같은 그룹 구독자의 대기 델타는 "몇 번째 틱부터 모았는가"만으로 내용이
+    정해지므로, 현재 틱 동안 (시작 틱)별 인코딩 결과를 재사용한다.
+    """
+
+    __slots__ = ("symbols", "subscribers", "delta", "tick", "_frames")
+
+    def __init__(self, symbols: Optional[FrozenSet[str]]):
+        self.symbols = symbols  # None = 전체 심볼
+        self.subscribers: Set["PriceSubscriber"] = set()
+        self.delta: Dict[str, float] = {}
+        self.tick = 0
+        self._frames: Dict[int, str] = {}
+
+    def advance(self, tick: int, delta: Dict[str, float]):
+        self.tick = tick
+        self.delta = delta
+        self._frames = {}
+
+    def frame(self, since: int, pending: Dict[str, float]) -> Tuple[str, bool]:
+        """since 틱부터 합친 델타의 인코딩 - (프레임, 공유 여부)"""
+        frame = self._frames.get(since)
+        if frame is not None:
+            return frame, True
+        frame = self._frames[since] = encode_frame("delta", self.tick, pending)
+        return frame, False
+
+def encode_frame(kind: str, tick: int, data: Dict[str, float]) -> str:
+    return json.dumps({"type": kind, "t": tick, "data": data}, separators=(",", ":"))
+
+class PriceSubscriber:
+    """구독자 하나 - 보낼 가격을 심볼별 dict로 합쳐 두고 최대 전송률로 내보낸다
+
+    전송이 밀리면 같은 심볼의 이전 가격은 덮어써지므로(오래된 업데이트 폐기)
+    대기 메모리는 구독 심볼 수를 넘지 않는다. 스냅샷/오류 같은 제어 프레임도
+    outbox를 거쳐 pump가 보내므로 소켓 전송은 항상 한 태스크만 한다.
+    """
+
+    def __init__(self, hub: "PriceHub", group: _TopicGroup, max_rate: float):
+        self.hub = hub
+        self.group = group
+        self.min_interval = 1.0 / max_rate
+        self.pending: Dict[str, float] = {}
+        self.outbox: deque = deque()  # 전송률 제한 없이 먼저 보낼 프레임 (None = 보낼 때 만드는 스냅샷)
+        self._shared = False  # pending이 group.delta 자체인지 (복사 전까지 공유)
+        self._since = 0  # pending을 모으기 시작한 틱
+        self._event = asyncio.Event()
+        self._next_send = 0.0
+        self.closed = False
+
+        # 통계
+        self.frames = 0
+        self.dropped = 0
+
+    @property
+    def symbols(self) -> Optional[FrozenSet[str]]:
+        return self.group.symbols
+
+    def offer(self, delta: Dict[str, float]):
+        """틱 델타 반영 (허브 루프에서 호출)"""
+        if not self.pending:
+            self.pending = delta
+            self._shared = True
+            self._since = self.group.tick
+        else:
+            if self._shared:
+                self.pending = dict(self.pending)
+                self._shared = False
+            before = len(self.pending) + len(delta)
+            self.pending.update(delta)
+            self.dropped += before - len(self.pending)
+        self._event.set()
+
+    def enqueue(self, message: Optional[Dict]):
+        """제어 프레임 예약 (None이면 현재가 스냅샷) - pump가 다음 델타보다 먼저 보낸다"""
+        self.outbox.append(None if message is None else json.dumps(message, separators=(",", ":")))
+        self._event.set()
+
+    def _control_frame(self) -> str:
+        frame = self.outbox.popleft()
+        if frame is None:
+            # 스냅샷은 보낼 때 만든다 - 대기 중인 델타는 스냅샷에 포함된다
+            self.pending = {}
+            self._shared = False
+            frame = self.hub.snapshot_frame(self)
+        return frame
+
+    async def next_frame(self) -> Optional[str]:
+        """다음 전송 프레임 - 제어 프레임은 바로, 델타는 최대 전송률까지 대기, 구독 종료 시 None"""
+        loop = asyncio.get_running_loop()
+        while not self.closed:
+            await self._event.wait()
+            if not self.outbox:
+                delay = self._next_send - loop.time()
+                if delay > 0:
+                    await asyncio.sleep(delay)  # 대기 중 들어온 틱은 pending에 합쳐진다
+            if self.closed:
+                break
+            if self.outbox:
+                frame = self._control_frame()
+                if not self.outbox and not self.pending:
+                    self._event.clear()
+                return frame
+            self._event.clear()
+            if not self.pending:
+                continue
+            frame, shared = self.group.frame(self._since, self.pending)
+            if shared:
+                self.hub.shared_frames += 1
+            self.pending = {}
+            self._shared = False
+            self._next_send = loop.time() + self.min_interval
+            self.frames += 1
+            self.hub.frames_sent += 1
+            return frame
+        return None
+
+    def close(self):
+        self.closed = True
+        self._event.set()
+
+class PriceHub:
+    """업스트림 가격 피드 하나를 다수 구독자에게 팬아웃
+
+    가격 이벤트(publish)는 dirty 집합에만 쌓고, max_rate 주기의 틱에서
+    변경분을 한 번 모아 구독 심볼 집합(그룹)별 델타를 만든다. 구독자는
+    자기 전송률에 맞춰 합쳐진 델타를 받고, 전송이 send_timeout 이상 막히는
+    느린 클라이언트는 끊는다.
+    """
+
+    def __init__(self, max_rate: float = 10.0, send_timeout: float = 5.0, max_subscribers: int = 10000):
+        self.max_rate = max_rate
+        self.tick_interval = 1.0 / max_rate
+        self.send_timeout = send_timeout
+        self.max_subscribers = max_subscribers
+        self.latest: Dict[str, float] = {}
+        self._dirty: Set[str] = set()
+        self._groups: Dict[Optional[FrozenSet[str]], _TopicGroup] = {}
+        self._by_symbol: Dict[str, Set[_TopicGroup]] = {}
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._flush_handle: Optional[asyncio.TimerHandle] = None
+        self._feed_task: Optional[asyncio.Task] = None
+        self.subscriber_count = 0
+
+        # 통계
+        self.tick = 0
+        self.updates = 0
+        self.frames_sent = 0
+        self.shared_frames = 0
+        self.dropped_closed = 0  # 종료된 구독자의 폐기 건수
+        self.slow_disconnects = 0
+
+    # ---- 업스트림 ----
+
+    def publish(self, symbol: str, price: float):
+        """가격 이벤트 (MarketDataStream 리스너) - 틱까지 모아 둔다"""
+        if self.latest.get(symbol) == price:
+            return
+        self.latest[symbol] = price
+        self.updates += 1
+        if not self.subscriber_count:
+            return
+        self._dirty.add(symbol)
+        if self._flush_handle is None:
+            loop = self._loop or asyncio.get_running_loop()
+            self._flush_handle = loop.call_later(self.tick_interval, self._flush)
+
+    def publish_snapshot(self, snapshot: Iterable[Dict]):
+        """ticker/price 스냅샷 형식 [{"symbol","price"}] 반영"""
+        for item in snapshot:
+            self.publish(item["symbol"], float(item["price"]))
+
+    async def run_feed(self, fetch_snapshot: Callable[[], Awaitable], interval: float = 1.0):
+        """웹소켓 스트림이 없을 때 REST 스냅샷 폴링으로 피드 (프로세스당 하나)"""
+        while True:
+            if self.subscriber_count:
+                try:
+                    snapshot = await fetch_snapshot()
+                    if isinstance(snapshot, list):
+                        self.publish_snapshot(snapshot)
+                except Exception as e:
+                    print(f"⚠️ Price hub feed error: {e}")
+            await asyncio.sleep(interval)
+
+    def start_feed(self, fetch_snapshot: Callable[[], Awaitable], interval: float = 1.0):
+        if self._feed_task is None or self._feed_task.done():
+            self._feed_task = asyncio.get_running_loop().create_task(self.run_feed(fetch_snapshot, interval))
+
+    async def stop(self):
+        """피드 중지 및 모든 구독 종료"""
+        if self._feed_task is not None:
+            self._feed_task.cancel()
+            try:
+                await self._feed_task
+            except asyncio.CancelledError:
+                pass
+            self._feed_task = None
+        for group in list(self._groups.values()):
+            for subscriber in list(group.subscribers):
+                self.unsubscribe(subscriber)
+
+    def _flush(self):
+        """틱 - 변경분을 그룹별 델타로 나눠 구독자에게 전달"""
+        self._flush_handle = None
+        if not self._dirty:
+            return
+        self.tick += 1
+        latest = self.latest
+        changed = {symbol: latest[symbol] for symbol in self._dirty}
+        self._dirty = set()
+
+        touched: Set[_TopicGroup] = set()
+        wildcard = self._groups.get(None)
+        if wildcard is not None:
+            touched.add(wildcard)
+        for symbol in changed:
+            groups = self._by_symbol.get(symbol)
+            if groups:
+                touched.update(groups)
+
+        for group in touched:
+            if group.symbols is None:
+                delta = changed
+            elif len(group.symbols) < len(changed):
+                delta = {s: changed[s] for s in group.symbols if s in changed}
+            else:
+                delta = {s: p for s, p in changed.items() if s in group.symbols}
+            if not delta:
+                continue
+            group.advance(self.tick, delta)
+            for subscriber in group.subscribers:
+                subscriber.offer(delta)
+
+    # ---- 구독 ----
+
+    def _group(self, symbols: Optional[FrozenSet[str]]) -> _TopicGroup:
+        group = self._groups.get(symbols)
+        if group is None:
+            group = self._groups[symbols] = _TopicGroup(symbols)
+            for symbol in symbols or ():
+                self._by_symbol.setdefault(symbol, set()).add(group)
+        return group
+
+    def _release_group(self, group: _TopicGroup):
+        if group.subscribers:
+            return
+        self._groups.pop(group.symbols, None)
+        for symbol in group.symbols or ():
+            groups = self._by_symbol.get(symbol)
+            if groups is not None:
+                groups.discard(group)
+                if not groups:
+                    del self._by_symbol[symbol]
+
+    @staticmethod
+    def normalize(symbols: Optional[Iterable[str]]) -> Optional[FrozenSet[str]]:
+        if symbols is None:
+            return None
+        normalized = frozenset(s.strip().upper() for s in symbols if s and s.strip())
+        return None if not normalized or ALL_SYMBOLS in normalized else normalized
+
+    def subscribe(self, symbols: Optional[Iterable[str]], max_rate: float = None) -> PriceSubscriber:
+        """구독 (symbols None/["*"] = 전체). max_rate는 허브 주기로 제한"""
+        if self.subscriber_count >= self.max_subscribers:
+            raise RuntimeError("구독자 수 한도를 초과했습니다")
+        self._loop = asyncio.get_running_loop()
+        rate = min(max_rate or self.max_rate, self.max_rate)
+        rate = max(rate, 0.1)
+        group = self._group(self.normalize(symbols))
+        subscriber = PriceSubscriber(self, group, rate)
+        group.subscribers.add(subscriber)
+        self.subscriber_count += 1
+        return subscriber
+
+    def resubscribe(self, subscriber: PriceSubscriber, symbols: Optional[Iterable[str]]):
+        """구독 심볼 변경 - 대기 중인 델타는 버리고 새 집합의 스냅샷을 보낸다"""
+        old = subscriber.group
+        old.subscribers.discard(subscriber)
+        self._release_group(old)
+        subscriber.group = self._group(self.normalize(symbols))
+        subscriber.group.subscribers.add(subscriber)
+        subscriber.pending = {}
+        subscriber._shared = False
+        subscriber.enqueue(None)
+
+    def unsubscribe(self, subscriber: PriceSubscriber):
+        if subscriber.closed:
+            return
+        subscriber.close()
+        self.dropped_closed += subscriber.dropped
+        subscriber.group.subscribers.discard(subscriber)
+        self._release_group(subscriber.group)
+        self.subscriber_count -= 1
+
+    def snapshot_frame(self, subscriber: PriceSubscriber) -> str:
+        """구독 직후 보낼 현재가 전체"""
+        symbols = subscriber.symbols
+        latest = self.latest
+        if symbols is None:
+            data = dict(latest)
+        else:
+            data = {s: latest[s] for s in symbols if s in latest}
+        return encode_frame("snapshot", self.tick, data)
+
+    async def _send(self, send: Callable[[str], Awaitable], frame: str):
+        # asyncio.timeout은 별도 태스크를 만들지 않는다 (wait_for는 3.11 이하에서 태스크 생성)
+        if hasattr(asyncio, "timeout"):
+            async with asyncio.timeout(self.send_timeout):
+                await send(frame)
+        else:
+            await asyncio.wait_for(send(frame), self.send_timeout)
+
+    async def pump(self, subscriber: PriceSubscriber, send: Callable[[str], Awaitable]):
+        """구독자 전송 루프 - 스냅샷 후 델타, send가 send_timeout 넘게 막히면 끊는다"""
+        try:
+            await self._send(send, self.snapshot_frame(subscriber))
+            while True:
+                frame = await subscriber.next_frame()
+                if frame is None:
+                    return
+                await self._send(send, frame)
+        except asyncio.TimeoutError:
+            self.slow_disconnects += 1
+        finally:
+            self.unsubscribe(subscriber)
+
+    def stats(self) -> Dict:
+        return {
+            "subscribers": self.subscriber_count,
+            "groups": len(self._groups),
+            "symbols": len(self.latest),
+            "tick": self.tick,
+            "updates": self.updates,
+            "frames_sent": self.frames_sent,
+            "shared_frames": self.shared_frames,
+            "dropped_updates": self.dropped_closed + sum(s.dropped for g in self._groups.values() for s in g.subscribers),
+            "slow_disconnects": self.slow_disconnects,
+            "max_rate": self.max_rate
+        }
+
+# 프로세스 전역 허브
+price_hub = PriceHub(
+    max_rate=float(os.getenv("PRICE_STREAM_MAX_RATE", "10")),
+    send_timeout=float(os.getenv("PRICE_STREAM_SEND_TIMEOUT", "5")),
+    max_subscribers=int(os.getenv("PRICE_STREAM_MAX_SUBSCRIBERS", "10000"))
+)
+
+# 모듈 테스트: python -m services.price_hub [구독자 수 ...]
+# 전체 시장 1초 스냅샷 + 인기 심볼 20Hz 틱을 흘리며 구독자 수별 루프 CPU 사용률 측정
+if __name__ == "__main__":
+    import random
+    import sys
+
+    async def bench(subscriber_count: int, seconds: float = 5.0, market_size: int = 2000) -> Dict:
+        hub = PriceHub(max_rate=10)
+        symbols = [f"SYM{i}USDT" for i in range(market_size)]
+        hot = symbols[:20]
+        watchlists = [symbols[i * 25:(i + 1) * 25] for i in range(40)]  # 시세 그리드 페이지
+        received = [0]
+
+        async def fast_send(frame):
+            received[0] += 1
+
+        async def slow_send(frame):
+            received[0] += 1
+            await asyncio.sleep(1.0)
+
+        tasks = []
+        for i in range(subscriber_count):
+            watch = None if i % 10 == 0 else random.choice(watchlists)
+            rate = random.choice((1, 2, 5, 10))
+            subscriber = hub.subscribe(watch, rate)
+            tasks.append(asyncio.create_task(hub.pump(subscriber, slow_send if i % 20 == 0 else fast_send)))
+
+        async def feed():
+            prices = {s: 100.0 for s in symbols}
+            step = 0
+            while True:
+                for s in hot:
+                    prices[s] *= 1 + random.uniform(-1e-4, 1e-4)
+                    hub.publish(s, prices[s])
+                if step % 20 == 0:
+                    for s in symbols:
+                        prices[s] *= 1 + random.uniform(-1e-4, 1e-4)
+                        hub.publish(s, prices[s])
+                step += 1
+                await asyncio.sleep(0.05)
+
+        feed_task = asyncio.create_task(feed())
+        cpu0, wall0 = time.process_time(), time.perf_counter()
+        await asyncio.sleep(seconds)
+        cpu, wall = time.process_time() - cpu0, time.perf_counter() - wall0
+        stats = hub.stats()
+        feed_task.cancel()
+        await hub.stop()
+        await asyncio.gather(*tasks, feed_task, return_exceptions=True)
+        return {"cpu_pct": cpu / wall * 100, "frames_per_s": received[0] / wall, **stats}
+
+    counts = [int(a) for a in sys.argv[1:]] or [100, 1000, 5000]
+    for count in counts:
+        r = asyncio.run(bench(count))
+        print(f"{count:>6} subscribers: loop CPU {r['cpu_pct']:5.1f}%  {r['frames_per_s']:>8.0f} frames/s  "
+              f"groups {r['groups']:>3}  shared {r['shared_frames']:>7}  dropped {r['dropped_updates']:>8}")
@@ -0,0 +1,122 @@
+import asyncio
+import os
+import threading
+import time
+from typing import Dict, Mapping, Optional
+
+# 바이낸스 현물 REQUEST_WEIGHT 한도 (IP 기준, 1분)
+REQUEST_WEIGHT_LIMIT = 6000
+REQUEST_WEIGHT_WINDOW = 60.0
+
+# 엔드포인트별 가중치 (심볼 지정, 심볼 미지정)
+ENDPOINT_WEIGHTS = {
+    "ticker/price": (2, 4),
+    "ticker/24hr": (2, 80),
+    "exchangeInfo": (20, 20),
+    "account": (20, 20),
+    "klines": (2, 2),
+    "time": (1, 1),
+}
+DEFAULT_WEIGHT = 1
+
+def request_weight(endpoint: str, params: Dict = None) -> int:
+    """요청 가중치 계산"""
+    weights = ENDPOINT_WEIGHTS.get(endpoint)
+    if weights is None:
+        return DEFAULT_WEIGHT
+    with_symbol, without_symbol = weights
+    if params and (params.get("symbol") or params.get("symbols")):
+        return with_symbol
+    return without_symbol
+
+class WeightRateLimiter:
+    """요청 가중치 기반 토큰 버킷
+
+    가중치를 미리 차감(예약)하고 부족분만큼만 대기하므로 호출자마다 한 번만 잔다.
+    비동기 호출자는 acquire_async()로 이벤트 루프를 막지 않고 대기한다.
+    응답의 X-MBX-USED-WEIGHT 헤더로 서버 기준 사용량에 맞춰 잔량을 보정한다.
+    """
+
+    def __init__(self, capacity: int = REQUEST_WEIGHT_LIMIT, window: float = REQUEST_WEIGHT_WINDOW):
+        self.capacity = capacity
+        self.refill_rate = capacity / window
+        self.tokens = float(capacity)
+        self._updated = time.monotonic()
+        self._blocked_until = 0.0
+        self._lock = threading.Lock()
+
+        # 통계
+        self.requests = 0
+        self.weight_used = 0
+        self.throttled = 0
+        self.server_used_weight: Optional[int] = None
+
+    def _refill(self, now: float):
+        self.tokens = min(self.capacity, self.tokens + (now - self._updated) * self.refill_rate)
+        self._updated = now
+
+    def reserve(self, weight: int) -> float:
+        """가중치 예약 후 대기해야 할 시간(초) 반환"""
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            self.tokens -= weight
+            self.requests += 1
+            self.weight_used += weight
+            delay = max(0.0, -self.tokens / self.refill_rate, self._blocked_until - now)
+            if delay > 0:
+                self.throttled += 1
+            return delay
+
+    def acquire(self, weight: int = DEFAULT_WEIGHT):
+        """동기 호출자용 - 필요한 경우에만 대기"""
+        delay = self.reserve(weight)
+        if delay > 0:
+            time.sleep(delay)
+
+    async def acquire_async(self, weight: int = DEFAULT_WEIGHT):
+        """비동기 호출자용 - 이벤트 루프를 막지 않고 대기"""
+        delay = self.reserve(weight)
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    def update_from_headers(self, headers: Mapping[str, str]):
+        """X-MBX-USED-WEIGHT(-1M) 헤더로 잔량 보정"""
+        used = headers.get("X-MBX-USED-WEIGHT-1M") or headers.get("X-MBX-USED-WEIGHT")
+        if used is None:
+            return
+        try:
+            used = int(used)
+        except ValueError:
+            return
+        with self._lock:
+            self._refill(time.monotonic())
+            self.server_used_weight = used
+            self.tokens = min(self.tokens, self.capacity - used)
+
+    def penalize(self, retry_after: Optional[str] = None):
+        """429/418 응답 시 Retry-After 동안 모든 요청 차단"""
+        try:
+            seconds = float(retry_after) if retry_after else REQUEST_WEIGHT_WINDOW
+        except ValueError:
+            seconds = REQUEST_WEIGHT_WINDOW
+        with self._lock:
+            self._blocked_until = max(self._blocked_until, time.monotonic() + seconds)
+            print(f"⚠️ Binance rate limit hit - backing off {seconds:.0f}s")
+
+    def stats(self) -> Dict:
+        """사용량 통계"""
+        with self._lock:
+            self._refill(time.monotonic())
+            return {
+                "capacity": self.capacity,
+                "available": round(self.tokens, 1),
+                "requests": self.requests,
+                "weight_used": self.weight_used,
+                "throttled": self.throttled,
+                "server_used_weight": self.server_used_weight,
+                "blocked_for": round(max(0.0, self._blocked_until - time.monotonic()), 3)
+            }
+
+# 프로세스 전역 리미터 (모든 BinanceService 인스턴스가 공유)
+binance_rate_limiter = WeightRateLimiter(capacity=int(os.getenv("BINANCE_WEIGHT_LIMIT", str(REQUEST_WEIGHT_LIMIT))))
@@ -3,12 +3,25 @@ from binance.enums import *
 import pandas as pd
 from typing import Dict, List
 import time
+from services.kline_store import KlineStore, futures_kline_store
+from services.order_executor import BinanceClientGateway, OrderExecutor, order_executor
+
+# 요청별 HTTP 타임아웃 (초) - 무응답 주문이 봇 스레드를 붙잡지 않도록
+REQUEST_TIMEOUT = 10
 
 class RealBinanceService:
-    def __init__(self, api_key: str, api_secret: str, testnet: bool = True):
-        self.client = Client(api_key, api_secret, testnet=testnet)
+    def __init__(self, api_key: str, api_secret: str, testnet: bool = True, kline_store: KlineStore = None,
+                 executor: OrderExecutor = None):
+        self.client = Client(api_key, api_secret, requests_params={"timeout": REQUEST_TIMEOUT}, testnet=testnet)
         self.is_testnet = testnet
         self.connected = True
+        self.kline_store = kline_store or futures_kline_store
+        self.executor = executor or order_executor
+        self.order_gateway = BinanceClientGateway(self.client)
+    
+    def close(self):
+        """HTTP 세션 종료 (클라이언트 풀에서 내보낼 때)"""
+        self.client.close_connection()
     
     def get_real_account_info(self):
         """실제 계좌 정보 조회"""
@@ -22,15 +35,24 @@ class RealBinanceService:
         except Exception as e:
             return {"status": "error", "message": str(e), "connected": False}
     
-    def place_real_order(self, symbol: str, side: str, quantity: float, order_type: str = "MARKET"):
-        """실제 주문 실행"""
+    def place_real_order(self, symbol: str, side: str, quantity: float, order_type: str = "MARKET",
+                         reduce_only: bool = False, client_order_id: str = None):
+        """실제 주문 실행 (reduce_only: 포지션 청산 전용, client_order_id: 재시도 중복 방지 ID)
+
+        주문 실행 큐를 거쳐 일시적 오류는 같은 ID로 재시도한다.
+        """
+        return self.executor.execute(
+            self.order_gateway, symbol, side, quantity,
+            order_type=order_type, reduce_only=reduce_only, client_order_id=client_order_id
+        )
+    
+    def _fetch_klines(self, symbol: str, interval: str, limit: int) -> List[list]:
+        return self.client.futures_klines(symbol=symbol, interval=interval, limit=limit)
+    
+    def get_real_time_chart_data(self, symbol: str, interval: str = "15m", limit: int = 50):
+        """실시간 차트 데이터 (kline 저장소 경유 - 최초 백필 후 증분 갱신)"""
         try:
-            order = self.client.futures_create_order(
-                symbol=symbol,
-                side=side,
-                type=order_type,
-                quantity=quantity
-            )
-            return {"status": "success", "order": order}
+            data = self.kline_store.get_window(symbol, interval, limit, self._fetch_klines)
+            return {"status": "success", "symbol": symbol, "interval": interval, "data": data}
         except Exception as e:
-            return {"status": "error", "message": str(e)}
\ No newline at end of file
+            return {"status": "error", "message": str(e)}
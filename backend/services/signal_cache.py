@@ -0,0 +1,203 @@
+import asyncio
+import threading
+import time
+from collections import OrderedDict
+from typing import Awaitable, Callable, Dict, Hashable, Optional, Tuple
+
+from .kline_store import INTERVAL_MS
+
+def last_closed_open_time(interval: str, now_ms: float = None) -> int:
+    """현재 시각 기준 마지막으로 마감된 봉의 open time (ms)"""
+    interval_ms = INTERVAL_MS[interval]
+    now_ms = time.time() * 1000 if now_ms is None else now_ms
+    return int(now_ms // interval_ms - 1) * interval_ms
+
+def params_key(params: Optional[Dict]) -> Tuple:
+    """파라미터 dict -> 해시 가능한 정렬 튜플"""
+    return tuple(sorted((params or {}).items()))
+
+class SignalCache:
+    """마감 봉 기준 신호 메모이제이션
+
+    키는 (symbol, interval, strategy, params, 마지막 마감 봉 open time).
+    시리즈(symbol, interval, strategy, params)마다 최신 봉의 값 하나만 두므로
+    새 봉이 마감되면 키가 바뀌어 자동으로 무효화된다. 같은 키의 동시 미스는
+    계산 한 번으로 합친다 (스레드는 Event, 코루틴은 Future).
+    """
+
+    def __init__(self, max_series: int = 4096, wait_timeout: float = 30):
+        self.max_series = max_series
+        self.wait_timeout = wait_timeout
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[Tuple, Tuple[int, object]]" = OrderedDict()
+        self._inflight: Dict[Tuple, threading.Event] = {}
+        self._async_inflight: Dict[Tuple, asyncio.Future] = {}
+
+        # 통계
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.computes = 0
+        self.errors = 0
+        self.compute_seconds = 0.0
+        self.max_compute_seconds = 0.0
+
+    @staticmethod
+    def _series(symbol: str, interval: str, strategy: str, params: Optional[Dict]) -> Tuple:
+        return symbol.upper(), interval, strategy, params_key(params)
+
+    def _lookup(self, series: Tuple, candle_time: int):
+        entry = self._entries.get(series)
+        if entry is not None and entry[0] == candle_time:
+            self._entries.move_to_end(series)
+            return True, entry[1]
+        return False, None
+
+    def _store(self, series: Tuple, candle_time: int, value, elapsed: float):
+        self.computes += 1
+        self.compute_seconds += elapsed
+        self.max_compute_seconds = max(self.max_compute_seconds, elapsed)
+        entry = self._entries.get(series)
+        if entry is not None and entry[0] > candle_time:
+            return  # 늦게 끝난 이전 봉 계산은 최신 값을 덮지 않는다
+        self._entries[series] = (candle_time, value)
+        self._entries.move_to_end(series)
+        while len(self._entries) > self.max_series:
+            self._entries.popitem(last=False)
+
+    def get(self, symbol: str, interval: str, strategy: str, params: Optional[Dict],
+            compute: Callable[[], object], candle_time: int = None):
+        """캐시 조회 - 미스면 compute() (candle_time 생략 시 시계 기준 마지막 마감 봉)"""
+        if candle_time is None:
+            candle_time = last_closed_open_time(interval)
+        series = self._series(symbol, interval, strategy, params)
+        key = series + (candle_time,)
+        while True:
+            with self._lock:
+                found, value = self._lookup(series, candle_time)
+                if found:
+                    self.hits += 1
+                    return value
+                event = self._inflight.get(key)
+                is_leader = event is None
+                if is_leader:
+                    event = self._inflight[key] = threading.Event()
+                    self.misses += 1
+                else:
+                    self.coalesced += 1
+            if is_leader:
+                break
+            # 리더 계산 대기 후 다시 조회 (리더 실패 시 새 리더가 된다)
+            if not event.wait(self.wait_timeout):
+                raise TimeoutError(f"signal compute timed out: {key}")
+
+        started = time.perf_counter()
+        try:
+            value = compute()
+        except Exception:
+            with self._lock:
+                self.errors += 1
+            raise
+        else:
+            with self._lock:
+                self._store(series, candle_time, value, time.perf_counter() - started)
+            return value
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+            event.set()
+
+    async def aget(self, symbol: str, interval: str, strategy: str, params: Optional[Dict],
+                   compute: Callable[[], Awaitable], candle_time: int = None):
+        """비동기 조회 - compute는 코루틴 함수 (시세 조회 포함 가능)"""
+        if candle_time is None:
+            candle_time = last_closed_open_time(interval)
+        series = self._series(symbol, interval, strategy, params)
+        key = series + (candle_time,)
+        while True:
+            with self._lock:
+                found, value = self._lookup(series, candle_time)
+                if found:
+                    self.hits += 1
+                    return value
+                future = self._async_inflight.get(key)
+                is_leader = future is None
+                if is_leader:
+                    future = self._async_inflight[key] = asyncio.get_running_loop().create_future()
+                    self.misses += 1
+                else:
+                    self.coalesced += 1
+            if is_leader:
+                break
+            await asyncio.wait_for(asyncio.shield(future), self.wait_timeout)
+
+        started = time.perf_counter()
+        try:
+            value = await compute()
+        except Exception:
+            with self._lock:
+                self.errors += 1
+            raise
+        else:
+            with self._lock:
+                self._store(series, candle_time, value, time.perf_counter() - started)
+            return value
+        finally:
+            with self._lock:
+                self._async_inflight.pop(key, None)
+            if not future.done():
+                future.set_result(None)
+
+    def invalidate(self, symbol: str = None):
+        """강제 무효화 (symbol 생략 시 전체)"""
+        with self._lock:
+            if symbol is None:
+                self._entries.clear()
+                return
+            for series in [s for s in self._entries if s[0] == symbol.upper()]:
+                del self._entries[series]
+
+    def stats(self) -> Dict:
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "coalesced": self.coalesced,
+                "hit_ratio": round(self.hits / total, 4) if total else 0.0,
+                "computes": self.computes,
+                "errors": self.errors,
+                "avg_compute_ms": round(self.compute_seconds / self.computes * 1000, 3) if self.computes else 0.0,
+                "max_compute_ms": round(self.max_compute_seconds * 1000, 3)
+            }
+
+# 프로세스 전역 신호 캐시
+signal_cache = SignalCache()
+
+# 모듈 테스트: 같은 봉에 대한 동시 요청 100개 -> 계산 1회
+if __name__ == "__main__":
+    from concurrent.futures import ThreadPoolExecutor
+
+    cache = SignalCache()
+    calls = []
+
+    def slow_compute():
+        calls.append(1)
+        time.sleep(0.2)
+        return {"action": "BUY"}
+
+    with ThreadPoolExecutor(max_workers=32) as pool:
+        results = list(pool.map(lambda _: cache.get("BTCUSDT", "15m", "trend_following", None, slow_compute),
+                                range(100)))
+    print(f"threads: {len(results)} results, {len(calls)} compute(s)")
+
+    async def main():
+        async def fetch_and_compute():
+            calls.append(1)
+            await asyncio.sleep(0.2)
+            return {"action": "SELL"}
+        await asyncio.gather(*(cache.aget("ETHUSDT", "1m", "breakout", {"window": 20}, fetch_and_compute)
+                               for _ in range(100)))
+    asyncio.run(main())
+    print(f"total computes: {len(calls)}  stats: {cache.stats()}")
@@ -0,0 +1,254 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Set, Tuple
+
+from services.auto_trading_bot import AutoTradingBot
+from services.kline_store import INTERVAL_MS
+from services.position_book import PositionBook, position_book
+from services.exit_monitor import exit_monitor
+from services.client_pool import ClientPool, real_binance_pool
+
+class TradingSession:
+    """(사용자, 심볼, 전략) 자동매매 세션"""
+
+    def __init__(self, user_id: int, symbol: str, strategy: str, quantity: float,
+                 binance_service, interval: str = "15m", pool_key=None):
+        self.user_id = user_id
+        self.symbol = symbol.upper()
+        self.strategy = strategy
+        self.quantity = quantity
+        self.interval = interval
+        self.binance_service = binance_service
+        self.pool_key = pool_key  # 클라이언트 풀 키 (세션 동안 고정)
+        self.bot = AutoTradingBot(user_id=user_id, interval=interval)
+        self.bot.set_strategy(strategy)
+        self.bot.is_running = True
+        self.started_at = time.time()
+
+        # 상태
+        self.evaluations = 0
+        self.orders = 0
+        self.last_evaluated_at: Optional[float] = None
+        self.last_error: Optional[str] = None
+
+    @property
+    def session_id(self) -> str:
+        return f"{self.user_id}:{self.symbol}:{self.strategy}"
+
+    def evaluate(self, candles: List[Dict]):
+        """마감 봉 기준 한 번 평가 (워커 스레드에서 실행)"""
+        try:
+            result = self.bot.process_candles(self.binance_service, self.symbol, self.quantity, candles)
+            if result is not None and result.get("status") == "success":
+                self.orders += 1
+            self.last_error = None
+        except Exception as e:
+            self.last_error = str(e)
+            print(f"❌ 세션 평가 에러 ({self.session_id}): {e}")
+        self.evaluations += 1
+        self.last_evaluated_at = time.time()
+
+    def get_status(self) -> Dict:
+        analysis = self.bot.last_analysis or {}
+        return {
+            "session_id": self.session_id,
+            "symbol": self.symbol,
+            "strategy": self.strategy,
+            "interval": self.interval,
+            "quantity": self.quantity,
+            "is_running": self.bot.is_running,
+            "started_at": self.started_at,
+            "evaluations": self.evaluations,
+            "orders": self.orders,
+            "last_evaluated_at": self.last_evaluated_at,
+            "last_signal": analysis.get("action"),
+            "last_confidence": analysis.get("confidence"),
+            "last_error": self.last_error,
+            "active_positions": int(self.bot.book.has_open(self.user_id, self.symbol))
+        }
+
+class TradingScheduler:
+    """다중 사용자/심볼 자동매매 스케줄러
+
+    전용 스레드의 asyncio 루프 하나에서 (심볼, 인터벌) 그룹마다 코루틴 하나를
+    돌린다. 그룹은 캔들 마감 시각에 맞춰 깨어나 시세를 한 번만 조회하고,
+    그룹의 모든 세션을 제한된 워커 풀에서 평가한다 (주문 호출은 블로킹이므로).
+    """
+
+    def __init__(self, max_workers: int = 16, window: int = 50, close_delay: float = 1.5,
+                 reconcile_interval: float = 60.0, book: PositionBook = None, client_pool: ClientPool = None):
+        self.window = window
+        self.close_delay = close_delay
+        self.reconcile_interval = reconcile_interval
+        self.book = book or position_book
+        self.client_pool = client_pool or real_binance_pool
+        self._reconcile_task: Optional[asyncio.Task] = None
+        self.sessions: Dict[str, TradingSession] = {}
+        self.groups: Dict[Tuple[str, str], Set[str]] = {}
+        self._group_tasks: Dict[Tuple[str, str], asyncio.Task] = {}
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="trading")
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    # ---- 루프 관리 ----
+
+    def _ensure_loop(self):
+        with self._lock:
+            if self._loop is not None:
+                return
+            self._loop = asyncio.new_event_loop()
+            self._thread = threading.Thread(target=self._loop.run_forever, daemon=True, name="trading-scheduler")
+            self._thread.start()
+
+    def shutdown(self):
+        """모든 세션 중지 및 루프 종료"""
+        for session_id in list(self.sessions):
+            self.remove_session(session_id)
+        if self._loop is not None:
+            asyncio.run_coroutine_threadsafe(self._cancel_groups(), self._loop).result(timeout=5)
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._thread.join(timeout=5)
+            self._loop = None
+        self._executor.shutdown(wait=False)
+
+    async def _cancel_groups(self):
+        tasks = list(self._group_tasks.values())
+        if self._reconcile_task is not None:
+            tasks.append(self._reconcile_task)
+            self._reconcile_task = None
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    # ---- 세션 관리 (임의 스레드에서 호출) ----
+
+    def add_session(self, user_id: int, symbol: str, strategy: str, quantity: float,
+                    binance_service, interval: str = "15m", pool_key=None) -> Dict:
+        """세션 등록 (pool_key가 있으면 세션 동안 풀의 클라이언트를 고정)"""
+        session = TradingSession(user_id, symbol, strategy, quantity, binance_service, interval, pool_key)
+        if strategy not in session.bot.ai_engine.strategies:
+            return {"status": "error", "message": "지원하지 않는 전략"}
+        if interval not in INTERVAL_MS:
+            return {"status": "error", "message": "지원하지 않는 인터벌"}
+        self._ensure_loop()
+        key = (session.symbol, interval)
+        with self._lock:
+            if session.session_id in self.sessions:
+                return {"status": "error", "message": "이미 실행 중입니다"}
+            self.sessions[session.session_id] = session
+            self.groups.setdefault(key, set()).add(session.session_id)
+        if pool_key is not None:
+            self.client_pool.hold(pool_key)
+        self._loop.call_soon_threadsafe(self._ensure_group_task, key)
+        return {"status": "success", "message": "자동매매 시작됨", "session_id": session.session_id}
+
+    def remove_session(self, session_id: str) -> bool:
+        """세션 중지"""
+        with self._lock:
+            session = self.sessions.pop(session_id, None)
+            if session is None:
+                return False
+            session.bot.is_running = False
+            members = self.groups.get((session.symbol, session.interval))
+            if members is not None:
+                members.discard(session_id)
+        if session.pool_key is not None:
+            self.client_pool.release(session.pool_key)
+        return True
+
+    def stop_user_sessions(self, user_id: int, symbol: str = None) -> int:
+        """사용자 세션 일괄 중지"""
+        targets = [s.session_id for s in self.user_sessions(user_id)
+                   if symbol is None or s.symbol == symbol.upper()]
+        return sum(self.remove_session(session_id) for session_id in targets)
+
+    def user_sessions(self, user_id: int) -> List[TradingSession]:
+        with self._lock:
+            return [s for s in self.sessions.values() if s.user_id == user_id]
+
+    def get_status(self, user_id: int = None) -> Dict:
+        """세션별 상태"""
+        sessions = self.user_sessions(user_id) if user_id is not None else list(self.sessions.values())
+        return {
+            "is_running": bool(sessions),
+            "total_sessions": len(self.sessions),
+            "groups": len(self._group_tasks),
+            "sessions": [s.get_status() for s in sessions]
+        }
+
+    # ---- 그룹 루프 (스케줄러 스레드) ----
+
+    def _ensure_group_task(self, key: Tuple[str, str]):
+        task = self._group_tasks.get(key)
+        if task is None or task.done():
+            self._group_tasks[key] = self._loop.create_task(self._group_loop(key))
+        if self._reconcile_task is None or self._reconcile_task.done():
+            self._reconcile_task = self._loop.create_task(self._reconcile_loop())
+
+    def _group_members(self, key: Tuple[str, str]) -> List[TradingSession]:
+        with self._lock:
+            return [self.sessions[sid] for sid in self.groups.get(key, ()) if sid in self.sessions]
+
+    async def _group_loop(self, key: Tuple[str, str]):
+        symbol, interval = key
+        interval_ms = INTERVAL_MS[interval]
+        loop = asyncio.get_running_loop()
+        try:
+            while True:
+                # 다음 캔들 마감까지 대기
+                now_ms = time.time() * 1000
+                next_close = (now_ms // interval_ms + 1) * interval_ms
+                await asyncio.sleep((next_close - now_ms) / 1000 + self.close_delay)
+
+                members = self._group_members(key)
+                if not members:
+                    break
+
+                # 그룹 시세 1회 조회 (kline 데이터는 공개 데이터라 아무 세션 서비스나 사용)
+                fetch = members[0].binance_service.get_real_time_chart_data
+                chart_data = await loop.run_in_executor(self._executor, fetch, symbol, interval, self.window + 1)
+                if chart_data.get("status") != "success":
+                    print(f"⚠️ 시세 조회 실패 ({symbol} {interval}): {chart_data.get('message')}")
+                    continue
+                if chart_data["data"]:
+                    # 웹소켓 가격 이벤트가 없을 때를 대비해 최신가로도 손절/익절 확인
+                    last_price = chart_data["data"][-1]["close"]
+                    self.book.update_mark(symbol, last_price)
+                    exit_monitor.on_price(symbol, last_price)
+
+                # 마감된 봉만 사용 - 마지막 원소가 방금 마감된 봉
+                cutoff = time.time() * 1000
+                candles = [c for c in chart_data["data"] if c["timestamp"] + interval_ms <= cutoff]
+                if not candles:
+                    continue
+
+                await asyncio.gather(*(
+                    loop.run_in_executor(self._executor, session.evaluate, candles)
+                    for session in members
+                ))
+        finally:
+            with self._lock:
+                if not self.groups.get(key):
+                    self.groups.pop(key, None)
+                if self._group_tasks.get(key) is asyncio.current_task():
+                    self._group_tasks.pop(key, None)
+
+    async def _reconcile_loop(self):
+        """사용자별 거래소 포지션과 장부 주기적 동기화"""
+        loop = asyncio.get_running_loop()
+        while True:
+            await asyncio.sleep(self.reconcile_interval)
+            services = {}
+            with self._lock:
+                for session in self.sessions.values():
+                    services.setdefault(session.user_id, session.binance_service)
+            await asyncio.gather(*(
+                loop.run_in_executor(self._executor, self.book.reconcile_account, user_id, service)
+                for user_id, service in services.items()
+            ), return_exceptions=True)
+
+# 프로세스 전역 스케줄러
+trading_scheduler = TradingScheduler()
@@ -0,0 +1,140 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session, object_session
+
+# 캐시할 사용자 필드 (세션과 무관한 스냅샷으로 보관)
+PRINCIPAL_FIELDS = ("id", "email", "full_name", "is_active", "created_at")
+
+class UserPrincipal:
+    """인증된 사용자 스냅샷 - 요청 간 공유되므로 DB 세션에 묶이지 않는다"""
+
+    __slots__ = PRINCIPAL_FIELDS
+
+    def __init__(self, **fields):
+        for name in PRINCIPAL_FIELDS:
+            setattr(self, name, fields.get(name))
+
+    @classmethod
+    def from_user(cls, user) -> "UserPrincipal":
+        return cls(**{name: getattr(user, name, None) for name in PRINCIPAL_FIELDS})
+
+class UserPrincipalCache:
+    """토큰 subject(이메일) -> 사용자 스냅샷 캐시
+
+    항목 수명은 max_ttl과 토큰 exp 중 이른 쪽. 사용자 수정/삭제 시
+    watch_user_model로 건 SQLAlchemy 이벤트가 flush와 commit 때 해당 항목을 지운다.
+    """
+
+    def __init__(self, max_ttl: float = 300.0, max_size: int = 10000):
+        self.max_ttl = max_ttl
+        self.max_size = max_size
+        self._entries: "OrderedDict[str, Tuple[UserPrincipal, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+        # 통계
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        self.evictions = 0
+
+    def get(self, subject: str) -> Optional[UserPrincipal]:
+        with self._lock:
+            entry = self._entries.get(subject)
+            if entry is not None and entry[1] > time.time():
+                self._entries.move_to_end(subject)
+                self.hits += 1
+                return entry[0]
+            if entry is not None:
+                del self._entries[subject]
+            self.misses += 1
+            return None
+
+    def put(self, subject: str, user, exp: float = None) -> UserPrincipal:
+        """DB에서 읽은 사용자 저장 - exp는 토큰 만료 시각 (epoch 초)"""
+        principal = user if isinstance(user, UserPrincipal) else UserPrincipal.from_user(user)
+        expires_at = time.time() + self.max_ttl
+        if exp is not None:
+            expires_at = min(expires_at, float(exp))
+        with self._lock:
+            self._entries[subject] = (principal, expires_at)
+            self._entries.move_to_end(subject)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+        return principal
+
+    def invalidate(self, subject: str):
+        with self._lock:
+            if self._entries.pop(subject, None) is not None:
+                self.invalidations += 1
+
+    def invalidate_user_id(self, user_id: int):
+        with self._lock:
+            stale = [s for s, (principal, _) in self._entries.items() if principal.id == user_id]
+            for subject in stale:
+                del self._entries[subject]
+            self.invalidations += len(stale)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict:
+        """캐시 통계"""
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "max_ttl": self.max_ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": round(self.hits / total, 4) if total else 0.0,
+                "invalidations": self.invalidations,
+                "evictions": self.evictions
+            }
+
+# 프로세스 전역 캐시
+user_cache = UserPrincipalCache()
+
+_watched = set()
+
+# 세션별 커밋 대기 중인 무효화 (cache, user_id, subjects)
+_PENDING_KEY = "user_cache_pending"
+
+def _evict(cache: UserPrincipalCache, user_id, subjects):
+    cache.invalidate_user_id(user_id)
+    for subject in subjects:
+        cache.invalidate(subject)
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_committed(session):
+    """flush~commit 사이에 다른 요청이 이전 행을 다시 캐시했을 수 있으므로 커밋 후 한 번 더"""
+    for cache, user_id, subjects in session.info.pop(_PENDING_KEY, ()):
+        _evict(cache, user_id, subjects)
+
+@event.listens_for(Session, "after_rollback")
+def _discard_pending(session):
+    session.info.pop(_PENDING_KEY, None)
+
+def watch_user_model(model, cache: UserPrincipalCache = None, subject_field: str = "email"):
+    """User 모델 수정/삭제 시 캐시 무효화 (이메일 변경 시 이전 값도)"""
+    cache = cache or user_cache
+    if (model, id(cache)) in _watched:
+        return
+    _watched.add((model, id(cache)))
+
+    def _invalidate(mapper, connection, target):
+        history = inspect(target).attrs[subject_field].history
+        subjects = list(history.deleted or ()) + [getattr(target, subject_field)]
+        _evict(cache, target.id, subjects)
+        session = object_session(target)
+        if session is not None:
+            session.info.setdefault(_PENDING_KEY, []).append((cache, target.id, subjects))
+
+    event.listen(model, "after_update", _invalidate)
+    event.listen(model, "after_delete", _invalidate)
@@ -1,14 +1,38 @@
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import make_url
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+import os
 
-# SQLite 데이터베이스
-DATABASE_URL = "sqlite:///./coin_ai_platform.db"
+# SQLite 데이터베이스 (DATABASE_URL로 PostgreSQL 등 지정 가능)
+DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./coin_ai_platform.db")
+IS_SQLITE = make_url(DATABASE_URL).get_backend_name() == "sqlite"
 
-engine = create_engine(
-    DATABASE_URL, 
-    connect_args={"check_same_thread": False}
-)
+ENGINE_OPTIONS = {
+    "pool_size": int(os.getenv("DB_POOL_SIZE", "10")),
+    "max_overflow": int(os.getenv("DB_MAX_OVERFLOW", "20")),
+    "pool_timeout": float(os.getenv("DB_POOL_TIMEOUT", "30")),
+}
+if IS_SQLITE:
+    ENGINE_OPTIONS["connect_args"] = {"check_same_thread": False, "timeout": 5}
+else:
+    ENGINE_OPTIONS["pool_recycle"] = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+    ENGINE_OPTIONS["pool_pre_ping"] = True
+# aiosqlite 파일 DB의 기본 풀은 NullPool (풀 크기 인자 거부) - 비동기 엔진은 풀을 명시
+ASYNC_ENGINE_OPTIONS = dict(ENGINE_OPTIONS, poolclass=AsyncAdaptedQueuePool) if IS_SQLITE else ENGINE_OPTIONS
+
+def _sqlite_pragmas(dbapi_connection, connection_record):
+    """WAL 모드 + 잠금 대기 (로그인/가입 동시 처리 시 database is locked 방지)"""
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute("PRAGMA synchronous=NORMAL")
+    cursor.execute("PRAGMA busy_timeout=5000")
+    cursor.close()
+
+engine = create_engine(DATABASE_URL, **ENGINE_OPTIONS)
+if IS_SQLITE:
+    event.listen(engine, "connect", _sqlite_pragmas)
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 Base = declarative_base()
@@ -19,3 +43,26 @@ def get_db():
         yield db
     finally:
         db.close()
+
+# 비동기 엔진 (선택 - aiosqlite / asyncpg 필요)
+ASYNC_DRIVERS = {"sqlite": "sqlite+aiosqlite", "postgresql": "postgresql+asyncpg"}
+try:
+    from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+    _url = make_url(DATABASE_URL)
+    async_engine = create_async_engine(
+        _url.set(drivername=ASYNC_DRIVERS.get(_url.drivername, _url.drivername)).render_as_string(hide_password=False),
+        **ASYNC_ENGINE_OPTIONS
+    )
+    if IS_SQLITE:
+        event.listen(async_engine.sync_engine, "connect", _sqlite_pragmas)
+    AsyncSessionLocal = async_sessionmaker(async_engine, expire_on_commit=False, autoflush=False)
+except ImportError:
+    async_engine = None
+    AsyncSessionLocal = None
+
+async def get_async_db():
+    if AsyncSessionLocal is None:
+        raise RuntimeError("async DB driver not installed (aiosqlite / asyncpg)")
+    async with AsyncSessionLocal() as db:
+        yield db
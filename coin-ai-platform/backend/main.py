@@ -2,6 +2,7 @@ from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from database.database import engine, Base
 from routes import auth, exchange
+from services.auth_service import password_hasher
 
 # 데이터베이스 테이블 생성
 Base.metadata.create_all(bind=engine)
@@ -33,6 +34,10 @@ async def root():
 async def health_check():
     return {"status": "healthy", "service": "coin-ai-platform"}
 
+@app.on_event("shutdown")
+async def shutdown_password_hasher():
+    password_hasher.shutdown()
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(app, host="0.0.0.0", port=8000)
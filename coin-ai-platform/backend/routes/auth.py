@@ -3,7 +3,8 @@ from sqlalchemy.orm import Session
 from database.database import get_db
 from models.user import User
 from schemas.user import UserCreate, UserLogin, Token, UserResponse
-from services.auth_service import get_password_hash, verify_password, create_access_token
+from services.auth_service import create_access_token, password_hasher
+from services.user_cache import user_cache
 from datetime import timedelta
 
 router = APIRouter(prefix="/api/auth", tags=["authentication"])
@@ -19,7 +20,7 @@ async def register(user_data: UserCreate, db: Session = Depends(get_db)):
         )
     
     # 사용자 생성
-    hashed_password = get_password_hash(user_data.password)
+    hashed_password = await password_hasher.hash(user_data.password)
     user = User(
         email=user_data.email,
         password_hash=hashed_password,
@@ -36,12 +37,20 @@ async def register(user_data: UserCreate, db: Session = Depends(get_db)):
 async def login(user_data: UserLogin, db: Session = Depends(get_db)):
     # 사용자 확인
     user = db.query(User).filter(User.email == user_data.email).first()
-    if not user or not verify_password(user_data.password, user.password_hash):
+    valid, new_hash = False, None
+    if user:
+        valid, new_hash = await password_hasher.verify_and_update(user_data.password, user.password_hash)
+    if not valid:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="이메일 또는 비밀번호가 올바르지 않습니다."
         )
     
+    # bcrypt 비용이 바뀐 해시는 새 비용으로 교체
+    if new_hash:
+        user.password_hash = new_hash
+        db.commit()
+    
     if not user.is_active:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -59,3 +68,13 @@ async def login(user_data: UserLogin, db: Session = Depends(get_db)):
         "access_token": access_token,
         "token_type": "bearer"
     }
+
+@router.get("/hash-stats")
+async def get_hash_stats():
+    """비밀번호 해싱 큐 깊이/지연 지표"""
+    return password_hasher.stats()
+
+@router.get("/cache-stats")
+async def get_user_cache_stats():
+    """인증 사용자 캐시 적중률"""
+    return user_cache.stats()
@@ -4,9 +4,13 @@ from database.database import get_db
 from models.user import User, ExchangeKey
 from schemas.user import ExchangeKeyCreate, ExchangeKeyResponse
 from services.auth_service import verify_token
+from services.user_cache import user_cache, watch_user_model
 
 router = APIRouter(prefix="/api/exchange", tags=["exchange"])
 
+# 사용자 수정/비활성화 시 인증 캐시 무효화
+watch_user_model(User)
+
 def get_current_user(authorization: str = Header(...), db: Session = Depends(get_db)):
     if not authorization.startswith("Bearer "):
         raise HTTPException(status_code=401, detail="인증 토큰이 필요합니다.")
@@ -17,9 +21,12 @@ def get_current_user(authorization: str = Header(...), db: Session = Depends(get
         raise HTTPException(status_code=401, detail="인증이 유효하지 않습니다.")
     
     user_email = payload.get("sub")
-    user = db.query(User).filter(User.email == user_email).first()
-    if not user:
-        raise HTTPException(status_code=401, detail="사용자를 찾을 수 없습니다.")
+    user = user_cache.get(user_email)
+    if user is None:
+        db_user = db.query(User).filter(User.email == user_email).first()
+        if not db_user:
+            raise HTTPException(status_code=401, detail="사용자를 찾을 수 없습니다.")
+        user = user_cache.put(user_email, db_user, payload.get("exp"))
     return user
 
 @router.post("/keys", response_model=ExchangeKeyResponse)
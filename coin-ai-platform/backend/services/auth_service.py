@@ -2,9 +2,110 @@ from passlib.context import CryptContext
 from jose import JWTError, jwt
 from datetime import datetime, timedelta
 from fastapi import HTTPException, status
+from concurrent.futures import ThreadPoolExecutor
+from collections import deque
+from typing import Deque, Dict, Optional, Tuple
+import asyncio
+import os
+import threading
+import time
 
-# 비밀번호 해싱
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# bcrypt 비용 (2^rounds) - 바꾸면 기존 해시는 다음 로그인 때 새 비용으로 재해싱
+BCRYPT_ROUNDS = int(os.getenv("BCRYPT_ROUNDS", "12"))
+PASSWORD_HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", str(min(4, os.cpu_count() or 1))))
+
+pwd_context = CryptContext(
+    schemes=["bcrypt"],
+    deprecated="auto",
+    bcrypt__default_rounds=BCRYPT_ROUNDS,
+    bcrypt__min_rounds=BCRYPT_ROUNDS,
+    bcrypt__max_rounds=BCRYPT_ROUNDS
+)
+
+def _percentile(samples, q: float) -> float:
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+class PasswordHasher:
+    """bcrypt 해싱/검증을 전용 스레드 풀에서 실행하는 awaitable API
+
+    bcrypt는 해싱 중 GIL을 놓으므로 스레드 풀로 이벤트 루프를 막지 않고
+    코어 수만큼 병렬 처리된다. 작업자 수를 넘는 요청은 풀 큐에서 대기한다.
+    """
+
+    def __init__(self, context: CryptContext = None, max_workers: int = PASSWORD_HASH_WORKERS,
+                 sample_size: int = 1000):
+        self.context = context or pwd_context
+        self.max_workers = max_workers
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="bcrypt")
+        self._lock = threading.Lock()
+
+        # 지표
+        self.pending = 0  # 제출됐지만 아직 시작 전 (큐 깊이)
+        self.running = 0
+        self.completed = 0
+        self.rehashed = 0
+        self._wait_ms: Deque[float] = deque(maxlen=sample_size)
+        self._total_ms: Deque[float] = deque(maxlen=sample_size)
+
+    async def _run(self, fn, *args):
+        submitted = time.perf_counter()
+        with self._lock:
+            self.pending += 1
+
+        def job():
+            started = time.perf_counter()
+            with self._lock:
+                self.pending -= 1
+                self.running += 1
+            try:
+                return fn(*args)
+            finally:
+                with self._lock:
+                    self.running -= 1
+                self._wait_ms.append((started - submitted) * 1000)
+
+        try:
+            return await asyncio.get_running_loop().run_in_executor(self._executor, job)
+        finally:
+            self.completed += 1
+            self._total_ms.append((time.perf_counter() - submitted) * 1000)
+
+    async def hash(self, password: str) -> str:
+        return await self._run(self.context.hash, password)
+
+    async def verify(self, password: str, hashed_password: str) -> bool:
+        return await self._run(self.context.verify, password, hashed_password)
+
+    async def verify_and_update(self, password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+        """검증 + 비용이 바뀐 해시면 새 해시 반환 (valid, new_hash)"""
+        valid, new_hash = await self._run(self.context.verify_and_update, password, hashed_password)
+        if new_hash is not None:
+            self.rehashed += 1
+        return valid, new_hash
+
+    def shutdown(self):
+        self._executor.shutdown(wait=True)
+
+    def stats(self) -> Dict:
+        """해싱 큐 깊이/지연 지표 (ms)"""
+        wait, total = list(self._wait_ms), list(self._total_ms)
+        return {
+            "workers": self.max_workers,
+            "rounds": BCRYPT_ROUNDS,
+            "queue_depth": self.pending,
+            "running": self.running,
+            "completed": self.completed,
+            "rehashed": self.rehashed,
+            "wait_ms_p50": round(_percentile(wait, 0.5), 2),
+            "wait_ms_p99": round(_percentile(wait, 0.99), 2),
+            "latency_ms_p50": round(_percentile(total, 0.5), 2),
+            "latency_ms_p99": round(_percentile(total, 0.99), 2)
+        }
+
+password_hasher = PasswordHasher()
 
 # JWT 설정
 SECRET_KEY = "your-secret-key-change-in-production"
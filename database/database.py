@@ -1,15 +1,40 @@
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import make_url
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 import os
 
-# SQLite 데이터베이스 (개발용)
-SQLALCHEMY_DATABASE_URL = "sqlite:///./coin_ai_platform.db"
+# 데이터베이스 URL (기본: SQLite 개발용, 운영은 DATABASE_URL=postgresql://...)
+SQLALCHEMY_DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./coin_ai_platform.db")
+IS_SQLITE = make_url(SQLALCHEMY_DATABASE_URL).get_backend_name() == "sqlite"
 
-engine = create_engine(
-    SQLALCHEMY_DATABASE_URL, 
-    connect_args={"check_same_thread": False}  # SQLite only
-)
+# 커넥션 풀 설정
+POOL_OPTIONS = {
+    "pool_size": int(os.getenv("DB_POOL_SIZE", "10")),
+    "max_overflow": int(os.getenv("DB_MAX_OVERFLOW", "20")),
+    "pool_timeout": float(os.getenv("DB_POOL_TIMEOUT", "30")),
+}
+if IS_SQLITE:
+    POOL_OPTIONS["connect_args"] = {"check_same_thread": False, "timeout": 5}  # SQLite only
+else:
+    POOL_OPTIONS["pool_recycle"] = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+    POOL_OPTIONS["pool_pre_ping"] = True
+# aiosqlite 파일 DB의 기본 풀은 NullPool (풀 크기 인자 거부) - 비동기 엔진은 풀을 명시
+ASYNC_POOL_OPTIONS = dict(POOL_OPTIONS, poolclass=AsyncAdaptedQueuePool) if IS_SQLITE else POOL_OPTIONS
+
+def _sqlite_pragmas(dbapi_connection, connection_record):
+    # WAL: 쓰기 중에도 읽기 가능, busy_timeout: 잠금 시 즉시 실패하지 않고 대기
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute("PRAGMA synchronous=NORMAL")
+    cursor.execute("PRAGMA busy_timeout=5000")
+    cursor.execute("PRAGMA temp_store=MEMORY")
+    cursor.close()
+
+engine = create_engine(SQLALCHEMY_DATABASE_URL, **POOL_OPTIONS)
+if IS_SQLITE:
+    event.listen(engine, "connect", _sqlite_pragmas)
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
@@ -22,3 +47,24 @@ def get_db():
         yield db
     finally:
         db.close()
+
+# 비동기 세션 (aiosqlite / asyncpg 설치 시)
+try:
+    from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+    _async_url = make_url(SQLALCHEMY_DATABASE_URL)
+    _async_url = _async_url.set(drivername={"sqlite": "sqlite+aiosqlite", "postgresql": "postgresql+asyncpg"}
+                                .get(_async_url.drivername, _async_url.drivername))
+    async_engine = create_async_engine(_async_url.render_as_string(hide_password=False), **ASYNC_POOL_OPTIONS)
+    if IS_SQLITE:
+        event.listen(async_engine.sync_engine, "connect", _sqlite_pragmas)
+    AsyncSessionLocal = async_sessionmaker(async_engine, expire_on_commit=False, autoflush=False)
+except ImportError:
+    async_engine = None
+    AsyncSessionLocal = None
+
+async def get_async_db():
+    if AsyncSessionLocal is None:
+        raise RuntimeError("비동기 DB 드라이버가 필요합니다 (aiosqlite / asyncpg)")
+    async with AsyncSessionLocal() as db:
+        yield db
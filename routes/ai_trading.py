@@ -2,6 +2,7 @@ from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
 from database.database import get_db
 from services.ai_trading import SimpleTradingStrategy
+from services.signal_cache import INTERVAL_MS, signal_cache
 from auth import get_current_user
 
 router = APIRouter(prefix="/api/ai", tags=["ai-trading"])
@@ -9,29 +10,40 @@ router = APIRouter(prefix="/api/ai", tags=["ai-trading"])
 @router.post("/analyze/{symbol}")
 async def analyze_with_ai(
     symbol: str = "BTCUSDT",
+    interval: str = "15m",
     current_user = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
-    """AI를 이용한 시장 분석"""
+    """AI를 이용한 시장 분석 (마감 봉 단위 캐시 - 새 봉이 마감될 때만 다시 계산)"""
+    if interval not in INTERVAL_MS:
+        return {"status": "error", "message": "지원하지 않는 인터벌"}
     try:
-        # 기본 전략 사용
-        strategy = SimpleTradingStrategy()
+        async def compute():
+            # 기본 전략 사용
+            strategy = SimpleTradingStrategy()
+            
+            # 모의 가격 데이터
+            mock_prices = [35000, 35100, 34900, 35200, 35300, 35150, 35400, 35500, 35600, 35700]
+            
+            return strategy.simple_moving_average_strategy(mock_prices), len(mock_prices)
         
-        # 모의 가격 데이터
-        mock_prices = [35000, 35100, 34900, 35200, 35300, 35150, 35400, 35500, 35600, 35700]
-        
-        analysis = strategy.simple_moving_average_strategy(mock_prices)
+        analysis, data_points = await signal_cache.aget(symbol, interval, "sma", None, compute)
         
         return {
             "status": "success",
             "symbol": symbol,
             "strategy": "SMA_이동평균",
             "analysis": analysis,
-            "data_points": len(mock_prices)
+            "data_points": data_points
         }
     except Exception as e:
         return {"status": "error", "message": str(e)}
 
+@router.get("/signal-cache-stats")
+async def get_signal_cache_stats():
+    """신호 캐시 적중률/계산 시간"""
+    return {"status": "success", "cache": signal_cache.stats()}
+
 @router.post("/execute-trade")
 async def execute_ai_trade(
     symbol: str = "BTCUSDT",
@@ -42,7 +54,7 @@ async def execute_ai_trade(
     """AI 분석 기반 거래 실행"""
     try:
         # 먼저 시장 분석
-        analysis_result = await analyze_with_ai(symbol, current_user, db)
+        analysis_result = await analyze_with_ai(symbol, "15m", current_user, db)
         
         if analysis_result["status"] != "success":
             return analysis_result
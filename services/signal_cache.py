@@ -0,0 +1,4 @@
+# 봉 마감 단위 신호 캐시 - backend 구현을 그대로 사용 (사본을 따로 두지 않음)
+from backend.services.signal_cache import INTERVAL_MS, SignalCache, last_closed_open_time, params_key, signal_cache
+
+__all__ = ["INTERVAL_MS", "SignalCache", "last_closed_open_time", "params_key", "signal_cache"]
@@ -0,0 +1,73 @@
+import sys
+from importlib.machinery import PathFinder
+from pathlib import Path
+
+import pytest
+
+# backend/ 앱은 저장소 루트 앱과 같은 최상위 패키지 이름(services, database, ...)을 쓴다.
+# 이 디렉터리를 수집/실행하는 동안에만 backend 쪽 모듈로 바꿔 끼우고 끝나면 되돌린다.
+HERE = Path(__file__).resolve().parent
+BACKEND = str(HERE.parents[1] / "backend")
+SHADOWED = {"services", "database", "models", "config", "schemas", "routers", "auth"}
+
+def _take(modules):
+    taken = {name: module for name, module in modules.items() if name.split(".")[0] in SHADOWED}
+    for name in taken:
+        del modules[name]
+    return taken
+
+class _BackendFinder:
+    """활성화된 동안 SHADOWED 최상위 패키지를 backend/ 에서 찾는다 (sys.path 순서와 무관)"""
+
+    def find_spec(self, name, path=None, target=None):
+        if "." in name or name not in SHADOWED:
+            return None
+        return PathFinder.find_spec(name, [BACKEND])
+
+_finder = _BackendFinder()
+
+class _BackendNamespace:
+    def __init__(self):
+        self.backend = {}
+        self.saved = {}
+
+    def enter(self):
+        self.saved = _take(sys.modules)
+        sys.modules.update(self.backend)
+        sys.meta_path.insert(0, _finder)
+        sys.path.insert(0, BACKEND)
+
+    def exit(self):
+        self.backend = _take(sys.modules)
+        sys.modules.update(self.saved)
+        sys.meta_path.remove(_finder)
+        sys.path.remove(BACKEND)
+
+_namespace = _BackendNamespace()
+_namespace.enter()
+_collecting = [True]
+_rootpath = []
+
+def _finish_collection():
+    if _collecting[0]:
+        _collecting[0] = False
+        _namespace.exit()
+
+def pytest_collectstart(collector):
+    if not _rootpath:
+        _rootpath.append(Path(str(collector.config.rootpath)))
+
+def pytest_collectreport(report):
+    # 이 디렉터리 수집이 끝나면 루트 앱 모듈로 복구 (다른 테스트 수집 전)
+    if _rootpath and (_rootpath[0] / report.nodeid.split("::")[0]).resolve() == HERE:
+        _finish_collection()
+
+def pytest_collection_finish(session):
+    _finish_collection()
+
+@pytest.fixture(autouse=True)
+def backend_namespace():
+    _namespace.enter()
+    yield
+    _namespace.exit()
+
@@ -0,0 +1,7 @@
+from services.advanced_ai_trading import DEFAULT_PARAMS, resolve_params
+
+def test_resolved_defaults_are_a_copy():
+    params = resolve_params("trend_following")
+    params["slow_window"] = 10
+    assert DEFAULT_PARAMS["trend_following"]["slow_window"] == 50
+    assert resolve_params("trend_following", {"fast_window": 5})["slow_window"] == 50
@@ -0,0 +1,41 @@
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+
+from services.client_pool import ClientPool, ClientPoolFull
+
+class _Client:
+    def __init__(self, api_key, secret_key, testnet):
+        self.api_key = api_key
+        self.closed = False
+
+    def close(self):
+        self.closed = True
+
+def test_client_built_for_full_pool_is_closed():
+    created = []
+    pool = ClientPool(factory=lambda *args: created.append(_Client(*args)) or created[-1], max_size=1)
+    pool.get("a", "key-a", "secret")
+    assert pool.hold("a")
+    with pytest.raises(ClientPoolFull):
+        pool.get("b", "key-b", "secret")
+    assert [c.closed for c in created] == [False, True]
+
+def test_trading_session_holds_its_client(monkeypatch):
+    import main
+
+    pool = ClientPool(factory=_Client, idle_ttl=0.05, on_evict=lambda key: main.active_trading.pop(key, None))
+    monkeypatch.setattr(main, "binance_clients", pool)
+    api = TestClient(main.app)
+    client_id = api.post("/api/binance/connect", json={"apiKey": "k" * 12, "secretKey": "s"}).json()["clientId"]
+    assert api.post(f"/api/trading/start?clientId={client_id}", json={"strategy": "trend"}).json()["success"]
+
+    time.sleep(0.1)  # 유휴 TTL이 지나도 트레이딩 중이면 유지
+    assert pool.peek(client_id) is not None
+    assert main.active_trading[client_id] is True
+    assert api.post(f"/api/trading/stop?clientId={client_id}").json()["success"]
+
+    time.sleep(0.1)
+    assert pool.peek(client_id) is None
+    assert client_id not in main.active_trading
@@ -0,0 +1,26 @@
+import time
+
+from services.exchange_info_store import ExchangeInfoStore
+
+INFO = {"symbols": [{"symbol": "BTCUSDT", "baseAsset": "BTC", "quoteAsset": "USDT", "status": "TRADING"}]}
+
+def test_failed_initial_load_backs_off_before_retrying():
+    calls = []
+    outcomes = [RuntimeError("down"), INFO]
+
+    def loader():
+        calls.append(time.monotonic())
+        outcome = outcomes.pop(0)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+    store = ExchangeInfoStore(loader=loader, retry_delay=0.1)
+    for _ in range(50):
+        assert store.get_symbol("BTCUSDT") is None
+    assert len(calls) == 1
+    assert store.stats()["errors"] == 1
+
+    time.sleep(0.12)
+    assert store.get_symbol("BTCUSDT")["baseAsset"] == "BTC"
+    assert len(calls) == 2
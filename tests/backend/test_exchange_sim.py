@@ -0,0 +1,59 @@
+import pytest
+
+from services.exchange_sim import SimulatedExchange
+
+@pytest.fixture
+def exchange():
+    return SimulatedExchange(symbols={"BTCUSDT": 100.0}, seed=1)
+
+def _order(exchange, key, side, quantity, price=None, reduce_only=False):
+    params = {"symbol": "BTCUSDT", "side": side, "quantity": quantity}
+    if price is not None:
+        params.update(type="LIMIT", price=price, timeInForce="GTC")
+    if reduce_only:
+        params["reduceOnly"] = "true"
+    return exchange.create_order(key, params)
+
+def _position(exchange, key):
+    return exchange.account(key).positions.get("BTCUSDT")
+
+def test_resting_reduce_only_expires_when_position_is_gone(exchange):
+    _order(exchange, "a", "BUY", 1.0)
+    take_profit = _order(exchange, "a", "SELL", 1.0, price=110.0, reduce_only=True)
+    _order(exchange, "a", "SELL", 1.0)  # 수동 청산
+    exchange.set_price("BTCUSDT", 111.0)
+    assert exchange.get_order("a", "BTCUSDT", take_profit["orderId"])["status"] == "EXPIRED"
+    assert _position(exchange, "a") is None
+
+def test_resting_reduce_only_fills_only_what_is_left(exchange):
+    _order(exchange, "a", "BUY", 1.0)
+    take_profit = _order(exchange, "a", "SELL", 1.0, price=110.0, reduce_only=True)
+    _order(exchange, "a", "SELL", 0.4)
+    exchange.set_price("BTCUSDT", 111.0)
+    order = exchange.get_order("a", "BTCUSDT", take_profit["orderId"])
+    assert order["status"] == "EXPIRED"
+    assert float(order["executedQty"]) == pytest.approx(0.6)
+    assert _position(exchange, "a") is None
+
+def test_reduce_only_maker_is_not_hit_without_position(exchange):
+    _order(exchange, "a", "BUY", 1.0)
+    take_profit = _order(exchange, "a", "SELL", 1.0, price=101.0, reduce_only=True)
+    _order(exchange, "a", "SELL", 1.0)
+    taker = _order(exchange, "b", "BUY", 1.0, price=101.0)
+    assert taker["status"] == "FILLED"
+    assert float(taker["avgPrice"]) == pytest.approx(100.0)  # 호가창이 아니라 마크 가격에서 체결
+    assert exchange.get_order("a", "BTCUSDT", take_profit["orderId"])["status"] == "EXPIRED"
+    assert _position(exchange, "a") is None
+
+def test_self_trade_expires_taker(exchange):
+    resting = _order(exchange, "a", "SELL", 1.0, price=101.0)
+    commission = exchange.account("a").commission
+    taker = _order(exchange, "a", "BUY", 1.0, price=101.0)
+    assert taker["status"] == "EXPIRED"
+    assert float(taker["executedQty"]) == 0.0
+    assert exchange.account("a").commission == commission
+    assert exchange.get_order("a", "BTCUSDT", resting["orderId"])["status"] == "NEW"
+
+    other = _order(exchange, "b", "BUY", 1.0, price=101.0)
+    assert other["status"] == "FILLED"
+    assert exchange.get_order("a", "BTCUSDT", resting["orderId"])["status"] == "FILLED"
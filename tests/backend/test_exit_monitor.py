@@ -0,0 +1,26 @@
+import random
+
+from services.exit_monitor import _SymbolTriggers
+
+def test_pop_crossed_matches_linear_scan():
+    rng = random.Random(7)
+    triggers = _SymbolTriggers()
+    expected = []
+    for seq in range(500):
+        level, upper = rng.uniform(90, 110), rng.random() < 0.5
+        triggers.add((level, seq, (seq, "BTCUSDT"), "take_profit" if upper else "stop_loss"), upper)
+        expected.append((level, seq, upper))
+
+    for price in [100.0, 95.0, 105.0, 90.0, 110.0]:
+        crossed = triggers.pop_crossed(price)
+        hit = [(level, seq) for level, seq, upper in expected if (level <= price if upper else level >= price)]
+        expected = [item for item in expected if (item[0], item[1]) not in set(hit)]
+        assert sorted((level, seq) for level, seq, _, _ in crossed) == sorted(hit)
+        assert len(triggers) == len(expected)
+    assert len(triggers) == 0
+
+def test_discard_removes_stored_upper_trigger():
+    triggers = _SymbolTriggers()
+    levels, stored = triggers.add((105.0, 1, (1, "BTCUSDT"), "take_profit"), upper=True)
+    _SymbolTriggers.discard(levels, stored)
+    assert triggers.pop_crossed(200.0) == []
@@ -0,0 +1,58 @@
+import asyncio
+import json
+import socket
+import time
+
+from services.binance_stub import FrameReplayServer
+from services.market_data_stream import MarketDataStream
+
+def _frame(price: float) -> str:
+    ticker = {"e": "24hrMiniTicker", "E": int(time.time() * 1000), "s": "BTCUSDT", "c": f"{price:.2f}",
+              "o": "43000.00", "h": "44000.00", "l": "42000.00", "v": "100.0", "q": "4300000.0"}
+    return json.dumps({"stream": "!miniTicker@arr", "data": [ticker]})
+
+async def _until(condition, timeout: float = 5.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "condition not met in time"
+        await asyncio.sleep(0.01)
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+def test_reconnects_after_server_closes():
+    async def scenario():
+        frames = [_frame(43100.0), _frame(43200.0)]
+        async with FrameReplayServer(frames, loop_frames=True, close_after=2) as server:
+            stream = MarketDataStream(base_url=server.url, min_backoff=0.01, max_backoff=0.05)
+            stream.start()
+            try:
+                await _until(lambda: server.connections >= 3 and stream.messages >= 6)
+            finally:
+                await stream.stop()
+        assert stream.reconnects >= 2
+        assert stream.get_ticker_price("BTCUSDT") == {"symbol": "BTCUSDT", "price": "43200.00"}
+        assert not stream.connected
+
+    asyncio.run(scenario())
+
+def test_backoff_grows_while_down_and_resets_on_connect():
+    async def scenario():
+        port = _free_port()
+        stream = MarketDataStream(base_url=f"ws://127.0.0.1:{port}", min_backoff=0.01, max_backoff=0.04)
+        stream.start()
+        try:
+            # 서버가 없는 동안: 실패할 때마다 두 배, max_backoff에서 멈춘다
+            await _until(lambda: stream.reconnects >= 4)
+            assert stream.backoff == 0.04
+            assert stream.messages == 0
+            async with FrameReplayServer([_frame(43300.0)], port=port):
+                await _until(lambda: stream.messages >= 1)
+                assert stream.connected
+                assert stream.backoff == 0.01
+        finally:
+            await stream.stop()
+
+    asyncio.run(scenario())
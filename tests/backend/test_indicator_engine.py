@@ -0,0 +1,54 @@
+import numpy as np
+import pytest
+
+from services.indicator_engine import IndicatorEngine, batch_indicator, latest_values
+
+SPECS = [("sma", 20), ("sma", 50), ("rsi", 14), ("rsi_sma", 14, 3), ("high_max_prev", 20), ("low_min_prev", 20)]
+MINUTE = 60_000
+
+@pytest.fixture(scope="module")
+def series():
+    rng = np.random.default_rng(11)
+    close = 50000 + np.cumsum(rng.normal(0, 50, 300))
+    high = close + rng.uniform(0, 30, len(close))
+    low = close - rng.uniform(0, 30, len(close))
+    return high, low, close
+
+def _assert_same(actual, expected):
+    np.testing.assert_allclose(np.asarray(actual, dtype=float), np.asarray(expected, dtype=float),
+                               rtol=1e-9, atol=1e-9, equal_nan=True)
+
+def test_batch_matches_ta_and_pandas(series):
+    pd = pytest.importorskip("pandas")
+    ta = pytest.importorskip("ta")
+    high, low, close = series
+    h, l, c = pd.Series(high), pd.Series(low), pd.Series(close)
+    cache = {}
+    expected = {
+        ("sma", 20): ta.trend.sma_indicator(c, window=20),
+        ("sma", 50): ta.trend.sma_indicator(c, window=50),
+        ("rsi", 14): ta.momentum.rsi(c, window=14),
+        ("rsi_sma", 14, 3): ta.momentum.rsi(c, window=14).rolling(3).mean(),
+        ("high_max_prev", 20): h.rolling(20).max().shift(1),
+        ("low_min_prev", 20): l.rolling(20).min().shift(1),
+    }
+    for spec in SPECS:
+        _assert_same(batch_indicator(spec, high, low, close, cache), expected[spec])
+
+def test_incremental_matches_batch_at_every_bar(series):
+    high, low, close = series
+    batch = {spec: batch_indicator(spec, high, low, close) for spec in SPECS}
+    candles = [{"timestamp": i * MINUTE, "high": h, "low": l, "close": c}
+               for i, (h, l, c) in enumerate(zip(high.tolist(), low.tolist(), close.tolist()))]
+    engine = IndicatorEngine()
+    for i in range(1, len(candles)):
+        # 마지막 원소는 진행 중 봉 - 한 봉씩 밀며 공급 (윈도우 50개)
+        snapshot = engine.on_candles("BTCUSDT", "1m", candles[max(0, i - 49):i + 1], SPECS)
+        for spec in SPECS:
+            _assert_same(snapshot[spec], batch[spec][i])
+
+def test_latest_values_matches_batch_tail(series):
+    high, low, close = series
+    snapshot = latest_values(SPECS, high, low, close)
+    for spec in SPECS:
+        _assert_same(snapshot[spec], batch_indicator(spec, high, low, close)[-1])
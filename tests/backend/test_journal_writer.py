@@ -0,0 +1,32 @@
+import time
+
+from services.journal_writer import JournalWriter
+
+def _writer(**kwargs):
+    writer = JournalWriter(**kwargs)
+    writer.batches_seen = []
+    writer._write = lambda inserts, closes: writer.batches_seen.append(len(inserts) + len(closes))
+    return writer
+
+def test_events_within_flush_interval_share_one_commit():
+    writer = _writer(flush_interval=0.3)
+    try:
+        for i in range(5):
+            writer.record_close(i, 100.0, "take_profit")
+            time.sleep(0.01)
+        time.sleep(0.5)
+        assert writer.batches_seen == [5]
+    finally:
+        writer.stop()
+
+def test_batch_size_and_flush_cut_the_wait_short():
+    writer = _writer(flush_interval=5.0, batch_size=3)
+    try:
+        started = time.perf_counter()
+        for i in range(4):
+            writer.record_close(i, 100.0, "stop_loss")
+        assert writer.flush(timeout=2.0)
+        assert time.perf_counter() - started < 1.0
+        assert writer.batches_seen == [3, 1]
+    finally:
+        writer.stop()
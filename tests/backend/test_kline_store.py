@@ -0,0 +1,25 @@
+import time
+
+from services.kline_store import KlineStore
+
+MINUTE = 60_000
+
+def test_short_history_switches_to_incremental_fetches():
+    now = int(time.time() * 1000) // MINUTE * MINUTE
+    listed = [[now - (29 - i) * MINUTE, "1", "2", "0.5", "1.5", "10"] for i in range(30)]  # 상장 30분
+    requested = []
+
+    def fetch(symbol, interval, limit):
+        requested.append(limit)
+        return listed[-limit:]
+
+    store = KlineStore(capacity=100)
+    for _ in range(3):
+        assert len(store.get_window("NEWUSDT", "1m", 50, fetch)) == 30
+    assert store.backfills == 1
+    assert store.incremental_updates == 2
+    assert requested[0] == 100 and max(requested[1:]) < 100
+
+    # 더 큰 창을 요청하면 버퍼를 키워 다시 백필
+    store.get_window("NEWUSDT", "1m", 200, fetch)
+    assert store.backfills == 2
@@ -0,0 +1,43 @@
+import json
+import time
+
+from services.market_data_stream import MarketDataStream
+
+def _mini(symbol: str, price: str) -> dict:
+    return {"e": "24hrMiniTicker", "E": int(time.time() * 1000), "s": symbol, "c": price,
+            "o": "100.0", "h": "110.0", "l": "90.0", "v": "10.0", "q": "1005.0"}
+
+def test_quiet_symbols_stay_in_all_symbols_view_while_stream_is_live():
+    stream = MarketDataStream(stale_after=30)
+    stream.connected = True
+    stream.handle_message(json.dumps({"data": [_mini("BTCUSDT", "101.0"), _mini("ETHUSDT", "102.0")]}))
+    stream.state["ETHUSDT"]["updated_at"] -= 60  # 한동안 변동 없는 심볼
+    stream.handle_message(json.dumps({"data": [_mini("BTCUSDT", "103.0")]}))
+
+    prices = {p["symbol"]: p["price"] for p in stream.get_ticker_price()}
+    assert prices == {"BTCUSDT": "103.0", "ETHUSDT": "102.0"}
+
+    stream.last_message_at -= 60  # 스트림이 멈추면 전체 조회도 None
+    assert stream.get_ticker_price() is None
+    stream.last_message_at += 60
+    stream.connected = False
+    assert stream.get_ticker_price() is None
+
+def test_24hr_ticker_fields():
+    stream = MarketDataStream(symbols=["BTCUSDT"])
+    assert "btcusdt@ticker" in stream.stream_url
+    stream.handle_message(json.dumps({"data": [_mini("ETHUSDT", "102.0")]}))
+    mini = stream.get_24hr_ticker("ETHUSDT")
+    assert mini["weightedAvgPrice"] == "100.50000000"
+
+    now = int(time.time() * 1000)
+    full = {"e": "24hrTicker", "E": now, "s": "BTCUSDT", "p": "1.0", "P": "1.000", "w": "100.4",
+            "x": "99.9", "c": "101.0", "Q": "0.5", "b": "100.9", "B": "2", "a": "101.1", "A": "3",
+            "o": "100.0", "h": "110.0", "l": "90.0", "v": "10.0", "q": "1004.0",
+            "O": now - 86400000, "C": now, "F": 1, "L": 42, "n": 42}
+    stream.handle_message(json.dumps({"stream": "btcusdt@ticker", "data": full}))
+    ticker = stream.get_24hr_ticker("BTCUSDT")
+    assert ticker["prevClosePrice"] == "99.9"
+    assert ticker["weightedAvgPrice"] == "100.4"
+    assert ticker["count"] == 42
+    assert stream.get_ticker_price("BTCUSDT") == {"symbol": "BTCUSDT", "price": "101.0"}
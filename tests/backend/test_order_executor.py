@@ -0,0 +1,164 @@
+import asyncio
+import time
+
+import pytest
+
+from services.auto_trading_bot import AutoTradingBot
+from services.binance_stub import BinanceStubServer, FakeFuturesExchange
+from services.exit_monitor import ExitMonitor
+from services.order_executor import FuturesRestGateway, OrderExecutor, make_client_order_id
+from services.position_book import PositionBook
+from services.signal_cache import SignalCache
+
+@pytest.fixture
+def exchange():
+    fake = FakeFuturesExchange()
+    server = BinanceStubServer(routes=fake.routes()).start()
+    fake.gateway = FuturesRestGateway("key", "secret", server.futures_url, timeout=0.5)
+    yield fake
+    server.stop()
+
+@pytest.fixture
+def executor():
+    executor = OrderExecutor(max_senders=2, backoff=0.01, max_backoff=0.05)
+    yield executor
+    executor.shutdown()
+
+def test_retries_5xx_and_fills_once(exchange, executor):
+    exchange.fail_next("5xx", "5xx")
+    result = executor.execute(exchange.gateway, "BTCUSDT", "BUY", 0.001)
+    assert result["status"] == "success"
+    assert result["attempts"] == 3
+    assert exchange.fills == 1
+
+@pytest.mark.parametrize("fault", ["-1007", "drop"])
+def test_unknown_outcome_is_recovered_by_lookup(exchange, executor, fault):
+    # 처리 후 응답을 잃은 주문 - 재전송 대신 조회로 같은 체결을 돌려준다
+    exchange.fail_next(fault)
+    result = executor.execute(exchange.gateway, "BTCUSDT", "BUY", 0.001)
+    assert result["status"] == "success"
+    assert result["recovered"] is True
+    assert exchange.fills == 1
+    assert executor.stats()["recovered"] == 1
+
+def test_resubmit_with_same_id_returns_existing_order(exchange, executor):
+    cid = make_client_order_id(1, "BTCUSDT", "BUY", 1700000000000)
+    first = executor.execute(exchange.gateway, "BTCUSDT", "BUY", 0.001, client_order_id=cid)
+    second = executor.execute(exchange.gateway, "BTCUSDT", "BUY", 0.001, client_order_id=cid)
+    assert second["status"] == "success"
+    assert second["recovered"] is True
+    assert second["order"]["orderId"] == first["order"]["orderId"]
+    assert exchange.fills == 1
+
+def test_persistent_5xx_exhausts_attempts(exchange, executor):
+    exchange.fail_next(*["5xx"] * executor.max_attempts)
+    result = executor.execute(exchange.gateway, "BTCUSDT", "BUY", 0.001)
+    assert result["status"] == "error"
+    assert result["code"] == -1001
+    assert result["attempts"] == executor.max_attempts
+    assert exchange.fills == 0
+
+def test_deadline_stops_retries_with_same_result_for_sync_and_async(exchange):
+    executor = OrderExecutor(backoff=0.2, max_backoff=0.2, max_attempts=10, ack_timeout=0.3)
+    try:
+        exchange.fail_next(*["5xx"] * 20)
+        started = time.perf_counter()
+        result = executor.execute(exchange.gateway, "BTCUSDT", "BUY", 0.001)
+        assert time.perf_counter() - started < 1.0
+        assert result["status"] == "error"
+        assert "not acknowledged" in result["message"]
+        assert result["attempts"] < 10
+
+        requests = exchange.requests
+        again = asyncio.run(executor.aexecute(exchange.gateway, "BTCUSDT", "BUY", 0.001))
+        assert again["status"] == "error"
+        assert again.keys() == result.keys()
+        time.sleep(0.3)
+        assert exchange.requests - requests == again["attempts"]  # 결과를 돌려준 뒤에는 보내지 않는다
+        assert exchange.fills == 0
+    finally:
+        executor.shutdown()
+
+def test_sends_carry_recv_window_within_deadline(exchange):
+    sent = []
+
+    class _Recording:
+        def create_order(self, params):
+            sent.append(dict(params))
+            return exchange.gateway.create_order(params)
+
+        def get_order(self, symbol, client_order_id):
+            return exchange.gateway.get_order(symbol, client_order_id)
+
+    executor = OrderExecutor(ack_timeout=2.0)
+    try:
+        assert executor.execute(_Recording(), "BTCUSDT", "BUY", 0.001)["status"] == "success"
+    finally:
+        executor.shutdown()
+    assert 0 < sent[0]["recvWindow"] <= 2000
+
+class _Journal:
+    def __init__(self):
+        self.orders = []
+
+    def record_signal(self, *args, **kwargs):
+        pass
+
+    def record_order(self, *args, **kwargs):
+        self.orders.append(args)
+
+    def record_close(self, *args, **kwargs):
+        pass
+
+class _Service:
+    def __init__(self, gateway, executor):
+        self.gateway = gateway
+        self.executor = executor
+
+    def place_real_order(self, symbol, side, quantity, reduce_only=False, client_order_id=None):
+        return self.executor.execute(self.gateway, symbol, side, quantity, reduce_only=reduce_only,
+                                     client_order_id=client_order_id)
+
+def test_recovered_order_is_not_recorded_twice(exchange, executor):
+    # 같은 봉 재평가 -> 같은 주문 ID 재전송 -> -4116으로 되찾은 주문은 새 체결이 아니다
+    journal = _Journal()
+    book = PositionBook(journal=journal)
+    monitor = ExitMonitor(book)
+    bot = AutoTradingBot(user_id=1, journal=journal, book=book, monitor=monitor, signals=SignalCache())
+    bot.ai_engine.analyze_incremental = lambda *args: {
+        "action": "BUY", "confidence": 0.9, "entry_price": 43250.0,
+        "stop_loss": 42000.0, "take_profit": 45000.0
+    }
+    service = _Service(exchange.gateway, executor)
+    candles = [{"timestamp": 1700000000000, "open": 1, "high": 1, "low": 1, "close": 1, "volume": 1}]
+    try:
+        assert bot.process_candles(service, "BTCUSDT", 0.001, candles)["status"] == "success"
+        book.close(1, "BTCUSDT", 43300.0, "take_profit")
+        again = bot.process_candles(service, "BTCUSDT", 0.001, candles)
+    finally:
+        monitor.shutdown()
+    assert again["recovered"] is True
+    assert exchange.fills == 1
+    assert len(journal.orders) == 1
+    assert not book.has_open(1, "BTCUSDT")
+
+def test_trading_loop_keeps_a_full_window_of_closed_candles(monkeypatch):
+    import services.auto_trading_bot as auto_trading_bot
+
+    interval_ms = 15 * 60_000
+    open_bar = int(time.time() * 1000) // interval_ms * interval_ms
+    evaluated = []
+
+    class _Chart:
+        def get_real_time_chart_data(self, symbol, interval, limit):
+            data = [{"timestamp": open_bar - (limit - 1 - i) * interval_ms, "open": 1, "high": 1,
+                     "low": 1, "close": 1, "volume": 1} for i in range(limit)]
+            return {"status": "success", "data": data}
+
+    bot = AutoTradingBot(user_id=1, journal=_Journal(), signals=SignalCache())
+    bot.process_candles = lambda service, symbol, quantity, candles: evaluated.append(candles)
+    bot.is_running = True
+    monkeypatch.setattr(auto_trading_bot.time, "sleep", lambda seconds: setattr(bot, "is_running", False))
+    bot._trading_loop(_Chart(), "BTCUSDT", 0.001)
+    assert len(evaluated[0]) == bot.window
+    assert evaluated[0][-1]["timestamp"] == open_bar - interval_ms
@@ -0,0 +1,65 @@
+import time
+
+from services.position_book import PositionBook
+
+class _Journal:
+    def __init__(self):
+        self.orders = []
+        self.closes = []
+
+    def record_order(self, *args, **kwargs):
+        self.orders.append(args)
+
+    def record_close(self, *args, **kwargs):
+        self.closes.append(args)
+
+def _account(symbol: str, amount: float, entry_price: float):
+    return [{"symbol": symbol, "positionAmt": str(amount), "entryPrice": str(entry_price)}]
+
+class _Service:
+    """계좌 조회 도중 봇 체결이 끼어드는 상황"""
+
+    def __init__(self, book: PositionBook, positions):
+        self.book = book
+        self.positions = positions
+
+    def get_real_account_info(self):
+        self.book.on_fill(1, "ETHUSDT", "BUY", 1.0, 2500.0, 7)
+        return {"status": "success", "account": {"positions": self.positions}}
+
+def test_fill_during_account_fetch_is_not_reconciled_away():
+    journal = _Journal()
+    book = PositionBook(journal=journal)
+    assert book.reconcile_account(1, _Service(book, [])) == 0
+    assert book.has_open(1, "ETHUSDT")
+    assert journal.closes == []
+    # 다음 동기화 스냅샷에도 없으면 그때 정리
+    assert book.reconcile(1, []) == 1
+    assert not book.has_open(1, "ETHUSDT")
+
+def test_close_after_snapshot_is_not_reopened():
+    journal = _Journal()
+    book = PositionBook(journal=journal)
+    book.on_fill(1, "BTCUSDT", "BUY", 0.5, 43000.0, 11)
+    snapshot = _account("BTCUSDT", 0.5, 43000.0)
+    time.sleep(0.001)
+    snapshot_time = time.time()  # 이 시각의 계좌 조회에는 아직 열린 포지션
+    time.sleep(0.001)
+    book.close(1, "BTCUSDT", 43100.0, "take_profit")
+    assert book.reconcile(1, snapshot, snapshot_time) == 0
+    assert not book.has_open(1, "BTCUSDT")
+    assert journal.orders == []
+
+def test_entry_price_float_noise_is_not_an_adjustment():
+    book = PositionBook(journal=_Journal())
+    book.on_fill(1, "BTCUSDT", "BUY", 0.1, 43000.1, 1)
+    book.on_fill(1, "BTCUSDT", "BUY", 0.2, 43000.2, 2)
+    average = book.get(1, "BTCUSDT").entry_price
+    assert book.reconcile(1, _account("BTCUSDT", 0.3, round(average, 6))) == 0
+    assert book.reconcile(1, _account("BTCUSDT", 0.3, 43100.0)) == 1
+
+def test_known_orders_are_keyed_by_symbol():
+    book = PositionBook(journal=_Journal())
+    book.on_fill(1, "BTCUSDT", "BUY", 0.1, 43000.0, 42)
+    assert book.knows_order("btcusdt", 42)
+    assert not book.knows_order("ETHUSDT", 42)
@@ -0,0 +1,32 @@
+import pytest
+
+from services.price_batch import MAX_SYMBOLS, parse_symbols
+
+def test_parse_symbols_accepts_list_or_comma_string():
+    assert parse_symbols("btcusdt, ETHUSDT,btcusdt") == ["BTCUSDT", "ETHUSDT"]
+    assert parse_symbols(["btcusdt", " ethusdt "]) == ["BTCUSDT", "ETHUSDT"]
+    assert parse_symbols([]) is None
+    assert parse_symbols(None) is None
+
+@pytest.mark.parametrize("raw", [[1, 2], {"symbols": "BTCUSDT"}, 42, ["BTCUSDT", None]])
+def test_parse_symbols_rejects_other_shapes(raw):
+    with pytest.raises(ValueError):
+        parse_symbols(raw)
+
+def test_parse_symbols_enforces_limit_for_lists():
+    with pytest.raises(ValueError):
+        parse_symbols([f"S{i}USDT" for i in range(MAX_SYMBOLS + 1)])
+
+def test_etag_differs_per_representation():
+    pytest.importorskip("msgpack")
+    from services.price_batch import PriceBatchEncoder
+
+    encoder = PriceBatchEncoder()
+    snapshot = [{"symbol": "BTCUSDT", "price": "43000.00"}]
+    columnar, _, _ = encoder.encode(snapshot, None, "stream", "columnar")
+    rows, _, _ = encoder.encode(snapshot, None, "stream", "rows")
+    packed, _, media_type = encoder.encode(snapshot, None, "stream", "columnar", use_msgpack=True)
+    assert len({columnar, rows, packed}) == 3
+    # 다른 표현의 ETag로는 304가 나지 않는다
+    assert encoder.encode(snapshot, None, "stream", "rows", if_none_match=columnar)[1] is not None
+    assert encoder.encode(snapshot, None, "stream", "columnar", if_none_match=columnar)[1] is None
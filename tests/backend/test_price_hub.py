@@ -0,0 +1,34 @@
+import asyncio
+import json
+
+from services.price_hub import PriceHub
+
+def test_resubscribe_snapshot_and_errors_go_through_the_pump():
+    async def scenario():
+        hub = PriceHub(max_rate=50, send_timeout=1.0)
+        hub.latest.update({"BTCUSDT": 43000.0, "ETHUSDT": 2500.0})
+        subscriber = hub.subscribe(["BTCUSDT"])
+        sent, in_flight = [], [0]
+
+        async def send(frame):
+            in_flight[0] += 1
+            assert in_flight[0] == 1, "concurrent send"
+            await asyncio.sleep(0.02)
+            sent.append(json.loads(frame))
+            in_flight[0] -= 1
+
+        pump = asyncio.create_task(hub.pump(subscriber, send))
+        await asyncio.sleep(0.005)  # 첫 스냅샷 전송 중에 구독 변경
+        hub.resubscribe(subscriber, ["ETHUSDT"])
+        subscriber.enqueue({"type": "error", "message": "bad symbols"})
+        hub.publish("ETHUSDT", 2501.0)
+        await asyncio.sleep(0.2)
+        pump.cancel()
+        await asyncio.gather(pump, return_exceptions=True)
+        return sent
+
+    sent = asyncio.run(scenario())
+    assert [f["type"] for f in sent] == ["snapshot", "snapshot", "error", "delta"]
+    assert sent[0]["data"] == {"BTCUSDT": 43000.0}
+    assert set(sent[1]["data"]) == {"ETHUSDT"}  # 스냅샷은 보낼 때의 현재가
+    assert sent[3]["data"] == {"ETHUSDT": 2501.0}
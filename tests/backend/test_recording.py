@@ -0,0 +1,44 @@
+import requests
+
+from services.binance_stub import BinanceStubServer, Recording, record_responses
+
+KLINES = [[1700000000000 + i * 60_000, "1", "2", "0.5", "1.5", "10"] for i in range(5)]
+
+def _upstream_routes():
+    return {
+        "/api/v3/klines": lambda query: (200, KLINES),
+        "/api/v3/ticker/24hr": lambda query: (502, b"<html>502 Bad Gateway</html>", {"Content-Type": "text/html"}),
+    }
+
+def test_record_and_replay_keeps_prefix_and_raw_bodies(tmp_path):
+    path = str(tmp_path / "rec.json")
+    plan = [("klines", {"symbol": "BTCUSDT", "interval": "1m", "limit": 5}),
+            ("ticker/24hr", {"symbol": "BTCUSDT"})]
+    with BinanceStubServer(routes=_upstream_routes()) as upstream:
+        assert record_responses(path, plan, base_url=upstream.base_url, timeout=2) == 2
+
+    recording = Recording.load(path)
+    assert recording.base_url.endswith("/api/v3")
+    with BinanceStubServer(routes=recording.routes()) as replay:
+        # /time은 녹화 경로가 아니라 녹화 base_url에서 붙는다
+        assert "serverTime" in requests.get(f"{replay.base_url}/time", timeout=2).json()
+        klines = requests.get(f"{replay.base_url}/klines",
+                              params={"symbol": "BTCUSDT", "interval": "1m", "limit": 2}, timeout=2)
+        assert klines.json() == KLINES[-2:]
+        error = requests.get(f"{replay.base_url}/ticker/24hr", params={"symbol": "BTCUSDT"}, timeout=2)
+        assert error.status_code == 502
+        assert error.headers["Content-Type"] == "text/html"
+        assert error.text == "<html>502 Bad Gateway</html>"
+
+def test_recorded_klines_error_is_replayed_for_other_limits(tmp_path):
+    path = str(tmp_path / "rec.json")
+    routes = {"/api/v3/klines": lambda query: (400, {"code": -1121, "msg": "Invalid symbol."})}
+    with BinanceStubServer(routes=routes) as upstream:
+        plan = [("klines", {"symbol": "NOPEUSDT", "interval": "1m", "limit": 5})]
+        assert record_responses(path, plan, base_url=upstream.base_url, timeout=2) == 1
+
+    with BinanceStubServer(routes=Recording.load(path).routes()) as replay:
+        response = requests.get(f"{replay.base_url}/klines",
+                                params={"symbol": "NOPEUSDT", "interval": "1m", "limit": 2}, timeout=2)
+        assert response.status_code == 400
+        assert response.json()["code"] == -1121
@@ -0,0 +1,32 @@
+import asyncio
+
+import pytest
+
+from services.binance_service import TickerPriceCache
+
+def test_cancelled_leader_releases_waiters():
+    async def scenario():
+        cache = TickerPriceCache(ttl=60, wait_timeout=5)
+        started = asyncio.Event()
+
+        async def slow_fetch():
+            started.set()
+            await asyncio.sleep(60)
+
+        async def fetch():
+            return [{"symbol": "BTCUSDT", "price": "43250.75"}]
+
+        leader = asyncio.create_task(cache.aget(slow_fetch, "BTCUSDT"))
+        await started.wait()
+        waiter = asyncio.create_task(cache.aget(fetch, "BTCUSDT"))
+        await asyncio.sleep(0)
+        leader.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await leader
+        # 대기자는 wait_timeout까지 묶이지 않고 바로 깨어난다 (스냅샷이 없으니 오류)
+        with pytest.raises(RuntimeError):
+            await asyncio.wait_for(waiter, 1)
+        # 자리가 비었으니 다음 조회가 새 리더가 된다
+        assert await cache.aget(fetch, "BTCUSDT") == {"symbol": "BTCUSDT", "price": "43250.75"}
+
+    asyncio.run(scenario())
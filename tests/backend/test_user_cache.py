@@ -0,0 +1,53 @@
+from sqlalchemy import Boolean, Column, Integer, String, create_engine
+from sqlalchemy.orm import Session, declarative_base
+
+from services.user_cache import UserPrincipal, UserPrincipalCache, watch_user_model
+
+Base = declarative_base()
+
+class _User(Base):
+    __tablename__ = "users"
+    id = Column(Integer, primary_key=True)
+    email = Column(String, unique=True)
+    full_name = Column(String)
+    is_active = Column(Boolean, default=True)
+
+def test_deactivation_is_invalidated_after_commit():
+    cache = UserPrincipalCache()
+    watch_user_model(_User, cache)
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+
+    with Session(engine) as session:
+        user = _User(email="a@example.com", full_name="A", is_active=True)
+        session.add(user)
+        session.commit()
+        cache.put("a@example.com", user)
+        stale = UserPrincipal.from_user(user)
+
+        user.is_active = False
+        session.flush()
+        assert cache.get("a@example.com") is None
+        # flush와 commit 사이에 다른 요청이 커밋 전 행을 다시 캐시
+        cache.put("a@example.com", stale)
+        session.commit()
+
+    assert cache.get("a@example.com") is None
+    assert "user_cache_pending" not in session.info
+
+def test_rolled_back_changes_are_not_invalidated_again():
+    cache = UserPrincipalCache()
+    watch_user_model(_User, cache)
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+
+    with Session(engine) as session:
+        user = _User(email="b@example.com", full_name="B")
+        session.add(user)
+        session.commit()
+        user.full_name = "B2"
+        session.flush()
+        session.rollback()
+        cache.put("b@example.com", user)
+        session.commit()
+    assert cache.get("b@example.com") is not None
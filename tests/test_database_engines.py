@@ -0,0 +1,34 @@
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parents[1]
+
+# 각 앱의 database 모듈을 새 인터프리터에서 임포트 (앱마다 같은 패키지 이름을 쓴다)
+CHECK = """
+import asyncio
+from sqlalchemy import text
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+from database import database
+
+assert database.async_engine is not None, "async engine unavailable"
+assert isinstance(database.async_engine.pool, AsyncAdaptedQueuePool), type(database.async_engine.pool)
+
+async def main():
+    async with database.async_engine.connect() as conn:
+        assert (await conn.execute(text("SELECT 1"))).scalar() == 1
+    await database.async_engine.dispose()
+
+asyncio.run(main())
+"""
+
+@pytest.mark.parametrize("app_dir", [".", "backend", "coin-ai-platform/backend"])
+def test_async_engine_imports_with_aiosqlite(app_dir, tmp_path):
+    pytest.importorskip("aiosqlite")
+    env = dict(os.environ, DATABASE_URL=f"sqlite:///{tmp_path / 'test.db'}")
+    result = subprocess.run([sys.executable, "-c", CHECK], cwd=ROOT / app_dir, env=env,
+                            capture_output=True, text=True, timeout=60)
+    assert result.returncode == 0, result.stderr
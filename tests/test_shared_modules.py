@@ -0,0 +1,18 @@
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+
+# 루트 앱의 services 패키지는 backend와 이름이 같으므로 새 인터프리터에서 확인
+CHECK = """
+import backend.services.signal_cache as shared
+from services import signal_cache
+
+assert signal_cache.signal_cache is shared.signal_cache
+assert signal_cache.INTERVAL_MS is shared.INTERVAL_MS
+"""
+
+def test_root_signal_cache_reuses_backend_module():
+    result = subprocess.run([sys.executable, "-c", CHECK], cwd=ROOT, capture_output=True, text=True, timeout=60)
+    assert result.returncode == 0, result.stderr